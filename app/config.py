@@ -0,0 +1,105 @@
+# app/config.py
+import os
+import tempfile
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, which can be fewer than the machine has."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# Subsystems served by this process (text, video) and how models are warmed:
+# background (serve at once, /ready turns 200 when loaded), eager (before serving) or off (on first use)
+APP_SUBSYSTEMS = [name.strip() for name in os.getenv("APP_SUBSYSTEMS", "text,video").split(",") if name.strip()]
+WARMUP = os.getenv("WARMUP", "background")
+
+# Each worker process loads its own model copies, so by default the served
+# subsystems' pools split the CPUs instead of each taking all of them
+_POOL_WORKERS = max(1, available_cpus() // max(len(APP_SUBSYSTEMS), 1))
+
+# Memory budget for parsed job descriptions and their embeddings (bytes)
+JOB_CACHE_MAX_BYTES = _env_int("JOB_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# Optional .npy file backing the skill/title phrase embedding cache
+PHRASE_EMBEDDINGS_PATH = os.getenv("PHRASE_EMBEDDINGS_PATH")
+
+# ATS scoring worker pool. ATS_WORKERS=0 runs scoring on threads in the API process.
+ATS_WORKERS = _env_int("ATS_WORKERS", _POOL_WORKERS)
+ATS_QUEUE_SIZE = _env_int("ATS_QUEUE_SIZE", 32)
+ATS_REQUEST_TIMEOUT = float(os.getenv("ATS_REQUEST_TIMEOUT", "30"))
+ATS_WORKER_START_METHOD = os.getenv("ATS_WORKER_START_METHOD", "spawn")
+
+# Micro-batching of concurrent embedding calls; a wait of 0 disables it
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "0"))
+EMBED_BATCH_MAX_SIZE = _env_int("EMBED_BATCH_MAX_SIZE", 64)
+
+# Sentence embedding inference backend: torch, quantized (int8 dynamic) or onnx
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH", "models/paraphrase-MiniLM-L6-v2.onnx")
+
+# Video frame sampling: auto, sequential, seek, time (needs VIDEO_SAMPLE_FPS) or adaptive
+VIDEO_FRAME_SKIP = _env_int("VIDEO_FRAME_SKIP", 20)
+VIDEO_SAMPLING_STRATEGY = os.getenv("VIDEO_SAMPLING_STRATEGY", "auto")
+VIDEO_SAMPLE_FPS = float(os.getenv("VIDEO_SAMPLE_FPS", "0")) or None
+
+# Adaptive sampling: analyze a frame when the scene changed or the gap got too long
+VIDEO_CHANGE_THRESHOLD = float(os.getenv("VIDEO_CHANGE_THRESHOLD", "6.0"))
+VIDEO_MAX_GAP_SECONDS = float(os.getenv("VIDEO_MAX_GAP_SECONDS", "2.0"))
+VIDEO_FRAME_BUDGET = _env_int("VIDEO_FRAME_BUDGET", 150)
+VIDEO_CHANGE_CHECK_FPS = float(os.getenv("VIDEO_CHANGE_CHECK_FPS", "5"))
+
+# Frame analysis worker processes; 0 analyzes frames on two threads in-process
+VIDEO_WORKERS = _env_int("VIDEO_WORKERS", _POOL_WORKERS)
+
+# Memory budget for cached reference face encodings (bytes)
+REFERENCE_CACHE_MAX_BYTES = _env_int("REFERENCE_CACHE_MAX_BYTES", 16 * 1024 * 1024)
+
+# Detect the face once and track it between sampled frames
+VIDEO_FACE_TRACKING = os.getenv("VIDEO_FACE_TRACKING", "0") == "1"
+VIDEO_TRACKING_MIN_CONFIDENCE = float(os.getenv("VIDEO_TRACKING_MIN_CONFIDENCE", "0.6"))
+VIDEO_REDETECT_INTERVAL = _env_int("VIDEO_REDETECT_INTERVAL", 30)
+
+# Frames between progress events of /analyze/stream
+VIDEO_STREAM_PROGRESS_EVERY = _env_int("VIDEO_STREAM_PROGRESS_EVERY", 10)
+# Largest form field /analyze/stream buffers in memory, e.g. the reference image (bytes)
+UPLOAD_MAX_FIELD_BYTES = _env_int("UPLOAD_MAX_FIELD_BYTES", 10 * 1024 * 1024)
+
+# Background video analysis jobs
+VIDEO_JOB_WORKERS = _env_int("VIDEO_JOB_WORKERS", 2)
+VIDEO_JOB_DB_PATH = os.getenv("VIDEO_JOB_DB_PATH", "video_jobs.sqlite3")
+VIDEO_JOB_SPOOL_DIR = os.getenv("VIDEO_JOB_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "video_jobs"))
+
+# Speech to text: google (network) or vosk (offline, needs VOSK_MODEL_PATH)
+SPEECH_BACKEND = os.getenv("SPEECH_BACKEND", "google")
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "models/vosk-model-small-en-us-0.15")
+SPEECH_WORKERS = _env_int("SPEECH_WORKERS", 4)
+SPEECH_MAX_CHUNK_SECONDS = float(os.getenv("SPEECH_MAX_CHUNK_SECONDS", "30"))
+SPEECH_MIN_SILENCE_SECONDS = float(os.getenv("SPEECH_MIN_SILENCE_SECONDS", "0.5"))
+SPEECH_SILENCE_DB = float(os.getenv("SPEECH_SILENCE_DB", "-35"))
+
+# Run frame and speech analysis side by side; per-branch timeouts in seconds (0 = none)
+VIDEO_CONCURRENT_BRANCHES = os.getenv("VIDEO_CONCURRENT_BRANCHES", "1") == "1"
+VIDEO_FRAMES_TIMEOUT = float(os.getenv("VIDEO_FRAMES_TIMEOUT", "0"))
+VIDEO_SPEECH_TIMEOUT = float(os.getenv("VIDEO_SPEECH_TIMEOUT", "120"))
+
+# Frames per emotion-classifier batch; 1 analyzes frame by frame with MTCNN
+VIDEO_EMOTION_BATCH_SIZE = _env_int("VIDEO_EMOTION_BATCH_SIZE", 1)
+
+# Width of the copy faces are detected on; 0 detects on half-resolution frames
+VIDEO_DETECTION_WIDTH = _env_int("VIDEO_DETECTION_WIDTH", 0)
+
+# Per-stage latency histograms served on /metrics; 0 turns the timers into no-ops
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Logging: level, writing from a background thread, and records per second per call site (0 = unlimited)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_ASYNC = os.getenv("LOG_ASYNC", "1") == "1"
+LOG_RATE_LIMIT = _env_int("LOG_RATE_LIMIT", 20)
@@ -1,79 +1,84 @@
 # app/main.py
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
-from fastapi import FastAPI, File, UploadFile
-from app.models.schemas import ATSRequest, ATSResponse
-from app.services.ats_calculator import ATSCalculator
-from app.utils.logger import setup_logger
-import os,shutil,tempfile
-from app.services.video_analyzer import VideoAnalyzer 
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.utils.logger import setup_logger
+from app.utils.readiness import Readiness
+from app.utils import metrics
+from app import config
 
-
+SUBSYSTEMS = ("text", "video")
+WARMUP_MODES = ("background", "eager", "off")
 
 
 logger = setup_logger()
-app = FastAPI(title="ATS Score Calculator API")
-
-origins = ["*"]
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-ats_calculator = ATSCalculator()
-
-@app.post("/calculate-ats-score", response_model=ATSResponse)
-async def calculate_ats_score(request: ATSRequest):
-    try:
-        score, category_scores, resume_info, job_info = ats_calculator.calculate_ats_score(
-            request.resume,
-            request.job_description
-        )
-        feedback = ats_calculator.provide_feedback(score, category_scores, resume_info, job_info)
-        
-        return ATSResponse(
-            score=score,
-            category_scores=category_scores,
-            # feedback=feedback,
-            # resume_info=resume_info,
-            # job_info=job_info
-        )
-    except Exception as e:
-        logger.error(f"Error processing ATS score calculation: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-
-
-
-
-
-@app.post("/analyze/")
-async def analyze_video(id: str, known_face_image: UploadFile = File(...), video_file: UploadFile = File(...)):
-    try:
-        import time
-        st =time.time()
-        known_face_image_path = tempfile.mktemp(suffix='.jpg')
-        with open(known_face_image_path, 'wb') as f:
-            shutil.copyfileobj(known_face_image.file, f)
-
-        video_path = tempfile.mktemp(suffix='.mp4')
-        with open(video_path, 'wb') as f:
-            shutil.copyfileobj(video_file.file, f)
-
-        analyzer = VideoAnalyzer(known_face_image_path)
-        results = analyzer.analyze(video_path)
-
-        os.remove(known_face_image_path)
-        os.remove(video_path)
-        print(time.time()-st)
-        return JSONResponse(content=results)
-    except Exception as e:
-        logger.error(f"Error in video analysis API: {e}")
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+
+
+def create_app(subsystems=None, warmup: str = None) -> FastAPI:
+    """
+    Build the API with the given subsystems (``text``, ``video`` or both).
+
+    A subsystem's modules are only imported when it is enabled, so a
+    text-only app never loads TensorFlow, dlib or the speech libraries.
+    """
+    subsystems = list(config.APP_SUBSYSTEMS if subsystems is None else subsystems)
+    warmup = warmup or config.WARMUP
+    unknown = set(subsystems) - set(SUBSYSTEMS)
+    if unknown or not subsystems:
+        raise ValueError(f"APP_SUBSYSTEMS must name some of {SUBSYSTEMS}, got {subsystems}")
+    if warmup not in WARMUP_MODES:
+        raise ValueError(f"Unknown warmup mode '{warmup}', expected one of {WARMUP_MODES}")
+
+    app = FastAPI(title="ATS Score Calculator API")
+
+    origins = ["*"]
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(metrics.RequestTimingMiddleware)
+
+    readiness = Readiness(require_warmup=warmup != "off")
+    if "text" in subsystems:
+        from app.routers import text
+        app.include_router(text.router)
+        text.register_models(readiness)
+    if "video" in subsystems:
+        from app.routers import video
+        app.include_router(video.router)
+        video.register_models(readiness)
+    app.state.readiness = readiness
+
+    @app.on_event("startup")
+    def warm_models():
+        # Runs after the subsystems' own startup hooks have started their pools
+        if warmup == "eager":
+            readiness.warm()
+        elif warmup == "background":
+            readiness.start_background()
+
+    @app.get("/health")
+    def get_health():
+        return {"status": "ok"}
+
+    @app.get("/ready")
+    def get_ready():
+        report = readiness.report()
+        report["subsystems"] = subsystems
+        return JSONResponse(content=report, status_code=200 if report["ready"] else 503)
+
+    @app.get("/metrics")
+    def get_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+    logger.info("Serving %s with %s model warmup", ", ".join(subsystems), warmup)
+    return app
+
+
+app = create_app()
 
 # You can add more endpoints if necessary
 
@@ -84,4 +89,4 @@ async def analyze_video(id: str, known_face_image: UploadFile = File(...), video
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -12,4 +12,12 @@ class ATSResponse(BaseModel):
     category_scores: Dict[str, float]
     # feedback: str
     # resume_info: Dict[str, Union[List[str], int]]
-    # job_info: Dict[str, Union[List[str], int]]
\ No newline at end of file
+    # job_info: Dict[str, Union[List[str], int]]
+
+class ATSBatchRequest(BaseModel):
+    job_description: str
+    resumes: List[str]
+    id: str
+
+class ATSBatchResponse(BaseModel):
+    results: List[ATSResponse]
\ No newline at end of file
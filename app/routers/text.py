@@ -0,0 +1,78 @@
+# app/routers/text.py
+"""ATS scoring endpoints. Importing this module loads no models; the scoring workers do."""
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException
+from app.models.schemas import ATSRequest, ATSResponse, ATSBatchRequest, ATSBatchResponse
+from app.services.scoring_pool import PoolRestartingError, PoolSaturatedError, ScoringPool
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+router = APIRouter()
+scoring_pool = ScoringPool()
+
+
+def register_models(readiness):
+    readiness.register("ats_scoring", scoring_pool.warmup, scoring_pool.loaded)
+
+
+@router.on_event("startup")
+def start_scoring_pool():
+    scoring_pool.start()
+
+
+@router.on_event("shutdown")
+def stop_scoring_pool():
+    scoring_pool.shutdown()
+
+
+@router.post("/calculate-ats-score", response_model=ATSResponse)
+async def calculate_ats_score(request: ATSRequest):
+    try:
+        score, category_scores, feedback = await scoring_pool.score_resume(
+            request.resume,
+            request.job_description
+        )
+
+        return ATSResponse(
+            score=score,
+            category_scores=category_scores,
+            # feedback=feedback,
+            # resume_info=resume_info,
+            # job_info=job_info
+        )
+    except (PoolSaturatedError, PoolRestartingError) as e:
+        logger.warning("Rejecting ATS score calculation: %s", e)
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        logger.error("ATS score calculation timed out")
+        raise HTTPException(status_code=504, detail="ATS score calculation timed out")
+    except Exception as e:
+        logger.error("Error processing ATS score calculation: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/calculate-ats-scores-batch", response_model=ATSBatchResponse)
+async def calculate_ats_scores_batch(request: ATSBatchRequest):
+    try:
+        results = await scoring_pool.score_resumes_batch(
+            request.job_description,
+            request.resumes
+        )
+
+        return ATSBatchResponse(
+            results=[
+                ATSResponse(score=score, category_scores=category_scores)
+                for score, category_scores in results
+            ]
+        )
+    except (PoolSaturatedError, PoolRestartingError) as e:
+        logger.warning("Rejecting batch ATS score calculation: %s", e)
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        logger.error("Batch ATS score calculation timed out")
+        raise HTTPException(status_code=504, detail="Batch ATS score calculation timed out")
+    except Exception as e:
+        logger.error("Error processing batch ATS score calculation: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,216 @@
+# app/routers/video.py
+"""
+Interview video analysis endpoints.
+
+FER, the speech backend and the NLTK data load on first use or during
+warmup; the frame worker processes load their own models when they start.
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from app import config
+from app.services import speech_backends, video_models
+from app.services.frame_workers import FramePoolRestartingError, get_frame_analyzer
+from app.services.job_queue import DONE, VideoJobQueue
+from app.services.video_analyzer import VideoAnalyzer, ensure_nltk_data
+from app.services.video_models import get_video_models, reference_encodings
+from app.services.video_stream import StreamingVideoAnalysis
+from app.utils.logger import setup_logger
+from app.utils.streaming import EventStreamResponse, FieldTooLargeError, StreamingFormReader, format_sse
+
+logger = setup_logger()
+router = APIRouter()
+
+
+def _run_video_job(video_path, known_face_encoding):
+    return VideoAnalyzer(known_face_encoding=known_face_encoding).analyze(video_path)
+
+
+video_jobs = VideoJobQueue(_run_video_job)
+
+
+def load_frame_models():
+    # Frame workers load their own models; in-process analysis uses this process's copy
+    if config.VIDEO_WORKERS > 0:
+        get_frame_analyzer().warmup()
+    else:
+        get_video_models()
+
+
+def register_models(readiness):
+    loaded_in_process = None if config.VIDEO_WORKERS > 0 else video_models.models_loaded
+    readiness.register("video_frame_models", load_frame_models, loaded_in_process)
+    readiness.register("speech_backend", speech_backends.get_speech_transcriber, speech_backends.transcriber_loaded)
+    readiness.register("nltk_data", ensure_nltk_data)
+
+
+@router.on_event("startup")
+def start_video_jobs():
+    video_jobs.start()
+
+
+@router.on_event("shutdown")
+def stop_video_jobs():
+    video_jobs.shutdown()
+
+
+@router.post("/analyze/")
+async def analyze_video(id: str, known_face_image: UploadFile = File(...), video_file: UploadFile = File(...)):
+    try:
+        image_bytes = await known_face_image.read()
+        known_face_encoding = await run_in_threadpool(reference_encodings.get_encoding, id, image_bytes)
+        analyzer = VideoAnalyzer(known_face_encoding=known_face_encoding)
+        results = await run_in_threadpool(_analyze_upload, analyzer, video_file.file)
+        return JSONResponse(content=results)
+    except FramePoolRestartingError as e:
+        logger.warning("Rejecting video analysis: %s", e)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("Error in video analysis API: %s", e)
+        return JSONResponse(content={"error": str(e)}, status_code=500)
+
+
+def _analyze_upload(analyzer, upload):
+    video_file = tempfile.NamedTemporaryFile(suffix='.mp4', delete=False)
+    try:
+        with video_file:
+            shutil.copyfileobj(upload, video_file)
+        return analyzer.analyze(video_file.name)
+    finally:
+        os.remove(video_file.name)
+
+
+@router.post("/analyze/stream")
+async def analyze_video_stream(id: str, request: Request):
+    # Same form as /analyze/, but known_face_image has to come before video_file
+    try:
+        form = StreamingFormReader(request.headers.get("content-type", ""), "video_file")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Read up to the start of the video before answering, so an oversized
+    # field can still get a 413 instead of an error event
+    body = request.stream()
+    body_read = asyncio.Event()
+    first_data = b""
+    try:
+        async for chunk in body:
+            first_data = form.write(chunk)
+            if form.streaming:
+                break
+    except FieldTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return EventStreamResponse(_stream_analysis_events(id, body, body_read, form, first_data), body_read)
+
+
+async def _stream_analysis_events(id, body, body_read, form, first_data):
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def on_progress(progress):
+        loop.call_soon_threadsafe(events.put_nowait, ("progress", progress))
+
+    async def video_data():
+        yield first_data
+        async for chunk in body:
+            yield form.write(chunk)
+        # From here on only a disconnect can arrive; the response listens for it
+        body_read.set()
+
+    async def ingest():
+        session = None
+        finished = False
+        try:
+            async for data in video_data():
+                if not data:
+                    continue
+                if session is None:
+                    image = form.fields.get("known_face_image")
+                    if image is None:
+                        raise ValueError("known_face_image must be sent before video_file")
+                    known_face_encoding = await run_in_threadpool(reference_encodings.get_encoding, id, image)
+                    if known_face_encoding is None:
+                        raise ValueError("Failed to load known face image")
+                    session = StreamingVideoAnalysis(VideoAnalyzer(known_face_encoding=known_face_encoding), on_progress)
+                    session.start()
+                await run_in_threadpool(session.feed, data)
+
+            if session is None:
+                raise ValueError("No video_file in the upload")
+            results = await run_in_threadpool(session.finish)
+            finished = True
+            events.put_nowait(("result", results))
+        except Exception as e:
+            logger.error("Error in streaming video analysis API: %s", e)
+            events.put_nowait(("error", {"error": str(e)}))
+        finally:
+            if session is not None and not finished:
+                # Joins the analysis thread, so keep it off the event loop
+                await run_in_threadpool(session.abort)
+            events.put_nowait(None)
+
+    task = asyncio.ensure_future(ingest())
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield format_sse(*event)
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+@router.post("/analyze/jobs")
+async def submit_video_job(id: str, known_face_image: UploadFile = File(...), video_file: UploadFile = File(...)):
+    image_bytes = await known_face_image.read()
+    known_face_encoding = await run_in_threadpool(reference_encodings.get_encoding, id, image_bytes)
+    if known_face_encoding is None:
+        raise HTTPException(status_code=400, detail="Failed to load known face image")
+    try:
+        job = await run_in_threadpool(video_jobs.submit, id, image_bytes, video_file.file, known_face_encoding)
+    except Exception as e:
+        logger.error("Error submitting video analysis job: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    # A finished duplicate is answered straight away
+    return JSONResponse(content=_job_status(job), status_code=200 if job["status"] == DONE else 202)
+
+
+@router.get("/analyze/jobs/{job_id}")
+async def get_video_job(job_id: str):
+    return _job_status(_find_video_job(job_id))
+
+
+@router.get("/analyze/jobs/{job_id}/result")
+async def get_video_job_result(job_id: str):
+    job = _find_video_job(job_id)
+    if job["status"] == DONE:
+        return JSONResponse(content=job["result"])
+    if job["error"] is not None:
+        return JSONResponse(content={"error": job["error"]}, status_code=500)
+    raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+
+
+def _find_video_job(job_id):
+    job = video_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return job
+
+
+def _job_status(job):
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "duration": job["duration"],
+        "submitted_at": job["submitted_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "error": job["error"],
+    }
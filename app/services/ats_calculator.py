@@ -1,14 +1,18 @@
 # app/services/ats_calculator.py
+from typing import List
 from app.services.text_processor import TextProcessor
 from app.services.score_calculator import ScoreCalculator
+from app.services.job_cache import JobAnalysis, JobDescriptionCache, normalize_job_description
+from app import config
 from app.utils.logger import setup_logger
 
 logger = setup_logger()
 
 class ATSCalculator:
-    def __init__(self):
+    def __init__(self, job_cache_max_bytes: int = config.JOB_CACHE_MAX_BYTES):
         self.text_processor = TextProcessor()
         self.score_calculator = ScoreCalculator()
+        self.job_cache = JobDescriptionCache(job_cache_max_bytes)
         self.weights = {
             'job_title': 0.15,
             'skills': 0.30,
@@ -22,18 +26,70 @@ class ATSCalculator:
         }
 
     def calculate_ats_score(self, resume_text: str, job_description: str):
-        categories = self.text_processor.extract_categories(job_description)
-        resume_info = self.text_processor.extract_info(resume_text, categories)
-        job_info = self.text_processor.extract_info(job_description, categories)
-        similar_score=self.score_calculator.similarty_score(resume_text,job_description)
-        
+        job = self.analyze_job_description(job_description)
+        resume_info = self.text_processor.extract_info(resume_text, job.categories)
+        similar_score=self.score_calculator.similarty_score(
+            resume_text, job_description, job_embedding=job.embedding
+        )
+
+        total_score, scores = self._score_resume(resume_info, job.job_info, similar_score)
+
+        return total_score, scores, resume_info, job.job_info
+
+    def calculate_ats_scores_batch(self, job_description: str, resumes: List[str]):
+        """
+        Score many resumes against a single job description.
+
+        The job description is analyzed once and all resume texts are embedded
+        together in one batched encode.
+
+        Args:
+            job_description (str): Job description text
+            resumes (List[str]): Resume texts to score
+
+        Returns:
+            List[tuple]: ``(score, category_scores, resume_info, job_info)`` for
+            each resume, in the same order as ``resumes``
+        """
+        job = self.analyze_job_description(job_description)
+        similar_scores = self.score_calculator.similarity_scores(
+            resumes, job_description, job_embedding=job.embedding
+        )
+
+        results = []
+        for resume_text, similar_score in zip(resumes, similar_scores):
+            resume_info = self.text_processor.extract_info(resume_text, job.categories)
+            total_score, scores = self._score_resume(resume_info, job.job_info, similar_score)
+            results.append((total_score, scores, resume_info, job.job_info))
+
+        return results
+
+    def analyze_job_description(self, job_description: str) -> JobAnalysis:
+        """
+        Return the categories, job-side info and embedding of a job description.
+
+        Results are cached by a hash of the normalized text, so a posting that
+        was seen before skips spaCy, YAKE and the embedding model entirely.
+        The returned object is shared between callers and must not be mutated.
+        """
+        job_description = normalize_job_description(job_description)
+        analysis = self.job_cache.lookup(job_description)
+        if analysis is None:
+            job_text = self.text_processor.analyze(job_description)
+            categories = self.text_processor.extract_categories(job_text)
+            job_info = self.text_processor.extract_info(job_text, categories)
+            embedding = self.score_calculator.encode_text(job_description)
+            analysis = JobAnalysis(categories, job_info, embedding)
+            self.job_cache.store(job_description, analysis)
+        return analysis
+
+    def _score_resume(self, resume_info, job_info, similar_score):
         scores = self._calculate_category_scores(resume_info, job_info)
         scores['text_similarity']=similar_score
-        
+
         total_score = self._calculate_total_score(scores)
 
-        
-        return total_score * 100, scores, resume_info, job_info
+        return total_score * 100, scores
 
     def _calculate_category_scores(self, resume_info, job_info):
         scores = {}
@@ -64,7 +120,7 @@ class ATSCalculator:
                         resume_info[category], job_info[category]
                     )
             except Exception as e:
-                logger.error(f"Error calculating score for {category}: {str(e)}")
+                logger.error("Error calculating score for %s: %s", category, e)
                 scores[category] = 0.0
 
         return scores
@@ -83,7 +139,7 @@ class ATSCalculator:
 
 
     def provide_feedback(self,score, category_scores, resume_info, job_info):
-        logger.info("Providing feedback based on the ATS score")
+        logger.debug("Providing feedback based on the ATS score")
         feedback = []
         
         if score < 70:
@@ -110,5 +166,5 @@ class ATSCalculator:
             if resume_info['years_of_experience'] < job_info['years_of_experience']:
                 feedback.append(f"The job requires {job_info['years_of_experience']} years of experience, but your resume shows {resume_info['years_of_experience']} years.")
         
-        logger.info(f"Feedback generated: {feedback}")
+        logger.debug("Feedback generated: %s", feedback)
         return "\n".join(feedback)
\ No newline at end of file
@@ -0,0 +1,172 @@
+# app/services/embedding_backends.py
+"""
+Interchangeable CPU inference backends for the sentence embedding model.
+
+Every backend exposes ``encode(sentences, **kwargs)`` with the same contract as
+``SentenceTransformer.encode``: a str gives one vector, a list gives a matrix.
+Heavy libraries are imported only by the backend that needs them.
+"""
+
+import os
+from typing import List, Union
+
+import numpy as np
+from app import config
+from app.utils.file_lock import file_lock
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+MODEL_NAME = 'paraphrase-MiniLM-L6-v2'
+# paraphrase-MiniLM-L6-v2 truncates inputs to 128 tokens
+MAX_SEQ_LENGTH = 128
+
+
+class TorchEmbeddingBackend:
+    """The stock PyTorch SentenceTransformer."""
+
+    name = "torch"
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, sentences: Union[str, List[str]], **kwargs) -> np.ndarray:
+        return self.model.encode(sentences, **kwargs)
+
+
+class QuantizedEmbeddingBackend(TorchEmbeddingBackend):
+    """SentenceTransformer with its Linear layers dynamically quantized to int8."""
+
+    name = "quantized"
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        super().__init__(model_name)
+        import torch
+        self.model = torch.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+
+class OnnxEmbeddingBackend:
+    """
+    ONNX Runtime session over the exported transformer, followed by mean pooling.
+
+    The model is exported to ``onnx_path`` on first use if the file is missing
+    (see ``ensure_onnx_model``).
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_name: str = MODEL_NAME, onnx_path: str = config.ONNX_MODEL_PATH):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        hub_name = _hub_name(model_name)
+        ensure_onnx_model(model_name, onnx_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(hub_name)
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+
+        outputs = []
+        for start in range(0, len(sentences), batch_size):
+            tokens = self.tokenizer(
+                sentences[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=MAX_SEQ_LENGTH,
+                return_tensors="np",
+            )
+            feed = {k: v.astype(np.int64) for k, v in tokens.items() if k in self.input_names}
+            hidden = self.session.run(None, feed)[0]
+            outputs.append(_mean_pool(hidden, tokens["attention_mask"]))
+
+        embeddings = np.concatenate(outputs).astype(np.float32)
+        return embeddings[0] if single else embeddings
+
+
+def _hub_name(model_name: str) -> str:
+    return model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+
+def _mean_pool(hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    mask = attention_mask[..., None].astype(np.float32)
+    return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+def ensure_onnx_model(model_name: str, onnx_path: str) -> None:
+    """
+    Export ``model_name`` to ``onnx_path`` unless the file exists.
+
+    Scoring workers start together, so the export runs under a file lock
+    and goes to a temporary file that is renamed into place once complete.
+    The other workers wait for the lock and then find the finished file.
+    """
+    if os.path.exists(onnx_path):
+        return
+    os.makedirs(os.path.dirname(onnx_path) or ".", exist_ok=True)
+    with file_lock(onnx_path):
+        if os.path.exists(onnx_path):
+            return
+        tmp_path = f"{onnx_path}.{os.getpid()}.tmp"
+        try:
+            export_onnx(model_name, tmp_path)
+            os.replace(tmp_path, onnx_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def export_onnx(model_name: str, onnx_path: str) -> None:
+    """Export the transformer of ``model_name`` to ONNX with dynamic batch and sequence axes."""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    hub_name = _hub_name(model_name)
+    tokenizer = AutoTokenizer.from_pretrained(hub_name)
+    model = AutoModel.from_pretrained(hub_name).eval()
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = list(sample.keys())
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    os.makedirs(os.path.dirname(onnx_path) or ".", exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            onnx_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    logger.info("Exported %s to %s", model_name, onnx_path)
+
+
+EMBEDDING_BACKENDS = {
+    backend.name: backend
+    for backend in (TorchEmbeddingBackend, QuantizedEmbeddingBackend, OnnxEmbeddingBackend)
+}
+
+
+def load_embedding_backend(name: str = config.EMBEDDING_BACKEND, model_name: str = MODEL_NAME):
+    """Instantiate the embedding backend registered under ``name``."""
+    try:
+        backend = EMBEDDING_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown embedding backend '{name}', expected one of {sorted(EMBEDDING_BACKENDS)}"
+        )
+    logger.info("Loading %s embedding backend for %s", name, model_name)
+    return backend(model_name)
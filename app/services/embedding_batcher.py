@@ -0,0 +1,111 @@
+# app/services/embedding_batcher.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Union
+
+import numpy as np
+from app.utils import metrics
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class _EncodeRequest:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatchEncoder:
+    """
+    Coalesces concurrent encode calls into batched model calls.
+
+    Callers block in ``encode`` while a background thread collects requests
+    for up to ``max_wait_ms`` after the first one arrives, or until
+    ``max_batch_size`` texts are queued, then runs a single encode and hands
+    each caller its own slice of the result.
+
+    Batch sizes and queue waits are recorded in the ``ats_embedding_batch_size``
+    and ``ats_embedding_queue_seconds`` histograms.
+
+    Only calls made at the same time in one process can share a batch. A
+    scoring worker process handles one request at a time, so this helps
+    with ``ATS_WORKERS=0``, where requests share the model on threads.
+    """
+
+    def __init__(self, encode: Callable[[List[str]], np.ndarray],
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self._encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def encode(self, texts: Union[str, List[str]]) -> np.ndarray:
+        """Encode like ``SentenceTransformer.encode``: a str gives one vector, a list a matrix."""
+        single = isinstance(texts, str)
+        request = _EncodeRequest([texts] if single else list(texts))
+        if not request.texts:
+            return self._encode([])
+
+        self._ensure_started()
+        self._queue.put(request)
+        vectors = request.future.result()
+        return vectors[0] if single else vectors
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0].texts)
+            deadline = batch[0].enqueued_at + self.max_wait
+            while size < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._process(batch, size)
+
+    def _process(self, batch: List[_EncodeRequest], size: int) -> None:
+        started = time.perf_counter()
+        texts = [text for request in batch for text in request.texts]
+        try:
+            vectors = np.asarray(self._encode(texts))
+        except Exception as e:
+            logger.error("Batched encode of %s texts failed: %s", size, e)
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        # Recorded before any caller resumes, so a scoring worker's metrics
+        # snapshot taken after the request includes this batch
+        metrics.observe(metrics.EMBEDDING_BATCH_SIZE, size)
+        for request in batch:
+            metrics.observe(metrics.EMBEDDING_QUEUE_SECONDS, started - request.enqueued_at)
+
+        offset = 0
+        for request in batch:
+            count = len(request.texts)
+            request.future.set_result(vectors[offset:offset + count])
+            offset += count
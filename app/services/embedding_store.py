@@ -0,0 +1,172 @@
+# app/services/embedding_store.py
+import json
+import os
+import threading
+from typing import Callable, Iterable, List
+
+import numpy as np
+from app.utils.file_lock import file_lock
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class PhraseEmbeddingStore:
+    """
+    Embedding cache for short phrases such as skills and job titles.
+
+    Vectors live in a compact float32 matrix with a dict mapping each phrase to
+    its row. Rows loaded from disk stay memory-mapped and read-only, so forked
+    workers share those pages; phrases seen afterwards go to an in-memory
+    matrix that grows geometrically.
+    """
+
+    def __init__(self, encode: Callable[[List[str]], np.ndarray], initial_capacity: int = 1024):
+        self._encode = encode
+        self._initial_capacity = initial_capacity
+        self._index = {}
+        self._phrases = []
+        self._base = None
+        self._extra = None
+        self._extra_rows = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def __contains__(self, phrase: str) -> bool:
+        return phrase in self._index
+
+    def encode(self, phrases: Iterable[str]) -> np.ndarray:
+        """
+        Return one embedding row per phrase, in order.
+
+        Phrases that were not seen before are sent to the model in a single batch.
+        """
+        phrases = list(phrases)
+        if not phrases:
+            dim = next((m.shape[1] for m in (self._base, self._extra) if m is not None), 0)
+            return np.empty((0, dim), dtype=np.float32)
+
+        missing = [p for p in dict.fromkeys(phrases) if p not in self._index]
+        if missing:
+            vectors = np.asarray(self._encode(missing), dtype=np.float32)
+            self._append(missing, vectors)
+
+        rows = np.fromiter((self._index[p] for p in phrases), dtype=np.int64, count=len(phrases))
+        return self._take(rows)
+
+    def _append(self, phrases: List[str], vectors: np.ndarray) -> None:
+        with self._lock:
+            # Another thread may have added some of these phrases meanwhile
+            keep = [i for i, p in enumerate(phrases) if p not in self._index]
+            if not keep:
+                return
+            vectors = vectors[keep]
+            needed = self._extra_rows + len(keep)
+            if self._extra is None or needed > len(self._extra):
+                capacity = max(self._initial_capacity, needed, 2 * (0 if self._extra is None else len(self._extra)))
+                grown = np.empty((capacity, vectors.shape[1]), dtype=np.float32)
+                if self._extra is not None:
+                    grown[:self._extra_rows] = self._extra[:self._extra_rows]
+                self._extra = grown
+
+            self._extra[self._extra_rows:needed] = vectors
+            self._extra_rows = needed
+            for i in keep:
+                self._index[phrases[i]] = len(self._phrases)
+                self._phrases.append(phrases[i])
+
+    def _take(self, rows: np.ndarray) -> np.ndarray:
+        base_rows = 0 if self._base is None else len(self._base)
+        if base_rows == 0:
+            return self._extra[rows]
+        if self._extra_rows == 0:
+            return np.asarray(self._base[rows])
+
+        out = np.empty((len(rows), self._base.shape[1]), dtype=np.float32)
+        in_base = rows < base_rows
+        out[in_base] = self._base[rows[in_base]]
+        out[~in_base] = self._extra[rows[~in_base] - base_rows]
+        return out
+
+    def save(self, path: str) -> None:
+        """
+        Write all vectors to ``path`` (.npy) and the phrase list next to it.
+
+        Phrases already in the file but not in this store are kept, so
+        worker processes saving to the same path add to each other's
+        phrases instead of replacing them.
+        """
+        with self._lock:
+            parts = []
+            if self._base is not None:
+                parts.append(np.asarray(self._base))
+            if self._extra_rows:
+                parts.append(self._extra[:self._extra_rows])
+            if not parts:
+                return
+            matrix = np.concatenate(parts) if len(parts) > 1 else parts[0]
+            phrases = list(self._phrases)
+
+        with file_lock(path):
+            if os.path.exists(path):
+                matrix, phrases = _merge_saved(path, matrix, phrases)
+                if matrix is None:
+                    return
+
+            # Write to temporary files first so readers never see a torn store
+            tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+            tmp_phrases_path = f"{_phrases_path(path)}.{os.getpid()}.tmp"
+            np.save(tmp_path, matrix)
+            with open(tmp_phrases_path, "w", encoding="utf-8") as f:
+                json.dump(phrases, f)
+            os.replace(tmp_path, path)
+            os.replace(tmp_phrases_path, _phrases_path(path))
+        logger.info("Saved %s phrase embeddings to %s", len(phrases), path)
+
+    def load(self, path: str) -> None:
+        """Memory-map vectors saved with ``save``, replacing the current contents."""
+        base = np.load(path, mmap_mode="r")
+        with open(_phrases_path(path), encoding="utf-8") as f:
+            phrases = json.load(f)
+        if len(phrases) != len(base):
+            raise ValueError(f"Phrase list does not match embeddings in {path}")
+
+        with self._lock:
+            self._base = base
+            self._extra = None
+            self._extra_rows = 0
+            self._phrases = phrases
+            self._index = {phrase: row for row, phrase in enumerate(phrases)}
+        logger.info("Loaded %s phrase embeddings from %s", len(phrases), path)
+
+
+def _phrases_path(path: str) -> str:
+    return path + ".phrases.json"
+
+
+def _merge_saved(path: str, matrix: np.ndarray, phrases: List[str]):
+    """
+    The saved rows followed by the rows of ``phrases`` the file lacks, or
+    ``(None, None)`` when the file already has every phrase.
+    """
+    try:
+        saved = np.load(path)
+        with open(_phrases_path(path), encoding="utf-8") as f:
+            saved_phrases = json.load(f)
+    except Exception as e:
+        logger.warning("Overwriting unreadable phrase embeddings in %s: %s", path, e)
+        return matrix, phrases
+    if len(saved_phrases) != len(saved) or saved.shape[1:] != matrix.shape[1:]:
+        logger.warning("Overwriting phrase embeddings in %s, which do not match this model", path)
+        return matrix, phrases
+
+    known = set(saved_phrases)
+    new_rows = [i for i, phrase in enumerate(phrases) if phrase not in known]
+    if not new_rows:
+        return None, None
+    return (
+        np.concatenate([saved, matrix[new_rows]]),
+        saved_phrases + [phrases[i] for i in new_rows],
+    )
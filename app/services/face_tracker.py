@@ -0,0 +1,95 @@
+# app/services/face_tracker.py
+
+import cv2
+from app.services.frame_analysis import locate_faces
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class FaceTracker:
+    """
+    Detect a face once and follow it across sampled frames.
+
+    Between detections the face is found again by normalized template
+    matching inside a window around its last position, which costs a small
+    fraction of a HOG pass. The full detector runs again when the match
+    score drops below ``min_confidence`` or every ``redetect_interval``
+    frames, so people entering the frame are still noticed. ``detection_width``
+    runs that detector on a downscaled copy (see ``locate_faces``).
+
+    Boxes use face_recognition's ``(top, right, bottom, left)`` order.
+    """
+
+    def __init__(self, min_confidence: float = 0.6, redetect_interval: int = 30, search_margin: float = 0.5,
+                 detection_width: int = 0):
+        self.min_confidence = min_confidence
+        self.redetect_interval = redetect_interval
+        self.search_margin = search_margin
+        self.detection_width = detection_width
+        self.detections = 0
+        self.tracked_frames = 0
+        self.lost_tracks = 0
+        self._box = None
+        self._template = None
+        self._since_detection = 0
+
+    def update(self, frame):
+        """Return the face locations for ``frame``, tracked face first."""
+        if self._box is not None and self._since_detection < self.redetect_interval:
+            box = self._track(frame)
+            if box is not None:
+                self.tracked_frames += 1
+                self._since_detection += 1
+                return [box]
+            self.lost_tracks += 1
+        return self._detect(frame)
+
+    def counts(self):
+        return {
+            "face_detector": self.detections,
+            "tracker": self.tracked_frames,
+            "lost_tracks": self.lost_tracks,
+        }
+
+    def _detect(self, frame):
+        self.detections += 1
+        self._since_detection = 0
+        face_locations = locate_faces(frame, self.detection_width)
+        if not face_locations:
+            self._box = self._template = None
+            return []
+
+        # Track the largest face and report it first
+        face_locations.sort(key=lambda box: (box[2] - box[0]) * (box[1] - box[3]), reverse=True)
+        self._set_box(frame, face_locations[0])
+        return face_locations
+
+    def _track(self, frame):
+        top, right, bottom, left = self._box
+        height, width = bottom - top, right - left
+        margin_y, margin_x = int(height * self.search_margin), int(width * self.search_margin)
+        frame_height, frame_width = frame.shape[:2]
+        y0, y1 = max(0, top - margin_y), min(frame_height, bottom + margin_y)
+        x0, x1 = max(0, left - margin_x), min(frame_width, right + margin_x)
+
+        window = cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+        if window.shape[0] < height or window.shape[1] < width:
+            return None
+
+        scores = cv2.matchTemplate(window, self._template, cv2.TM_CCOEFF_NORMED)
+        _, confidence, _, (dx, dy) = cv2.minMaxLoc(scores)
+        # Written this way so a NaN score (flat window) also counts as lost
+        if not confidence >= self.min_confidence:
+            logger.info("Lost face track (confidence %.2f), re-detecting", confidence)
+            return None
+
+        box = (y0 + dy, x0 + dx + width, y0 + dy + height, x0 + dx)
+        # Refresh the template so slow head movement does not erode the match
+        self._set_box(frame, box)
+        return box
+
+    def _set_box(self, frame, box):
+        top, right, bottom, left = box
+        self._box = box
+        self._template = cv2.cvtColor(frame[top:bottom, left:right], cv2.COLOR_BGR2GRAY)
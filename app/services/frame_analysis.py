@@ -0,0 +1,181 @@
+# app/services/frame_analysis.py
+"""
+Per-frame face, expression and eye-contact analysis.
+
+Kept free of VideoAnalyzer state so the same code runs on analysis threads
+and inside frame worker processes.
+"""
+
+
+import cv2
+import face_recognition
+from app.utils import metrics
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Same threshold face_recognition.compare_faces uses by default
+FACE_MATCH_TOLERANCE = 0.6
+
+
+class FrameResult:
+    """
+    Analysis of one sampled frame; ``ok`` is False when the frame failed to process.
+
+    ``face_detector_calls`` and ``mtcnn_calls`` count the detector passes this
+    frame needed, which drop to zero when the face box comes from a tracker.
+    """
+
+    __slots__ = ("index", "ok", "face_count", "match", "any_match", "emotion", "eye_contact",
+                 "face_detector_calls", "mtcnn_calls")
+
+    def __init__(self, index, ok=False, face_count=0, match=False, any_match=False, emotion=None, eye_contact=False,
+                 face_detector_calls=0, mtcnn_calls=0):
+        self.index = index
+        self.ok = ok
+        self.face_count = face_count
+        self.match = match
+        self.any_match = any_match
+        self.emotion = emotion
+        self.eye_contact = eye_contact
+        self.face_detector_calls = face_detector_calls
+        self.mtcnn_calls = mtcnn_calls
+
+
+@metrics.timed(metrics.FRAME_STAGE_SECONDS, stage="face_detection")
+def locate_faces(frame, detection_width=0):
+    """
+    HOG face locations in ``frame``. With ``detection_width`` set and smaller
+    than the frame, the detector runs on a copy downscaled to that width and
+    the boxes are mapped back to ``frame``'s coordinates.
+    """
+    height, width = frame.shape[:2]
+    if not detection_width or width <= detection_width:
+        return face_recognition.face_locations(frame)
+
+    scale = width / detection_width
+    small = cv2.resize(frame, (detection_width, max(round(height / scale), 1)), interpolation=cv2.INTER_AREA)
+    return [
+        (max(round(top * scale), 0), min(round(right * scale), width),
+         min(round(bottom * scale), height), max(round(left * scale), 0))
+        for top, right, bottom, left in face_recognition.face_locations(small)
+    ]
+
+
+def analyze_frame(frame, index, known_face_encoding, models, face_locations=None, detection_width=0):
+    """
+    Analyze one frame. When ``face_locations`` is given (e.g. from a tracker)
+    no detector runs: the boxes are passed to dlib, FER and the eye cascade.
+    With ``detection_width`` the faces are found on a downscaled copy and
+    FER reads the mapped box instead of running MTCNN on the whole frame.
+    """
+    try:
+        face_detector_calls = 0
+        if face_locations is None:
+            face_locations = locate_faces(frame, detection_width)
+            face_detector_calls = 1
+        with metrics.timer(metrics.FRAME_STAGE_SECONDS, stage="face_encoding"):
+            face_encodings = face_recognition.face_encodings(frame, face_locations)
+        emotion = None
+        eye_contact = False
+        match = False
+        any_match = False
+        mtcnn_calls = 0
+
+        if face_encodings:
+            matches = face_recognition.face_distance(face_encodings, known_face_encoding) <= FACE_MATCH_TOLERANCE
+            match = bool(matches[0])
+            any_match = bool(matches.any())
+
+        if face_locations:
+            top, right, bottom, left = face_locations[0]
+
+            # Facial expression analysis
+            with metrics.timer(metrics.FRAME_STAGE_SECONDS, stage="emotion"):
+                if face_detector_calls and not detection_width:
+                    emotions = models.emotion_detector.detect_emotions(frame)
+                    mtcnn_calls = 1
+                else:
+                    emotions = models.emotion_detector.detect_emotions(
+                        frame, face_rectangles=[(left, top, right - left, bottom - top)]
+                    )
+            if emotions:
+                dominant_emotion = max(emotions[0]['emotions'].items(), key=lambda x: x[1])[0]
+                emotion = dominant_emotion
+                logger.debug('Detected emotion: %s', dominant_emotion)
+
+            # Eye contact detection
+            eye_contact = _eye_contact(frame, face_locations[0], models)
+
+        logger.debug('Frame %s: Detected %s face(s), Match: %s', index, len(face_locations), any_match)
+        return FrameResult(index, True, len(face_locations), match, any_match, emotion, eye_contact,
+                           face_detector_calls, mtcnn_calls)
+    except Exception as e:
+        logger.error("Error processing frame %s: %s", index, e)
+        return FrameResult(index)
+
+
+def analyze_frames_batch(items, known_face_encoding, models, detection_width=0):
+    """
+    Analyze a window of ``(frame, index, face_locations)`` items together.
+
+    Faces are still located, encoded and checked for eye contact frame by
+    frame, but every encoding in the window is compared with the known face
+    in one distance computation, and the first face of every frame goes
+    through the emotion classifier in one stacked call. Emotions are read
+    from the dlib (or tracker) box, so MTCNN never runs.
+    """
+    detected = []
+    for frame, index, face_locations in items:
+        try:
+            face_detector_calls = 0
+            if face_locations is None:
+                face_locations = locate_faces(frame, detection_width)
+                face_detector_calls = 1
+            with metrics.timer(metrics.FRAME_STAGE_SECONDS, stage="face_encoding"):
+                face_encodings = face_recognition.face_encodings(frame, face_locations)
+            eye_contact = bool(face_locations) and _eye_contact(frame, face_locations[0], models)
+            detected.append((frame, index, face_locations, face_encodings, eye_contact, face_detector_calls))
+        except Exception as e:
+            logger.error("Error processing frame %s: %s", index, e)
+            detected.append((frame, index, None, [], False, 0))
+
+    all_encodings = [encoding for item in detected for encoding in item[3]]
+    matches = iter([])
+    if all_encodings:
+        matches = iter(face_recognition.face_distance(all_encodings, known_face_encoding) <= FACE_MATCH_TOLERANCE)
+
+    with_faces = [item for item in detected if item[2]]
+    try:
+        with metrics.timer(metrics.FRAME_STAGE_SECONDS, stage="emotion_batch"):
+            emotions = models.classify_emotions([(item[0], item[2][0]) for item in with_faces])
+    except Exception as e:
+        logger.error("Error classifying emotions: %s", e)
+        emotions = [None] * len(with_faces)
+    emotion_of = {item[1]: emotion for item, emotion in zip(with_faces, emotions)}
+
+    results = []
+    for frame, index, face_locations, face_encodings, eye_contact, face_detector_calls in detected:
+        if face_locations is None:
+            results.append(FrameResult(index))
+            continue
+        frame_matches = [bool(next(matches)) for _ in face_encodings]
+        logger.debug('Frame %s: Detected %s face(s), Match: %s', index, len(face_locations), any(frame_matches))
+        results.append(FrameResult(
+            index, True, len(face_locations), bool(frame_matches and frame_matches[0]), any(frame_matches),
+            emotion_of.get(index), eye_contact, face_detector_calls, 0
+        ))
+    return results
+
+
+@metrics.timed(metrics.FRAME_STAGE_SECONDS, stage="eye_contact")
+def _eye_contact(frame, face_location, models):
+    top, right, bottom, left = face_location
+    face_image = frame[top:bottom, left:right]
+    gray_face = cv2.cvtColor(face_image, cv2.COLOR_BGR2GRAY)
+
+    eyes = models.eye_cascade.detectMultiScale(gray_face)
+    if len(eyes) >= 2:
+        logger.debug('Eye contact detected')
+        return True
+    return False
@@ -0,0 +1,198 @@
+# app/services/frame_sampler.py
+import cv2
+import numpy as np
+from app import config
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Codecs where every frame is a keyframe, so seeking never re-decodes a GOP
+INTRA_ONLY_FOURCCS = {
+    "MJPG", "mjpg", "MJPA", "mjpa", "JPEG", "jpeg", "png ", "MPNG",
+    "apch", "apcn", "apcs", "apco", "ap4h", "ap4x", "AVdn", "AVdh",
+    "I420", "IYUV", "YV12", "RGBA", "RAW ", "\x00\x00\x00\x00",
+}
+
+# Width of the grayscale thumbnails compared by the adaptive strategy
+CHANGE_THUMBNAIL_WIDTH = 64
+
+# With inter-frame codecs a seek costs about one GOP of decoding, so skipping
+# by seeking only pays off once the stride exceeds typical keyframe intervals
+SEEK_STRIDE_THRESHOLD = 120
+
+
+class VideoOpenError(IOError):
+    """Raised when OpenCV cannot open a video file."""
+
+
+class SampledFrame:
+    """One decoded frame together with its position in the video."""
+
+    __slots__ = ("index", "timestamp", "image")
+
+    def __init__(self, index, timestamp, image):
+        self.index = index
+        self.timestamp = timestamp
+        self.image = image
+
+
+class FrameSampler:
+    """
+    Lazily yields sampled frames from a video.
+
+    Strategies:
+        sequential: read forward, ``grab()`` the skipped frames without converting them
+        seek: jump to each sampled frame with ``CAP_PROP_POS_FRAMES``
+        time: sequential reads, sampling ``sample_fps`` frames per second of video time
+        adaptive: check ``change_check_fps`` frames per second and yield one only
+              when its downscaled grayscale differs from the last yielded frame by
+              ``change_threshold`` or ``max_gap`` seconds have passed, spacing
+              frames so at most about ``frame_budget`` are yielded per video
+              (exactly at most, when the frame count is unknown)
+        auto: ``time`` when ``sample_fps`` is set, otherwise ``seek`` for intra-only
+              codecs or very large strides and ``sequential`` for everything else
+
+    Frames are yielded one at a time; the sampler never keeps more than the
+    current frame in memory.
+    """
+
+    STRATEGIES = ("auto", "sequential", "seek", "time", "adaptive")
+
+    def __init__(self, strategy: str = "auto", frame_skip: int = 20, sample_fps: float = None,
+                 change_threshold: float = config.VIDEO_CHANGE_THRESHOLD,
+                 max_gap: float = config.VIDEO_MAX_GAP_SECONDS,
+                 frame_budget: int = config.VIDEO_FRAME_BUDGET,
+                 change_check_fps: float = config.VIDEO_CHANGE_CHECK_FPS):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown sampling strategy '{strategy}', expected one of {self.STRATEGIES}")
+        if strategy == "time" and not sample_fps:
+            raise ValueError("The time sampling strategy needs sample_fps")
+        self.strategy = strategy
+        self.frame_skip = max(1, int(frame_skip))
+        self.sample_fps = sample_fps
+        self.change_threshold = change_threshold
+        self.max_gap = max_gap
+        self.frame_budget = frame_budget
+        self.change_check_fps = change_check_fps
+
+    def frames(self, video_path: str):
+        """Yield ``SampledFrame`` objects; raises VideoOpenError if the file cannot be opened."""
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise VideoOpenError(f"Error opening video file {video_path}")
+
+        try:
+            strategy = self.choose_strategy(cap)
+            logger.info("Sampling %s with the %s strategy", video_path, strategy)
+            if strategy == "seek":
+                yield from self._seek(cap)
+            elif strategy == "time":
+                yield from self._time(cap)
+            elif strategy == "adaptive":
+                yield from self._adaptive(cap)
+            else:
+                yield from self._sequential(cap)
+        finally:
+            cap.release()
+
+    def choose_strategy(self, cap) -> str:
+        if self.strategy != "auto":
+            return self.strategy
+        if self.sample_fps:
+            return "time"
+        if self.frame_skip == 1 or int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) <= 0:
+            return "sequential"
+        if fourcc_of(cap) in INTRA_ONLY_FOURCCS or self.frame_skip >= SEEK_STRIDE_THRESHOLD:
+            return "seek"
+        return "sequential"
+
+    def _sequential(self, cap):
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0
+        index = 0
+        while True:
+            if index % self.frame_skip == 0:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield SampledFrame(index, index / fps if fps else 0.0, frame)
+            elif not cap.grab():
+                break
+            index += 1
+
+    def _seek(self, cap):
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0
+        total_frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        for index in range(0, total_frame_count, self.frame_skip):
+            if index and not cap.set(cv2.CAP_PROP_POS_FRAMES, index):
+                break
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield SampledFrame(index, index / fps if fps else 0.0, frame)
+
+    def _time(self, cap):
+        interval = 1.0 / self.sample_fps
+        next_time = 0.0
+        index = 0
+        while cap.grab():
+            timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if timestamp + 1e-6 >= next_time:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                yield SampledFrame(index, timestamp, frame)
+                # Skip ahead rather than accumulate drift on variable frame rates
+                next_time = max(next_time + interval, timestamp + interval / 2)
+            index += 1
+
+    def _adaptive(self, cap):
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        total_frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        duration = total_frame_count / fps if total_frame_count > 0 else 0.0
+        # Never sample more densely than the budget allows over the whole video;
+        # when the length is unknown, stop once the budget is spent instead
+        min_gap = duration / self.frame_budget if self.frame_budget and duration else 0.0
+        max_frames = self.frame_budget if self.frame_budget and not duration else None
+        check_stride = max(1, int(round(fps / self.change_check_fps))) if self.change_check_fps else 1
+
+        last_thumbnail = None
+        last_time = None
+        emitted = 0
+        index = 0
+        while cap.grab():
+            if index % check_stride == 0:
+                timestamp = index / fps
+                if last_time is None or timestamp - last_time >= min_gap:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+                    thumbnail = _thumbnail(frame)
+                    if (
+                        last_time is None
+                        or timestamp - last_time >= self.max_gap
+                        or _difference(thumbnail, last_thumbnail) >= self.change_threshold
+                    ):
+                        yield SampledFrame(index, timestamp, frame)
+                        last_thumbnail = thumbnail
+                        last_time = timestamp
+                        emitted += 1
+                        if max_frames and emitted >= max_frames:
+                            return
+            index += 1
+
+
+def _thumbnail(frame):
+    height, width = frame.shape[:2]
+    size = (CHANGE_THUMBNAIL_WIDTH, max(1, height * CHANGE_THUMBNAIL_WIDTH // width))
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+
+def _difference(a, b) -> float:
+    """Mean absolute gray-level difference between two thumbnails (0-255)."""
+    return float(np.mean(cv2.absdiff(a, b)))
+
+
+def fourcc_of(cap) -> str:
+    code = int(cap.get(cv2.CAP_PROP_FOURCC))
+    return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4))
@@ -0,0 +1,228 @@
+# app/services/frame_workers.py
+"""
+Process-pool frame analysis.
+
+dlib, FER and the Haar cascade hold the GIL, so frames are analyzed in worker
+processes that each load the models once. Frames travel through a
+shared-memory ring of fixed-size slots instead of being pickled; only the slot
+number, the small per-frame results and the task's stage timings cross the
+process boundary.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+from app import config
+from app.services.frame_analysis import FrameResult, analyze_frame, analyze_frames_batch
+from app.utils import metrics
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Per-worker models, filled in by the pool initializer
+_models = None
+
+
+class FramePoolRestartingError(Exception):
+    """Raised when a frame worker died mid-video; the pool is being replaced and the video may be retried."""
+
+
+def _init_frame_worker():
+    global _models
+    # One analysis per process; keep the native libraries from each
+    # spinning up a thread per core on top of that. numpy, OpenCV and dlib
+    # were loaded when this module was unpickled, so environment variables
+    # are too late for them: their pools are resized in place instead.
+    # TensorFlow is only imported with FER below and reads its variables then.
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(limits=1)
+    import cv2
+    cv2.setNumThreads(1)
+    os.environ.setdefault("TF_NUM_INTRAOP_THREADS", "1")
+    os.environ.setdefault("TF_NUM_INTEROP_THREADS", "1")
+
+    from app.services.video_models import get_video_models
+    _models = get_video_models()
+    logger.info("Frame worker %s loaded models", os.getpid())
+
+
+def _analyze_slots(name, shape, dtype, items, known_face_encoding, batched, detection_width):
+    # Attaching is a cheap mmap next to face detection, and not caching the
+    # mapping lets the segment be freed as soon as the video is done
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        frames = [
+            (np.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=offset), index, face_locations)
+            for offset, index, face_locations in items
+        ]
+        if batched:
+            results = analyze_frames_batch(frames, known_face_encoding, _models, detection_width)
+        else:
+            results = [
+                analyze_frame(frame, index, known_face_encoding, _models, face_locations, detection_width)
+                for frame, index, face_locations in frames
+            ]
+        del frames
+        return results, metrics.drain()
+    finally:
+        segment.close()
+
+
+class ParallelFrameAnalyzer:
+    """
+    Analyzes frames on a pool of worker processes sized to the available CPUs.
+
+    Results are returned sorted by frame index, so aggregates never depend on
+    the order in which workers finish.
+
+    A worker that dies (a native crash, the OOM killer) breaks the whole
+    executor. It is then replaced with a new one and the video being
+    analyzed fails with ``FramePoolRestartingError``; later videos use the
+    new workers.
+    """
+
+    def __init__(self, workers: int = None, start_method: str = "spawn"):
+        self.workers = workers or config.VIDEO_WORKERS or config.available_cpus()
+        self._start_method = start_method
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(self._start_method),
+            initializer=_init_frame_worker,
+        )
+
+    def _restart(self, broken) -> None:
+        """Replace ``broken`` with a new executor, unless another caller already did."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = self._new_executor()
+        logger.error("Frame worker pool is broken, starting new workers")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def warmup(self) -> None:
+        """Start every worker so the models are loaded before the first video."""
+        executor = self._executor
+        try:
+            for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+                future.result()
+        except BrokenExecutor as e:
+            self._restart(executor)
+            raise FramePoolRestartingError("Frame workers failed to start and are being restarted") from e
+
+    def analyze(self, frames, known_face_encoding, on_result=None, batch_size: int = 1, detection_width: int = 0):
+        """
+        Analyze ``(index, frame, face_locations)`` items from an iterable of
+        same-sized frames; ``face_locations`` may be None to run the detector.
+
+        With ``batch_size`` above 1, each task covers that many consecutive
+        frames and goes through ``analyze_frames_batch``. The iterable is
+        consumed lazily; at most two batches per worker are in flight at a
+        time. ``on_result`` is called with each FrameResult as it completes,
+        in completion order. ``detection_width`` is passed on to the face
+        detector (see ``locate_faces``).
+        """
+        batch_size = max(batch_size, 1)
+        slots = 2 * self.workers * batch_size
+        executor = self._executor
+        segment = None
+        frame_bytes = 0
+        frame_shape = frame_dtype = None
+        pending = {}
+        free_slots = list(range(slots))
+        batch = []
+        results = []
+
+        try:
+            for index, frame, face_locations in frames:
+                frame = np.ascontiguousarray(frame)
+                if segment is None:
+                    frame_bytes = frame.nbytes
+                    frame_shape, frame_dtype = frame.shape, frame.dtype.str
+                    segment = shared_memory.SharedMemory(create=True, size=frame_bytes * slots)
+                elif frame.shape != frame_shape or frame.dtype.str != frame_dtype:
+                    raise ValueError("All frames of a video must have the same shape and dtype")
+
+                if not free_slots:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        free_slots.extend(self._collect(future, pending, results, on_result))
+
+                slot = free_slots.pop()
+                offset = slot * frame_bytes
+                view = np.ndarray(frame.shape, dtype=frame.dtype, buffer=segment.buf, offset=offset)
+                view[...] = frame
+                del view
+                batch.append((slot, offset, index, face_locations))
+                if len(batch) == batch_size:
+                    self._submit(executor, segment, frame_shape, frame_dtype, batch, known_face_encoding,
+                                 batch_size > 1, detection_width, pending)
+                    batch = []
+
+            if batch:
+                self._submit(executor, segment, frame_shape, frame_dtype, batch, known_face_encoding,
+                             batch_size > 1, detection_width, pending)
+            for future in list(pending):
+                self._collect(future, pending, results, on_result)
+        except BrokenExecutor as e:
+            self._restart(executor)
+            raise FramePoolRestartingError("A frame worker died; the video can be retried") from e
+        finally:
+            if segment is not None:
+                # Running tasks still read from the segment; wait for them before unlinking
+                for future in list(pending):
+                    future.cancel()
+                wait(list(pending))
+                segment.close()
+                segment.unlink()
+
+        results.sort(key=lambda result: result.index)
+        return results
+
+    def _submit(self, executor, segment, shape, dtype, batch, known_face_encoding, batched, detection_width,
+                pending):
+        items = [(offset, index, face_locations) for _, offset, index, face_locations in batch]
+        future = executor.submit(
+            _analyze_slots, segment.name, shape, dtype, items, known_face_encoding, batched, detection_width
+        )
+        pending[future] = [(slot, index) for slot, _, index, _ in batch]
+
+    def _collect(self, future, pending, results, on_result=None):
+        batch = pending.pop(future)
+        try:
+            batch_results, timings = future.result()
+            metrics.merge(timings)
+        except BrokenExecutor:
+            # Every other task of this executor is lost too; let analyze() restart it
+            raise
+        except Exception as e:
+            logger.error("Error processing frames %s-%s: %s", batch[0][1], batch[-1][1], e)
+            batch_results = [FrameResult(index) for _, index in batch]
+        for result in batch_results:
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+        return [slot for slot, _ in batch]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_frame_analyzer(workers: int = config.VIDEO_WORKERS) -> ParallelFrameAnalyzer:
+    """Process-wide ParallelFrameAnalyzer, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParallelFrameAnalyzer(workers)
+        return _pool
@@ -0,0 +1,34 @@
+# app/services/job_cache.py
+import hashlib
+from app.utils.cache import LRUCache
+
+
+def normalize_job_description(text: str) -> str:
+    """Normalize line endings and surrounding whitespace so equal postings share a key."""
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def job_description_key(text: str) -> str:
+    """Content hash of an already normalized job description."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class JobAnalysis:
+    """Everything derived from a job description that does not depend on the resume."""
+
+    __slots__ = ("categories", "job_info", "embedding")
+
+    def __init__(self, categories, job_info, embedding):
+        self.categories = categories
+        self.job_info = job_info
+        self.embedding = embedding
+
+
+class JobDescriptionCache(LRUCache):
+    """LRU cache of ``JobAnalysis`` objects keyed by the hash of the normalized text."""
+
+    def lookup(self, text: str):
+        return self.get(job_description_key(text))
+
+    def store(self, text: str, analysis: JobAnalysis) -> None:
+        self.put(job_description_key(text), analysis)
@@ -0,0 +1,257 @@
+# app/services/job_queue.py
+"""
+Background queue for video analysis jobs.
+
+Uploads are spooled to disk and analyzed by a fixed number of worker threads,
+shortest video first; job state and results live in a local SQLite database,
+so polling clients and re-submitted videos are answered without touching the
+analysis pipeline. There is no external broker: jobs that were still queued
+or running when the process stopped are marked failed on the next start.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+import cv2
+from app import config
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_COPY_CHUNK = 1024 * 1024
+
+
+class VideoJobStore:
+    """SQLite table of jobs, their status and JSON results."""
+
+    def __init__(self, path: str = config.VIDEO_JOB_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    candidate_id TEXT,
+                    content_key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    duration REAL,
+                    submitted_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    result TEXT,
+                    error TEXT,
+                    degraded INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "degraded" not in columns:
+                # Databases created before degraded reports were tracked
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN degraded INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_content_key ON jobs (content_key)")
+
+    def create(self, job_id: str, candidate_id: str, content_key: str, duration: Optional[float]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, candidate_id, content_key, status, duration, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, candidate_id, content_key, QUEUED, duration, time.time()),
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row)
+
+    def find_reusable(self, content_key: str) -> Optional[dict]:
+        """
+        Latest job for the same content that has not failed. Degraded reports
+        (speech or frames timed out or failed) are not reused, so a resubmitted
+        video gets analyzed again.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE content_key = ? AND status != ? AND degraded = 0 "
+                "ORDER BY submitted_at DESC LIMIT 1",
+                (content_key, FAILED),
+            ).fetchone()
+        return self._to_dict(row)
+
+    def mark_running(self, job_id: str) -> None:
+        self._update(job_id, status=RUNNING, started_at=time.time())
+
+    def mark_done(self, job_id: str, result: dict) -> None:
+        self._update(job_id, status=DONE, finished_at=time.time(), result=json.dumps(result),
+                     degraded=int("degraded" in result))
+
+    def mark_failed(self, job_id: str, error: str) -> None:
+        self._update(job_id, status=FAILED, finished_at=time.time(), error=error)
+
+    def fail_unfinished(self, error: str) -> list:
+        """Mark every queued or running job failed; returns their ids."""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchall()
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE status IN (?, ?)",
+                (FAILED, time.time(), error, QUEUED, RUNNING),
+            )
+        return [row["id"] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _update(self, job_id, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def _to_dict(self, row):
+        if row is None:
+            return None
+        job = dict(row)
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+
+def video_duration(path: str) -> Optional[float]:
+    """Duration in seconds from the container header, or None if unknown."""
+    cap = cv2.VideoCapture(path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    finally:
+        cap.release()
+    if fps > 0 and frame_count > 0:
+        return frame_count / fps
+    return None
+
+
+class VideoJobQueue:
+    """
+    Runs ``analyze(video_path, known_face_encoding)`` for submitted videos on
+    ``workers`` threads, shortest video first.
+
+    A submission whose video and reference photo match an earlier job that
+    has not failed gets that job back instead of a new one, so a finished
+    duplicate is answered from the store immediately.
+    """
+
+    def __init__(self, analyze: Callable, store: VideoJobStore = None,
+                 workers: int = config.VIDEO_JOB_WORKERS,
+                 spool_dir: str = config.VIDEO_JOB_SPOOL_DIR):
+        self.analyze = analyze
+        self.store = store
+        self.workers = max(workers, 1)
+        self.spool_dir = spool_dir
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._submit_lock = threading.Lock()
+        self._threads = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        if self.store is None:
+            self.store = VideoJobStore()
+        os.makedirs(self.spool_dir, exist_ok=True)
+        # Encodings and spooled videos of earlier runs are gone with that process
+        for job_id in self.store.fail_unfinished("Server restarted before the job finished"):
+            self._remove_spool(job_id)
+
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"video-job-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self) -> None:
+        for _ in self._threads:
+            self._queue.put((float("-inf"), next(self._order), None))
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, candidate_id: str, image_bytes: bytes, video_file, known_face_encoding) -> dict:
+        """
+        Spool ``video_file`` (a binary file object) and queue it for analysis.
+
+        Returns the job record, which may be an earlier job for the same content.
+        """
+        job_id = uuid.uuid4().hex
+        spool_path = self._spool_path(job_id)
+        digest = hashlib.sha256(hashlib.sha256(image_bytes).digest())
+        with open(spool_path, "wb") as f:
+            while True:
+                chunk = video_file.read(_COPY_CHUNK)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                f.write(chunk)
+        content_key = digest.hexdigest()
+
+        with self._submit_lock:
+            existing = self.store.find_reusable(content_key)
+            if existing is None:
+                duration = video_duration(spool_path)
+                self.store.create(job_id, candidate_id, content_key, duration)
+        if existing is not None:
+            os.unlink(spool_path)
+            logger.info("Video job %s reused for identical upload", existing['id'])
+            return existing
+
+        # Videos of unknown length go after everything else
+        priority = duration if duration is not None else float("inf")
+        self._queue.put((priority, next(self._order), (job_id, known_face_encoding)))
+        logger.info("Queued video job %s (%ss of video)", job_id, duration)
+        return self.store.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _work(self):
+        while True:
+            _, _, item = self._queue.get()
+            if item is None:
+                return
+            job_id, known_face_encoding = item
+            self.store.mark_running(job_id)
+            try:
+                result = self.analyze(self._spool_path(job_id), known_face_encoding)
+                self.store.mark_done(job_id, result)
+                logger.info("Video job %s done", job_id)
+            except Exception as e:
+                logger.error("Video job %s failed: %s", job_id, e)
+                self.store.mark_failed(job_id, str(e))
+            finally:
+                self._remove_spool(job_id)
+
+    def _spool_path(self, job_id):
+        return os.path.join(self.spool_dir, f"{job_id}.video")
+
+    def _remove_spool(self, job_id):
+        try:
+            os.unlink(self._spool_path(job_id))
+        except FileNotFoundError:
+            pass
@@ -1,14 +1,40 @@
 # app/services/score_calculator.py
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+import os
+from app.services.embedding_backends import load_embedding_backend
+from app.services.embedding_batcher import MicroBatchEncoder
+from app.services.embedding_store import PhraseEmbeddingStore
+from app.utils import metrics
 from app.utils.logger import setup_logger
+from app import config
 
 logger = setup_logger()
 
 class ScoreCalculator:
-    def __init__(self):
-        self.model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
+    def __init__(self, phrase_store_path: str = config.PHRASE_EMBEDDINGS_PATH,
+                 batch_max_wait_ms: float = config.EMBED_BATCH_MAX_WAIT_MS,
+                 batch_max_size: int = config.EMBED_BATCH_MAX_SIZE,
+                 embedding_backend: str = config.EMBEDDING_BACKEND):
+        self.model = load_embedding_backend(embedding_backend)
+        self.batcher = None
+        self.encode = self.model.encode
+        if batch_max_wait_ms > 0:
+            self.batcher = MicroBatchEncoder(self.model.encode, batch_max_size, batch_max_wait_ms)
+            self.encode = self.batcher.encode
+        self.encode = metrics.instrument(self.encode, metrics.EMBEDDING_ENCODE_SECONDS, backend=embedding_backend)
+        self.phrase_store_path = phrase_store_path
+        self.phrase_store = PhraseEmbeddingStore(self.encode)
+        if phrase_store_path and os.path.exists(phrase_store_path):
+            try:
+                self.phrase_store.load(phrase_store_path)
+            except Exception as e:
+                logger.error("Failed to load phrase embeddings from %s: %s", phrase_store_path, e)
+
+    def save_phrase_embeddings(self, path: str = None) -> None:
+        path = path or self.phrase_store_path
+        if path:
+            self.phrase_store.save(path)
 
     def calculate_job_title_score(self, resume_title: str, job_title: str) -> float:
         if not resume_title or not job_title:
@@ -25,8 +51,7 @@ class ScoreCalculator:
         job_set = set(job_tokens)
         jaccard_similarity = len(resume_set.intersection(job_set)) / len(resume_set.union(job_set))
 
-        resume_embedding = self.model.encode(resume_title)
-        job_embedding = self.model.encode(job_title)
+        resume_embedding, job_embedding = self.phrase_store.encode([resume_title, job_title])
         embedding_similarity = cosine_similarity([resume_embedding], [job_embedding])[0][0]
 
         return (jaccard_similarity + embedding_similarity) / 2
@@ -41,8 +66,10 @@ class ScoreCalculator:
         exact_matches = resume_skills_set.intersection(job_skills_set)
         exact_match_score = len(exact_matches) / len(job_skills_set)
 
-        resume_embeddings = self.model.encode(list(resume_skills_set))
-        job_embeddings = self.model.encode(list(job_skills_set))
+        resume_skills_list = list(resume_skills_set)
+        embeddings = self.phrase_store.encode(resume_skills_list + list(job_skills_set))
+        resume_embeddings = embeddings[:len(resume_skills_list)]
+        job_embeddings = embeddings[len(resume_skills_list):]
 
         if len(resume_embeddings) > 0 and len(job_embeddings) > 0:
             similarities = cosine_similarity(resume_embeddings, job_embeddings)
@@ -73,7 +100,7 @@ class ScoreCalculator:
 
 
     def calculate_education_score(self,resume_edu, job_edu):
-        logger.info(f"Calculating education score for {resume_edu} against {job_edu}")
+        logger.debug("Calculating education score for %s against %s", resume_edu, job_edu)
         edu_levels = {'high school': 1, 'associate': 2, 'bachelor': 3, 'master': 4, 'phd': 5}
         
         normalized_resume_edu = [self.normalize_education(edu) for edu in resume_edu]
@@ -86,7 +113,7 @@ class ScoreCalculator:
             return 1.0
         
         score = min(resume_level / job_level, 1.0)
-        logger.info(f"Education score: {score}")
+        logger.debug("Education score: %s", score)
         return score
 
 
@@ -95,32 +122,42 @@ class ScoreCalculator:
 
 
     def calculate_experience_score(self,resume_years, job_years):
-        logger.info(f"Calculating experience score for {resume_years} years against {job_years} years")
+        logger.debug("Calculating experience score for %s years against %s years", resume_years, job_years)
         if job_years == 0:
             return 1.0
         
         score = min(resume_years / job_years, 1.0)
-        logger.info(f"Experience score: {score}")
+        logger.debug("Experience score: %s", score)
         return score
 
     def calculate_category_score(self,resume_items, job_items):
-        logger.info(f"Calculating category score for {resume_items} against {job_items}")
+        logger.debug("Calculating category score for %s against %s", resume_items, job_items)
         if not job_items:
             return 1.0
         match_count = len(set(resume_items) & set(job_items))
         score = match_count / len(job_items)
-        logger.info(f"Category score: {score}")
+        logger.debug("Category score: %s", score)
         return score
 
-    def similarty_score(self,resume_text,job_description):
-        resume_embedding = self.model.encode(resume_text)
-        job_embedding = self.model.encode(job_description)
+    def encode_text(self, text: str) -> np.ndarray:
+        return self.encode(text)
+
+    def similarty_score(self,resume_text,job_description,job_embedding=None):
+        resume_embedding = self.encode(resume_text)
+        if job_embedding is None:
+            job_embedding = self.encode(job_description)
         embedding_similarity = cosine_similarity([resume_embedding], [job_embedding])[0][0]
         return embedding_similarity
-   
-
-
 
+    def similarity_scores(self, resume_texts: list, job_description: str, job_embedding=None) -> list:
+        """Embedding similarity of each resume to the job description, encoded in one batch."""
+        if not resume_texts:
+            return []
 
-
- 
\ No newline at end of file
+        if job_embedding is None:
+            embeddings = self.encode([job_description] + list(resume_texts))
+            job_embedding, resume_embeddings = embeddings[0], embeddings[1:]
+        else:
+            resume_embeddings = self.encode(list(resume_texts))
+        similarities = cosine_similarity(resume_embeddings, [job_embedding])
+        return similarities[:, 0].tolist()
@@ -0,0 +1,239 @@
+# app/services/scoring_pool.py
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import util
+
+from app import config
+from app.utils import metrics
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Per-worker state. Each worker process builds its own ATSCalculator once in
+# the pool initializer; in thread mode the threads share a single instance.
+_calculator = None
+_calculator_lock = threading.Lock()
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the scoring queue is full and the request should be rejected."""
+
+
+class PoolRestartingError(Exception):
+    """Raised while a broken pool is replaced; the request may be retried shortly."""
+
+
+def _init_worker(threads_per_worker: int = 0):
+    global _calculator
+    with _calculator_lock:
+        if _calculator is not None:
+            return
+        if threads_per_worker:
+            try:
+                import torch
+                torch.set_num_threads(threads_per_worker)
+            except ImportError:
+                pass
+
+        from app.services.ats_calculator import ATSCalculator
+        _calculator = ATSCalculator()
+        logger.info("Scoring worker %s loaded models", os.getpid())
+
+        if multiprocessing.parent_process() is not None:
+            # Persist phrase embeddings learned by this worker when it exits
+            util.Finalize(None, _save_worker_state, exitpriority=10)
+
+
+def _save_worker_state():
+    if _calculator is None:
+        return
+    try:
+        _calculator.score_calculator.save_phrase_embeddings()
+    except Exception as e:
+        logger.error("Failed to save phrase embeddings: %s", e)
+
+
+def _ping():
+    return os.getpid()
+
+
+def _score_resume(resume_text: str, job_description: str):
+    score, category_scores, resume_info, job_info = _calculator.calculate_ats_score(
+        resume_text, job_description
+    )
+    feedback = _calculator.provide_feedback(score, category_scores, resume_info, job_info)
+    return score, category_scores, feedback
+
+
+def _score_resumes_batch(job_description: str, resumes: list):
+    results = _calculator.calculate_ats_scores_batch(job_description, resumes)
+    return [(score, category_scores) for score, category_scores, _, _ in results]
+
+
+def _with_metrics(fn, *args):
+    # Worker processes hand their stage timings back with each result
+    return fn(*args), metrics.drain()
+
+
+def _merge_worker_metrics(future):
+    if not future.cancelled() and future.exception() is None:
+        metrics.merge(future.result()[1])
+
+
+class ScoringPool:
+    """
+    Runs ATSCalculator work off the event loop.
+
+    With ``workers > 0`` scoring runs in a process pool whose workers each load
+    the models once; with ``workers == 0`` it runs on threads in this process.
+    At most ``workers + queue_size`` requests are accepted at a time; beyond
+    that ``PoolSaturatedError`` is raised so the API can answer 503.
+
+    A worker that dies (e.g. killed for running out of memory) or fails to
+    load the models breaks the whole executor. It is then replaced with a
+    new one, and ``PoolRestartingError`` is raised until a new worker has
+    loaded the models.
+    """
+
+    def __init__(self, workers: int = config.ATS_WORKERS,
+                 queue_size: int = config.ATS_QUEUE_SIZE,
+                 timeout: float = config.ATS_REQUEST_TIMEOUT,
+                 start_method: str = config.ATS_WORKER_START_METHOD):
+        self.workers = workers
+        self.max_pending = max(workers, 1) + queue_size
+        self.timeout = timeout
+        self._start_method = start_method
+        self._executor = None
+        self._pings = []
+        self._restarting = False
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Create the executor and start loading models in every worker."""
+        if self._executor is not None:
+            return
+        if self.workers > 0:
+            if config.EMBED_BATCH_MAX_WAIT_MS > 0:
+                logger.warning(
+                    "EMBED_BATCH_MAX_WAIT_MS only adds latency with ATS_WORKERS > 0: "
+                    "each worker process encodes for one request at a time"
+                )
+            threads_per_worker = max(1, config.available_cpus() // self.workers)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self._start_method),
+                initializer=_init_worker,
+                initargs=(threads_per_worker,),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=config.available_cpus(),
+                thread_name_prefix="ats-scoring",
+                initializer=_init_worker,
+            )
+        # Workers are spawned on demand; one ping per worker brings them all up
+        self._pings = [self._executor.submit(_ping) for _ in range(max(self.workers, 1))]
+        for ping in self._pings:
+            ping.add_done_callback(self._on_ping)
+
+    def warmup(self) -> None:
+        """Start the pool and wait until its workers have loaded the models."""
+        self.start()
+        executor = self._executor
+        try:
+            for future in [executor.submit(_ping) for _ in range(max(self.workers, 1))]:
+                future.result()
+        except BrokenExecutor:
+            self._restart(executor)
+            raise
+
+    def loaded(self) -> bool:
+        """Whether the current workers have loaded the models."""
+        return self._executor is not None and not self._restarting and any(
+            ping.done() and not ping.cancelled() and ping.exception() is None for ping in self._pings
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        self._restarting = False
+        if self.workers == 0:
+            _save_worker_state()
+
+    def _on_ping(self, future):
+        if not future.cancelled() and future.exception() is None:
+            self._restarting = False
+
+    def _restart(self, broken) -> None:
+        """Replace ``broken`` with a new executor, unless another caller already did."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = None
+            self._restarting = True
+        logger.error("Scoring pool is broken, starting new workers")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.start()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def score_resume(self, resume_text: str, job_description: str):
+        """Return ``(score, category_scores, feedback)`` for one resume."""
+        return await self._submit(_score_resume, resume_text, job_description)
+
+    async def score_resumes_batch(self, job_description: str, resumes: list):
+        """Return ``(score, category_scores)`` for each resume, in input order."""
+        return await self._submit(_score_resumes_batch, job_description, resumes)
+
+    async def _submit(self, fn, *args):
+        if self._executor is None:
+            self.start()
+        executor = self._executor
+        if self._restarting:
+            if all(ping.done() for ping in self._pings):
+                # The new workers failed to start as well; try again
+                self._restart(executor)
+            raise PoolRestartingError("Scoring workers are restarting, try again shortly")
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PoolSaturatedError("Scoring queue is full, try again later")
+            self._pending += 1
+
+        in_workers = self.workers > 0
+        try:
+            if in_workers:
+                future = executor.submit(_with_metrics, fn, *args)
+            else:
+                future = executor.submit(fn, *args)
+        except BrokenExecutor:
+            self._release()
+            self._restart(executor)
+            raise PoolRestartingError("Scoring workers are restarting, try again shortly")
+        except Exception:
+            self._release()
+            raise
+        # A timed-out task that is already running cannot be interrupted, so
+        # its slot is only released once the worker actually finishes it
+        future.add_done_callback(self._release)
+        if in_workers:
+            # Merged on completion so the timings of timed-out tasks still count
+            future.add_done_callback(_merge_worker_metrics)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except BrokenExecutor:
+            self._restart(executor)
+            raise PoolRestartingError("Scoring workers are restarting, try again shortly")
+        return result[0] if in_workers else result
+
+    def _release(self, *_):
+        with self._lock:
+            self._pending -= 1
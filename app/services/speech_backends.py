@@ -0,0 +1,246 @@
+# app/services/speech_backends.py
+"""
+Speech-to-text backends and chunked transcription.
+
+Audio is handled as mono 16-bit PCM in a numpy array. SpeechTranscriber cuts
+it on silences into chunks of at most ``max_chunk_seconds``, transcribes the
+chunks in parallel with the configured backend and stitches the words back
+together on the recording's timeline, so speaking rate comes from when words
+were actually spoken rather than from the file length.
+
+Backends:
+
+- ``google``: the free Google Web Speech API through speech_recognition.
+  Needs network access; gives no word timings, so each chunk's words are
+  timed by the chunk.
+- ``vosk``: offline Kaldi models (``pip install vosk`` and a model from
+  https://alphacephei.com/vosk/models in ``VOSK_MODEL_PATH``). Gives word
+  timings and does not depend on a remote service.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+from app import config
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Length of the frames whose energy decides speech or silence
+ENERGY_FRAME_SECONDS = 0.03
+
+
+class SpeechRecognitionError(Exception):
+    """No chunk of the recording could be transcribed."""
+
+
+class Word:
+    __slots__ = ("text", "start", "end")
+
+    def __init__(self, text: str, start: float, end: float):
+        self.text = text
+        self.start = start
+        self.end = end
+
+
+class Transcript:
+    """Stitched transcription with word timings in seconds from the start of the audio."""
+
+    def __init__(self, words: List[Word]):
+        self.words = words
+
+    @property
+    def text(self) -> str:
+        return " ".join(word.text for word in self.words)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def speaking_seconds(self) -> float:
+        if not self.words:
+            return 0.0
+        return self.words[-1].end - self.words[0].start
+
+    @property
+    def speaking_rate(self) -> Optional[float]:
+        """Words per minute between the first and the last word."""
+        if self.speaking_seconds <= 0:
+            return None
+        return self.word_count / (self.speaking_seconds / 60)
+
+
+class GoogleSpeechBackend:
+    """Google Web Speech API via speech_recognition; needs network access."""
+
+    name = "google"
+
+    def __init__(self):
+        import speech_recognition as sr
+        self._sr = sr
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> List[Tuple[str, Optional[float], Optional[float]]]:
+        audio = self._sr.AudioData(samples.tobytes(), sample_rate, 2)
+        try:
+            text = self._sr.Recognizer().recognize_google(audio)
+        except self._sr.UnknownValueError:
+            return []
+        return [(word, None, None) for word in text.split()]
+
+
+class VoskSpeechBackend:
+    """Offline recognition with a local Vosk model, with word timings."""
+
+    name = "vosk"
+
+    def __init__(self, model_path: str = config.VOSK_MODEL_PATH):
+        from vosk import KaldiRecognizer, Model, SetLogLevel
+        SetLogLevel(-1)
+        # The model is read-only and shared; recognizers are per chunk
+        self.model = Model(model_path)
+        self._recognizer = KaldiRecognizer
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> List[Tuple[str, Optional[float], Optional[float]]]:
+        recognizer = self._recognizer(self.model, sample_rate)
+        recognizer.SetWords(True)
+        words = []
+        data = samples.tobytes()
+        step = sample_rate * 2 * 4
+        for start in range(0, len(data), step):
+            if recognizer.AcceptWaveform(data[start:start + step]):
+                words.extend(self._words(recognizer.Result()))
+        words.extend(self._words(recognizer.FinalResult()))
+        return words
+
+    def _words(self, result):
+        return [(word["word"], word["start"], word["end"]) for word in json.loads(result).get("result", [])]
+
+
+SPEECH_BACKENDS = {
+    backend.name: backend
+    for backend in (GoogleSpeechBackend, VoskSpeechBackend)
+}
+
+
+def load_speech_backend(name: str = config.SPEECH_BACKEND):
+    """Instantiate the speech backend registered under ``name``."""
+    try:
+        backend = SPEECH_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown speech backend '{name}', expected one of {sorted(SPEECH_BACKENDS)}"
+        )
+    logger.info("Loading %s speech backend", name)
+    return backend()
+
+
+def split_on_silence(samples: np.ndarray, sample_rate: int,
+                     min_silence: float = config.SPEECH_MIN_SILENCE_SECONDS,
+                     silence_db: float = config.SPEECH_SILENCE_DB,
+                     max_chunk: float = config.SPEECH_MAX_CHUNK_SECONDS,
+                     padding: float = 0.2) -> List[Tuple[int, int]]:
+    """
+    ``(start, end)`` sample ranges of the speech in ``samples``.
+
+    Frames quieter than ``silence_db`` below the loud end of the recording
+    are silence; pauses shorter than ``min_silence`` stay inside a chunk.
+    Consecutive speech is packed into chunks of at most ``max_chunk``
+    seconds, cut only in pauses unless a single stretch of speech is longer.
+    """
+    frame = max(int(sample_rate * ENERGY_FRAME_SECONDS), 1)
+    count = len(samples) // frame
+    if count == 0:
+        return []
+    frames = samples[:count * frame].astype(np.float32).reshape(count, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    reference = np.percentile(rms, 99)
+    if reference <= 0:
+        return []
+    voiced = rms > reference * 10 ** (silence_db / 20)
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    segments = []
+    min_gap = min_silence / ENERGY_FRAME_SECONDS
+    for start, end in zip(edges[::2], edges[1::2]):
+        if segments and start - segments[-1][1] < min_gap:
+            segments[-1][1] = end
+        else:
+            segments.append([start, end])
+
+    pad = int(padding * sample_rate)
+    max_samples = max(int(max_chunk * sample_rate), 1)
+    chunks = []
+    for start, end in segments:
+        start = max(start * frame - pad, 0)
+        end = min(end * frame + pad, len(samples))
+        if chunks and end - chunks[-1][0] <= max_samples:
+            chunks[-1][1] = end
+            continue
+        if chunks:
+            # Padding must not hand the same audio to two chunks
+            start = max(start, chunks[-1][1])
+        # A single stretch of speech longer than max_chunk is cut evenly
+        pieces = -(-(end - start) // max_samples)
+        bounds = np.linspace(start, end, pieces + 1).astype(int)
+        chunks.extend([int(a), int(b)] for a, b in zip(bounds[:-1], bounds[1:]))
+    return [(start, end) for start, end in chunks]
+
+
+class SpeechTranscriber:
+    """Transcribes a recording chunk by chunk, ``workers`` chunks at a time."""
+
+    def __init__(self, backend=None, workers: int = config.SPEECH_WORKERS):
+        self.backend = backend if backend is not None else load_speech_backend()
+        self.workers = max(workers, 1)
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> Transcript:
+        chunks = split_on_silence(samples, sample_rate)
+        if not chunks:
+            return Transcript([])
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+            futures = [
+                executor.submit(self.backend.transcribe, samples[start:end], sample_rate)
+                for start, end in chunks
+            ]
+
+        words = []
+        failures = 0
+        for (start, end), future in zip(chunks, futures):
+            try:
+                chunk_words = future.result()
+            except Exception as e:
+                logger.error("Could not transcribe speech from %.1fs: %s", start / sample_rate, e)
+                failures += 1
+                continue
+            offset = start / sample_rate
+            for text, word_start, word_end in chunk_words:
+                if word_start is None:
+                    # No word timings: the chunk's words span the chunk
+                    word_start, word_end = 0.0, (end - start) / sample_rate
+                words.append(Word(text, offset + word_start, offset + word_end))
+
+        if failures == len(chunks):
+            raise SpeechRecognitionError(f"All {failures} speech chunks failed to transcribe")
+        return Transcript(words)
+
+
+_transcriber = None
+_transcriber_lock = threading.Lock()
+
+
+def transcriber_loaded() -> bool:
+    return _transcriber is not None
+
+
+def get_speech_transcriber() -> SpeechTranscriber:
+    """Process-wide SpeechTranscriber, so the backend model loads once."""
+    global _transcriber
+    with _transcriber_lock:
+        if _transcriber is None:
+            _transcriber = SpeechTranscriber()
+        return _transcriber
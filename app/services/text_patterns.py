@@ -0,0 +1,114 @@
+# app/services/text_patterns.py
+"""
+Regular expressions used by TextProcessor, compiled once at import time.
+
+Category patterns stay one regex each rather than one alternation per
+category: ``findall`` never returns overlapping matches, so an alternation
+would drop hits such as "b.a. degree" inside "M.B.A. degree" that a separate
+pattern still finds.
+"""
+
+import re
+from typing import Dict, Iterable, List, Pattern, Set
+
+JOB_TITLE_PATTERNS: List[Pattern] = [
+    re.compile(r"(?i)(?:job title|position|role|title|position title|job role)s?:?\s*(.*?)(?:\n|$)"),
+    re.compile(r"(?i)(?:we are hiring|hiring for|looking for|seeking)\s*(?:a|an)?\s*(.*?)(?:\n|$)"),
+    re.compile(r"(?i)^(?:senior|junior|lead|principal|staff)?\s*([^.!?\n]+)(?:\n|$)"),
+]
+
+# Kept as separate scans: a phrase list can contain a keyword that the last
+# pattern must still see on its own.
+SKILL_PATTERNS: List[Pattern] = [
+    re.compile(r'\b(?:proficient|experienced|skilled|expertise)\s+in\s+([\w\s,/+]+)', re.IGNORECASE),
+    re.compile(r'\b(?:knowledge|understanding)\s+of\s+([\w\s,/+]+)', re.IGNORECASE),
+    re.compile(r'(?:technologies|tools|frameworks|languages):\s*([\w\s,/+]+)', re.IGNORECASE),
+    re.compile(r'\b(?:HTML5?|CSS3?|JavaScript|Python|Java|C\+\+|React|Angular|Vue|Node\.js|SQL|AWS|Azure|Git)\b', re.IGNORECASE),
+]
+
+CATEGORY_PATTERN_TABLE: Dict[str, List[str]] = {
+    "education": [
+        r'\b(?:high school diploma|GED|secondary education)\b',
+        r'\b(?:associate\'?s?|AA|AS)\s*(?:degree)?\b',
+        r'\b(?:bachelor\'?s?|BA|BS|B\.A\.|B\.S\.)\s*(?:degree)?\b',
+        r'\b(?:master\'?s?|MA|MS|M\.A\.|M\.S\.|MBA|M\.B\.A\.)\s*(?:degree)?\b',
+        r'\b(?:phd|ph\.d\.|doctorate|doctoral)\s*(?:degree)?\b',
+        r'\b(?:post-graduate|postgraduate)\s*(?:degree|qualification)?\b',
+    ],
+    "experience": [
+        r'\b(?:entry[ -]level|junior|graduate|fresher)\b',
+        r'\b(?:mid[ -]level|intermediate|associate)\b',
+        r'\b(?:senior|experienced|advanced)\b',
+        r'\b(?:lead|principal|architect|manager)\b',
+        r'\b(?:director|head|chief|vp|vice president|executive)\b',
+        r'\b(?:c-level|cto|cio|ceo|cfo)\b',
+    ],
+    "job_type": [
+        r'\b(?:full[ -]time|permanent|regular)\b',
+        r'\b(?:part[ -]time|hourly)\b',
+        r'\b(?:contract|temporary|interim|temp)\b',
+        r'\b(?:freelance|independent|consultant)\b',
+        r'\b(?:internship|intern|trainee|co-op)\b',
+        r'\b(?:remote|work from home|wfh|hybrid|on-site|in-office)\b',
+    ],
+    "industry": [
+        r'\b(?:technology|IT|software|tech)\b',
+        r'\b(?:finance|banking|fintech|insurance)\b',
+        r'\b(?:healthcare|medical|pharma|biotech)\b',
+        r'\b(?:education|academic|e-learning)\b',
+        r'\b(?:retail|e-commerce|consumer)\b',
+        r'\b(?:manufacturing|industrial|production)\b',
+        r'\b(?:media|entertainment|digital|creative)\b',
+        r'\b(?:government|public sector|defense)\b',
+        r'\b(?:consulting|professional services)\b',
+        r'\b(?:telecommunications|telecom)\b',
+        r'\b(?:automotive|transportation)\b',
+        r'\b(?:energy|utilities|oil|gas)\b',
+    ],
+}
+
+CATEGORY_PATTERNS: Dict[str, List[Pattern]] = {
+    category: [re.compile(p, re.IGNORECASE) for p in patterns]
+    for category, patterns in CATEGORY_PATTERN_TABLE.items()
+}
+
+# Each pattern contributes its first match; the largest value wins.
+YEARS_EXPERIENCE_PATTERNS: List[Pattern] = [
+    re.compile(r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of)?\s*(?:experience|exp)', re.IGNORECASE),
+    re.compile(r'(?:minimum|min)\s*(?:of)?\s*(\d+)\s*(?:years?|yrs?)', re.IGNORECASE),
+    re.compile(r'(?:at least|minimum)\s*(\d+)\s*(?:years?|yrs?)', re.IGNORECASE),
+    re.compile(r'(\d+)(?:-\d+)?\s*(?:years?|yrs?)\s*(?:experience|exp)?', re.IGNORECASE),
+]
+
+YEARS_PATTERN: Pattern = re.compile(r'(\d+)\+?\s*(?:years?|yrs?)', re.IGNORECASE)
+
+
+def _is_word_char(ch: str) -> bool:
+    # Same definition as ``\w`` for str patterns
+    return ch.isalnum() or ch == "_"
+
+
+def _at_boundary(text: str, pos: int) -> bool:
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+def find_whole_words(items: Iterable[str], text_lower: str) -> Set[str]:
+    """
+    Return the items that occur in ``text_lower`` between word boundaries.
+
+    Equivalent to ``re.search(r'\\b' + re.escape(item) + r'\\b', text, re.IGNORECASE)``
+    for each item, but uses ``str.find`` on the lowercased text instead of
+    compiling and running one regex per item.
+    """
+    found = set()
+    for item in items:
+        needle = item.lower()
+        start = text_lower.find(needle)
+        while start != -1:
+            if _at_boundary(text_lower, start) and _at_boundary(text_lower, start + len(needle)):
+                found.add(item)
+                break
+            start = text_lower.find(needle, start + 1)
+    return found
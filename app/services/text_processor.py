@@ -5,11 +5,79 @@ import re
 import spacy
 import yake
 from collections import defaultdict
-from typing import Dict, Set, Union, List
+from typing import Dict, Pattern, Set, Union, List
+from app.services.text_patterns import (
+    CATEGORY_PATTERNS,
+    JOB_TITLE_PATTERNS,
+    SKILL_PATTERNS,
+    YEARS_EXPERIENCE_PATTERNS,
+    YEARS_PATTERN,
+    find_whole_words,
+)
+from app.utils import metrics
 from app.utils.logger import setup_logger
 
 logger = setup_logger()
 
+
+class AnalyzedText:
+    """
+    A text analyzed once and shared by every extractor.
+
+    The spaCy Doc, YAKE keywords, lowercased text and regex hits are computed
+    lazily on first use and cached, so extracting categories and info from
+    the same text never runs a model or a pattern twice.
+    """
+
+    def __init__(self, text: str, processor: "TextProcessor"):
+        self.text = text
+        self._processor = processor
+        self._doc = None
+        self._keywords = None
+        self._lower = None
+        self._hits = {}
+
+    @property
+    def doc(self):
+        if self._doc is None:
+            with metrics.timer(metrics.TEXT_STAGE_SECONDS, stage="spacy"):
+                self._doc = self._processor.nlp(self.text)
+        return self._doc
+
+    @property
+    def keywords(self) -> List[str]:
+        """Lowercased YAKE keywords, best first."""
+        if self._keywords is None:
+            with metrics.timer(metrics.TEXT_STAGE_SECONDS, stage="yake"):
+                keywords = self._processor.keyword_extractor.extract_keywords(self.text)
+            self._keywords = [keyword[0].lower() for keyword in keywords]
+        return self._keywords
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    def findall(self, pattern: Pattern) -> List:
+        key = ("findall", pattern)
+        if key not in self._hits:
+            self._hits[key] = pattern.findall(self.text)
+        return self._hits[key]
+
+    def finditer(self, pattern: Pattern) -> List:
+        key = ("finditer", pattern)
+        if key not in self._hits:
+            self._hits[key] = list(pattern.finditer(self.text))
+        return self._hits[key]
+
+    def search(self, pattern: Pattern):
+        key = ("search", pattern)
+        if key not in self._hits:
+            self._hits[key] = pattern.search(self.text)
+        return self._hits[key]
+
+
 class TextProcessor:
     def __init__(self):
         """Initialize the TextProcessor with required NLP models."""
@@ -23,99 +91,110 @@ class TextProcessor:
                 features=None
             )
         except Exception as e:
-            logger.error(f"Failed to initialize TextProcessor: {str(e)}")
+            logger.error("Failed to initialize TextProcessor: %s", e)
             raise
 
-    def extract_categories(self, text: str) -> Dict[str, Union[Set[str], int]]:
+    def analyze(self, text: Union[str, AnalyzedText]) -> AnalyzedText:
+        """
+        Wrap text in an AnalyzedText so its models and patterns run at most once.
+
+        Args:
+            text (Union[str, AnalyzedText]): Raw text or an already analyzed text
+
+        Returns:
+            AnalyzedText: Lazily analyzed text bound to this processor
+        """
+        if isinstance(text, AnalyzedText):
+            return text
+        return AnalyzedText(text, self)
+
+    def extract_categories(self, text: Union[str, AnalyzedText]) -> Dict[str, Union[Set[str], int]]:
         """
         Extract all categories from the given text.
         
         Args:
-            text (str): Input text to process
+            text (Union[str, AnalyzedText]): Input text to process
             
         Returns:
             Dict[str, Union[Set[str], int]]: Dictionary containing extracted categories
         """
-        logger.info("Extracting categories from text")
-        doc = self.nlp(text)
+        logger.debug("Extracting categories from text")
+        analyzed = self.analyze(text)
         categories = defaultdict(set)
+        # Run both models up front so each extractor's timing is its own work
+        doc = analyzed.doc
+        analyzed.keywords
 
-        self._extract_job_title(text, categories, doc)
-        self._extract_skills(text, categories)
-        self._extract_entities(doc, categories)
-        self._extract_education(text, categories)
-        self._extract_experience_level(text, categories)
-        self._extract_job_type(text, categories)
-        self._extract_industry(text, categories)
-        self._extract_years_experience(text, categories)
+        extractors = (
+            ("job_title", self._extract_job_title, analyzed),
+            ("skills", self._extract_skills, analyzed),
+            ("entities", self._extract_entities, doc),
+            ("education", self._extract_education, analyzed),
+            ("experience_level", self._extract_experience_level, analyzed),
+            ("job_type", self._extract_job_type, analyzed),
+            ("industry", self._extract_industry, analyzed),
+            ("years_experience", self._extract_years_experience, analyzed),
+        )
+        for stage, extract, source in extractors:
+            with metrics.timer(metrics.TEXT_STAGE_SECONDS, stage=stage):
+                extract(source, categories)
 
         return dict(categories)
 
-    def extract_info(self, text: str, categories: Dict[str, Union[Set[str], int]]) -> Dict[str, Union[List[str], int]]:
+    def extract_info(self, text: Union[str, AnalyzedText], categories: Dict[str, Union[Set[str], int]]) -> Dict[str, Union[List[str], int]]:
         """
         Extract specific information based on predefined categories.
         
         Args:
-            text (str): Input text to process
+            text (Union[str, AnalyzedText]): Input text to process
             categories (Dict[str, Union[Set[str], int]]): Categories to extract
             
         Returns:
             Dict[str, Union[List[str], int]]: Extracted information
         """
-        logger.info("Extracting information from text")
+        logger.debug("Extracting information from text")
+        analyzed = self.analyze(text)
         info = {category: [] for category in categories}
         
-        keywords = self.keyword_extractor.extract_keywords(text)
-        extracted_keywords = set(keyword[0].lower() for keyword in keywords)
+        extracted_keywords = set(analyzed.keywords)
         
-        for category, items in categories.items():
-            if isinstance(items, set):
-                for item in items:
-                    if item in extracted_keywords or re.search(r'\b' + re.escape(item) + r'\b', text, re.IGNORECASE):
-                        info[category].append(item.lower())
-            elif category == "years_of_experience":
-                years_pattern = r'(\d+)\+?\s*(?:years?|yrs?)'
-                years_match = re.search(years_pattern, text, re.IGNORECASE)
-                info[category] = int(years_match.group(1)) if years_match else 0
+        with metrics.timer(metrics.TEXT_STAGE_SECONDS, stage="info"):
+            for category, items in categories.items():
+                if isinstance(items, set):
+                    found = find_whole_words(
+                        (item for item in items if item not in extracted_keywords), analyzed.lower
+                    )
+                    for item in items:
+                        if item in extracted_keywords or item in found:
+                            info[category].append(item.lower())
+                elif category == "years_of_experience":
+                    years_match = analyzed.search(YEARS_PATTERN)
+                    info[category] = int(years_match.group(1)) if years_match else 0
         
-        logger.info(f"Extracted information: {info}")
+        logger.debug("Extracted information: %s", info)
         return info
 
-    def _extract_job_title(self, text: str, categories: defaultdict, doc) -> None:
+    def _extract_job_title(self, analyzed: AnalyzedText, categories: defaultdict) -> None:
         """Extract job title from text using various patterns."""
-        job_title_patterns = [
-            r"(?i)(?:job title|position|role|title|position title|job role)s?:?\s*(.*?)(?:\n|$)",
-            r"(?i)(?:we are hiring|hiring for|looking for|seeking)\s*(?:a|an)?\s*(.*?)(?:\n|$)",
-            r"(?i)^(?:senior|junior|lead|principal|staff)?\s*([^.!?\n]+)(?:\n|$)"
-        ]
-        
-        for pattern in job_title_patterns:
-            job_title_match = re.search(pattern, text)
+        for pattern in JOB_TITLE_PATTERNS:
+            job_title_match = analyzed.search(pattern)
             if job_title_match:
                 categories["job_title"].add(job_title_match.group(1).strip().lower())
                 return
 
         # Fallback to first sentence if no matches found
-        if not categories["job_title"] and len(list(doc.sents)) > 0:
-            first_sentence = next(doc.sents).text
+        if not categories["job_title"] and len(list(analyzed.doc.sents)) > 0:
+            first_sentence = next(analyzed.doc.sents).text
             categories["job_title"].add(first_sentence.strip().lower())
 
-    def _extract_skills(self, text: str, categories: defaultdict) -> None:
+    def _extract_skills(self, analyzed: AnalyzedText, categories: defaultdict) -> None:
         """Extract skills using keyword extraction and pattern matching."""
         # Extract keywords using YAKE
-        keywords = self.keyword_extractor.extract_keywords(text)
-        categories["skills"].update(keyword[0].lower() for keyword in keywords)
+        categories["skills"].update(analyzed.keywords)
 
         # Additional skill patterns
-        skill_patterns = [
-            r'\b(?:proficient|experienced|skilled|expertise)\s+in\s+([\w\s,/+]+)',
-            r'\b(?:knowledge|understanding)\s+of\s+([\w\s,/+]+)',
-            r'(?:technologies|tools|frameworks|languages):\s*([\w\s,/+]+)',
-            r'\b(?:HTML5?|CSS3?|JavaScript|Python|Java|C\+\+|React|Angular|Vue|Node\.js|SQL|AWS|Azure|Git)\b'
-        ]
-        
-        for pattern in skill_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in SKILL_PATTERNS:
+            matches = analyzed.finditer(pattern)
             for match in matches:
                 if match.groups():
                     skills = match.group(1).split(',')
@@ -131,84 +210,35 @@ class TextProcessor:
             elif ent.label_ == "GPE":
                 categories["location"].add(ent.text.lower())
 
-    def _extract_education(self, text: str, categories: defaultdict) -> None:
+    def _extract_education(self, analyzed: AnalyzedText, categories: defaultdict) -> None:
         """Extract education requirements from text."""
-        education_patterns = [
-            r'\b(?:high school diploma|GED|secondary education)\b',
-            r'\b(?:associate\'?s?|AA|AS)\s*(?:degree)?\b',
-            r'\b(?:bachelor\'?s?|BA|BS|B\.A\.|B\.S\.)\s*(?:degree)?\b',
-            r'\b(?:master\'?s?|MA|MS|M\.A\.|M\.S\.|MBA|M\.B\.A\.)\s*(?:degree)?\b',
-            r'\b(?:phd|ph\.d\.|doctorate|doctoral)\s*(?:degree)?\b',
-            r'\b(?:post-graduate|postgraduate)\s*(?:degree|qualification)?\b'
-        ]
-        
-        for pattern in education_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in CATEGORY_PATTERNS["education"]:
+            matches = analyzed.findall(pattern)
             categories["education"].update(match.lower() for match in matches)
 
-    def _extract_experience_level(self, text: str, categories: defaultdict) -> None:
+    def _extract_experience_level(self, analyzed: AnalyzedText, categories: defaultdict) -> None:
         """Extract experience level requirements from text."""
-        experience_patterns = [
-            r'\b(?:entry[ -]level|junior|graduate|fresher)\b',
-            r'\b(?:mid[ -]level|intermediate|associate)\b',
-            r'\b(?:senior|experienced|advanced)\b',
-            r'\b(?:lead|principal|architect|manager)\b',
-            r'\b(?:director|head|chief|vp|vice president|executive)\b',
-            r'\b(?:c-level|cto|cio|ceo|cfo)\b'
-        ]
-        
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in CATEGORY_PATTERNS["experience"]:
+            matches = analyzed.findall(pattern)
             categories["experience"].update(match.lower() for match in matches)
 
-    def _extract_job_type(self, text: str, categories: defaultdict) -> None:
+    def _extract_job_type(self, analyzed: AnalyzedText, categories: defaultdict) -> None:
         """Extract job type information from text."""
-        job_type_patterns = [
-            r'\b(?:full[ -]time|permanent|regular)\b',
-            r'\b(?:part[ -]time|hourly)\b',
-            r'\b(?:contract|temporary|interim|temp)\b',
-            r'\b(?:freelance|independent|consultant)\b',
-            r'\b(?:internship|intern|trainee|co-op)\b',
-            r'\b(?:remote|work from home|wfh|hybrid|on-site|in-office)\b'
-        ]
-        
-        for pattern in job_type_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in CATEGORY_PATTERNS["job_type"]:
+            matches = analyzed.findall(pattern)
             categories["job_type"].update(match.lower() for match in matches)
 
-    def _extract_industry(self, text: str, categories: defaultdict) -> None:
+    def _extract_industry(self, analyzed: AnalyzedText, categories: defaultdict) -> None:
         """Extract industry information from text."""
-        industry_patterns = [
-            r'\b(?:technology|IT|software|tech)\b',
-            r'\b(?:finance|banking|fintech|insurance)\b',
-            r'\b(?:healthcare|medical|pharma|biotech)\b',
-            r'\b(?:education|academic|e-learning)\b',
-            r'\b(?:retail|e-commerce|consumer)\b',
-            r'\b(?:manufacturing|industrial|production)\b',
-            r'\b(?:media|entertainment|digital|creative)\b',
-            r'\b(?:government|public sector|defense)\b',
-            r'\b(?:consulting|professional services)\b',
-            r'\b(?:telecommunications|telecom)\b',
-            r'\b(?:automotive|transportation)\b',
-            r'\b(?:energy|utilities|oil|gas)\b'
-        ]
-        
-        for pattern in industry_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in CATEGORY_PATTERNS["industry"]:
+            matches = analyzed.findall(pattern)
             categories["industry"].update(match.lower() for match in matches)
 
-    def _extract_years_experience(self, text: str, categories: defaultdict) -> None:
+    def _extract_years_experience(self, analyzed: AnalyzedText, categories: defaultdict) -> None:
         """Extract years of experience requirements from text."""
-        years_patterns = [
-            r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of)?\s*(?:experience|exp)',
-            r'(?:minimum|min)\s*(?:of)?\s*(\d+)\s*(?:years?|yrs?)',
-            r'(?:at least|minimum)\s*(\d+)\s*(?:years?|yrs?)',
-            r'(\d+)(?:-\d+)?\s*(?:years?|yrs?)\s*(?:experience|exp)?'
-        ]
-        
         max_years = 0
-        for pattern in years_patterns:
-            years_match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in YEARS_EXPERIENCE_PATTERNS:
+            years_match = analyzed.search(pattern)
             if years_match:
                 years = int(years_match.group(1))
                 max_years = max(max_years, years)
@@ -1,26 +1,87 @@
 import cv2
 import numpy as np
 import face_recognition
-from fer import FER
-import speech_recognition as sr
 from textblob import TextBlob
-import moviepy.editor as mp
-import tempfile
-import os
 import nltk
-import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-nltk.download('punkt', quiet=True)
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from app import config
+from app.services.frame_analysis import FrameResult, analyze_frame, analyze_frames_batch
+from app.services.face_tracker import FaceTracker
+from app.services.frame_sampler import FrameSampler, VideoOpenError
+from app.services.frame_workers import FramePoolRestartingError, get_frame_analyzer
+from app.services.speech_backends import SpeechRecognitionError, get_speech_transcriber
+from app.services.video_models import get_video_models
+from app.utils import metrics
+from app.utils.ffmpeg import decode_audio
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+SPEECH_SAMPLE_RATE = 16000
+
+_nltk_ready = False
+_nltk_lock = threading.Lock()
+
+
+def ensure_nltk_data():
+    """
+    Make sure the NLTK tokenizer data TextBlob relies on is installed, once
+    per process. Only a missing copy is downloaded, so an offline host with
+    the data in place never touches the network; a failed download raises
+    LookupError.
+    """
+    global _nltk_ready
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            if not nltk.download('punkt', quiet=True):
+                raise LookupError("Could not download the NLTK 'punkt' tokenizer data")
+        _nltk_ready = True
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class VideoAnalyzer:
-    def __init__(self, known_face_image_path):
-        self.known_face_encoding = self.load_known_face(known_face_image_path)
-        self.emotion_detector = FER(mtcnn=True)
-        self.frame_skip = 20
+    def __init__(self, known_face_image_path=None,
+                 frame_skip=config.VIDEO_FRAME_SKIP,
+                 sampling_strategy=config.VIDEO_SAMPLING_STRATEGY,
+                 sample_fps=config.VIDEO_SAMPLE_FPS,
+                 workers=config.VIDEO_WORKERS,
+                 known_face_encoding=None,
+                 models=None,
+                 tracking=config.VIDEO_FACE_TRACKING,
+                 concurrent=config.VIDEO_CONCURRENT_BRANCHES,
+                 frames_timeout=config.VIDEO_FRAMES_TIMEOUT,
+                 speech_timeout=config.VIDEO_SPEECH_TIMEOUT,
+                 emotion_batch_size=config.VIDEO_EMOTION_BATCH_SIZE,
+                 detection_width=config.VIDEO_DETECTION_WIDTH):
+        if known_face_encoding is None and known_face_image_path is not None:
+            known_face_encoding = self.load_known_face(known_face_image_path)
+        self.known_face_encoding = known_face_encoding
+        self._models = models
+        self.frame_skip = frame_skip
+        self.sampling_strategy = sampling_strategy
+        self.sample_fps = sample_fps
+        self.workers = workers
+        self.tracking = tracking
+        self.concurrent = concurrent
+        self.frames_timeout = frames_timeout
+        self.speech_timeout = speech_timeout
+        self.emotion_batch_size = max(emotion_batch_size, 1)
+        self.detection_width = detection_width
+        self.detector_invocations = {}
+        self.frames_timed_out = False
+
+    @property
+    def models(self):
+        # Only needed when frames are analyzed in this process
+        if self._models is None:
+            self._models = get_video_models()
+        return self._models
 
     def load_known_face(self, image_path):
         try:
@@ -28,47 +89,130 @@ class VideoAnalyzer:
             known_encoding = face_recognition.face_encodings(known_image)[0]
             return known_encoding
         except Exception as e:
-            logging.error(f"Error loading known face: {e}")
+            logger.error("Error loading known face: %s", e)
             return None
 
-    def check_single_person(self, video_path):
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            logging.error("Error opening video file")
-            return False, "Error opening video file", 0
-
-        frame_count = 0
-        max_faces = 0
-        matched_frames = 0
-        total_frames = 0
-        total_frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-
-        while cap.isOpened() and frame_count < total_frame_count:
-            ret, frame = cap.read()
-            if not ret:
-                break
+    def _analyze_frames(self, video_path, deadline=None):
+        """
+        Decode the video once and analyze each sampled frame once.
+
+        Frames are pulled lazily from the sampler with a bounded number in
+        flight, so memory does not grow with video length. Past ``deadline``
+        (a ``time.monotonic()`` value) no new frames are read and the frames
+        analyzed so far are returned. Returns the per-frame results in frame
+        order, or None if the video could not be opened.
+        """
+        sampler = FrameSampler(self.sampling_strategy, self.frame_skip, self.sample_fps)
+        if self.detection_width:
+            # Faces are found on a small copy; everything else reads the full frame
+            frames = ((sampled.index, sampled.image) for sampled in sampler.frames(video_path))
+        else:
+            frames = (
+                (sampled.index, cv2.resize(sampled.image, (0, 0), fx=0.5, fy=0.5))
+                for sampled in sampler.frames(video_path)
+            )
+        self.frames_timed_out = False
+        if deadline is not None:
+            frames = self._until(frames, deadline)
+        try:
+            return self.analyze_frames(frames)
+        except VideoOpenError as e:
+            logger.error("%s", e)
+            return None
 
+    def analyze_frames(self, frames, on_result=None):
+        """
+        Analyze already decoded and downscaled ``(index, frame)`` pairs.
+
+        ``on_result`` is called with each FrameResult as soon as it is ready,
+        in completion order. Returns all results in frame order.
+        """
+        frames = ((index, frame, None) for index, frame in frames)
+        tracker = None
+        if self.tracking:
+            tracker = FaceTracker(config.VIDEO_TRACKING_MIN_CONFIDENCE, config.VIDEO_REDETECT_INTERVAL,
+                                  detection_width=self.detection_width)
+            frames = ((index, frame, tracker.update(frame)) for index, frame, _ in frames)
+
+        if self.workers > 0:
+            results = get_frame_analyzer(self.workers).analyze(
+                frames, self.known_face_encoding, on_result, self.emotion_batch_size, self.detection_width
+            )
+        else:
+            results = self._analyze_frames_threaded(frames, on_result)
+
+        self.detector_invocations = self._count_detector_invocations(results, tracker)
+        return results
+
+    def _until(self, frames, deadline):
+        for item in frames:
+            if time.monotonic() >= deadline:
+                self.frames_timed_out = True
+                return
+            yield item
+
+    def _count_detector_invocations(self, results, tracker):
+        counts = {
+            "face_detector": sum(result.face_detector_calls for result in results),
+            "mtcnn": sum(result.mtcnn_calls for result in results),
+            "tracker": 0,
+        }
+        if tracker is not None:
+            tracker_counts = tracker.counts()
+            counts["face_detector"] += tracker_counts["face_detector"]
+            counts["tracker"] = tracker_counts["tracker"]
+        return counts
+
+    def _analyze_frames_threaded(self, frames, on_result=None):
+        results = []
+        max_workers = 2
+        # Process frames in parallel
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            for batch in self._batches(frames):
+                pending[executor.submit(self.process_frames, batch)] = [index for index, _, _ in batch]
+                if len(pending) >= 2 * max_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    results.extend(self._collect(done, pending, on_result))
+            results.extend(self._collect(list(pending), pending, on_result))
+
+        results.sort(key=lambda result: result.index)
+        return results
+
+    def _batches(self, frames):
+        batch = []
+        for item in frames:
+            batch.append(item)
+            if len(batch) == self.emotion_batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _collect(self, futures, pending, on_result=None):
+        for future in futures:
+            indices = pending.pop(future)
             try:
-                face_locations = face_recognition.face_locations(frame)
-                face_encodings = face_recognition.face_encodings(frame, face_locations)
-
-                max_faces = max(max_faces, len(face_locations))
-
-                for face_encoding in face_encodings:
-                    match = face_recognition.compare_faces([self.known_face_encoding], face_encoding)[0]
-                    if match:
-                        matched_frames += 1
-                        break
-
-                total_frames += 1
-                logging.info(f'Frame {frame_count}: Detected {len(face_locations)} face(s), Match: {match}')
+                batch_results = future.result()
             except Exception as e:
-                logging.error(f"Error processing frame {frame_count}: {e}")
+                logger.error("Error processing frame: %s", e)
+                batch_results = [FrameResult(index) for index in indices]
+            for result in batch_results:
+                if on_result is not None:
+                    on_result(result)
+                yield result
 
-            frame_count += self.frame_skip
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_count)
+    def check_single_person(self, video_path):
+        results = self._analyze_frames(video_path)
+        if results is None:
+            return False, "Error opening video file", 0
+        return self._summarize_presence(results)
 
-        cap.release()
+    def _summarize_presence(self, results):
+        analyzed = [result for result in results if result.ok]
+        max_faces = max((result.face_count for result in analyzed), default=0)
+        matched_frames = sum(1 for result in analyzed if result.any_match)
+        total_frames = len(analyzed)
         match_percentage = (matched_frames / total_frames) * 100 if total_frames > 0 else 0
 
         if max_faces == 0:
@@ -78,82 +222,28 @@ class VideoAnalyzer:
         else:
             return True, "Single person detected in the video.", match_percentage
 
-    def process_frame(self, frame):
-        try:
-            face_locations = face_recognition.face_locations(frame)
-            face_encodings = face_recognition.face_encodings(frame, face_locations)
-            emotion = None
-            eye_contact = False
-            match = False
-
-            if face_locations:
-                match = face_recognition.compare_faces([self.known_face_encoding], face_encodings[0])[0]
-
-                # Facial expression analysis
-                emotions = self.emotion_detector.detect_emotions(frame)
-                if emotions:
-                    dominant_emotion = max(emotions[0]['emotions'].items(), key=lambda x: x[1])[0]
-                    emotion = dominant_emotion
-                    logging.info(f'Detected emotion: {dominant_emotion}')
-
-                # Eye contact detection
-                top, right, bottom, left = face_locations[0]
-                face_image = frame[top:bottom, left:right]
-                gray_face = cv2.cvtColor(face_image, cv2.COLOR_BGR2GRAY)
-
-                eyes = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml').detectMultiScale(gray_face)
-                if len(eyes) >= 2:
-                    eye_contact = True
-                    logging.info('Eye contact detected')
-
-            return face_locations, emotion, eye_contact, match
-        except Exception as e:
-            logging.error(f"Error processing frame: {e}")
-            return None, None, False, False
+    def process_frame(self, frame, index=0, face_locations=None):
+        return analyze_frame(frame, index, self.known_face_encoding, self.models, face_locations, self.detection_width)
+
+    def process_frames(self, batch):
+        """Analyze ``(index, frame, face_locations)`` items, batched when ``emotion_batch_size`` > 1."""
+        if self.emotion_batch_size > 1:
+            items = [(frame, index, face_locations) for index, frame, face_locations in batch]
+            return analyze_frames_batch(items, self.known_face_encoding, self.models, self.detection_width)
+        return [self.process_frame(frame, index, face_locations) for index, frame, face_locations in batch]
 
     def analyze_video(self, video_path):
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            logging.error("Error opening video file")
+        results = self._analyze_frames(video_path)
+        if results is None:
             return {}, 0, 0
+        return self._summarize_frames(results)
 
-        facial_expressions = []
-        eye_contact_frames = 0
-        matched_frames = 0
-        total_frames = 0
-        frames_to_process = []
-        total_frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-
-        while cap.isOpened() and total_frames < total_frame_count:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            resized_frame = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
-            frames_to_process.append(resized_frame)
-            total_frames += 1
-            cap.set(cv2.CAP_PROP_POS_FRAMES, total_frames * self.frame_skip)
+    def _summarize_frames(self, results):
+        facial_expressions = [result.emotion for result in results if result.ok and result.emotion]
+        eye_contact_frames = sum(1 for result in results if result.ok and result.eye_contact)
+        matched_frames = sum(1 for result in results if result.ok and result.match)
 
-        cap.release()
-
-        # Process frames in parallel
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            future_to_frame = {executor.submit(self.process_frame, frame): frame for frame in frames_to_process}
-            for future in as_completed(future_to_frame):
-                try:
-                    result = future.result()
-                    if result[0] is not None:
-                        _, emotion, eye_contact, match = result
-                        if emotion:
-                            facial_expressions.append(emotion)
-                        if eye_contact:
-                            eye_contact_frames += 1
-                        if match:
-                            matched_frames += 1
-                except Exception as e:
-                    logging.error(f"Error processing frame: {e}")
-
-        total_processed = len(frames_to_process)
+        total_processed = len(results)
         expression_counts = {emotion: facial_expressions.count(emotion) for emotion in set(facial_expressions)}
         total_expressions = len(facial_expressions)
         expression_percentages = {k: (v / total_expressions) * 100 for k, v in expression_counts.items()} if total_expressions > 0 else {}
@@ -162,59 +252,126 @@ class VideoAnalyzer:
 
         return expression_percentages, eye_contact_percentage, match_percentage
 
-    def extract_audio(self, video_path):
-        video = mp.VideoFileClip(video_path)
-
-        temp_audio = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        temp_audio_path = temp_audio.name
-        temp_audio.close()
+    def analyze_speech(self, media_path):
+        with metrics.timer(metrics.VIDEO_PHASE_SECONDS, phase="audio_decode"):
+            samples = decode_audio(media_path, SPEECH_SAMPLE_RATE)
+        logger.info("Decoded %.1fs of audio", len(samples) / SPEECH_SAMPLE_RATE)
+        return self.analyze_speech_samples(samples, SPEECH_SAMPLE_RATE)
 
-        video.audio.write_audiofile(temp_audio_path, codec='pcm_s16le')
-        return temp_audio_path
+    def analyze_speech_samples(self, samples, sample_rate):
+        """Transcribe mono int16 samples and score their sentiment and pace."""
+        try:
+            with metrics.timer(metrics.VIDEO_PHASE_SECONDS, phase="transcription"):
+                transcript = get_speech_transcriber().transcribe(samples, sample_rate)
+        except SpeechRecognitionError as e:
+            logger.error("Could not request results from speech recognition service; %s", e)
+            return None, None, None
 
-    def analyze_speech(self, audio_path, audio_length):
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(audio_path) as source:
-            audio = recognizer.record(source)
+        if not transcript.words:
+            logger.error("Speech recognition could not understand the audio")
+            return None, None, None
 
         try:
-            text = recognizer.recognize_google(audio)
-            blob = TextBlob(text)
-
-            sentiment = blob.sentiment.polarity
-            word_count = len(blob.words)
-            speaking_rate = word_count / (audio_length / 60)
+            ensure_nltk_data()
+        except Exception as e:
+            # Polarity scoring does not tokenize, so carry on without the data
+            logger.warning("NLTK data unavailable: %s", e)
+        with metrics.timer(metrics.VIDEO_PHASE_SECONDS, phase="sentiment"):
+            sentiment = TextBlob(transcript.text).sentiment.polarity
+        word_count = transcript.word_count
+        speaking_rate = transcript.speaking_rate
 
-            logging.info(f'Speech sentiment: {sentiment}, speaking rate: {speaking_rate} wpm, word count: {word_count}')
+        logger.info('Speech sentiment: %s, speaking rate: %s wpm, word count: %s', sentiment, speaking_rate, word_count)
 
-            return sentiment, speaking_rate, word_count
-        except sr.UnknownValueError:
-            logging.error("Speech recognition could not understand the audio")
-            return None, None, None
-        except sr.RequestError as e:
-            logging.error(f"Could not request results from speech recognition service; {e}")
-            return None, None, None
+        return sentiment, speaking_rate, word_count
 
     def analyze(self, video_path):
         if self.known_face_encoding is None:
             return {"error": "Failed to load known face image"}
 
-        # Check if the video contains a single person and if it matches the known face
-        is_single_person, message, initial_match_percentage = self.check_single_person(video_path)
-        logging.info(message)
-        logging.info(f"Initial match percentage: {initial_match_percentage:.2f}%")
+        with metrics.timer(metrics.VIDEO_PHASE_SECONDS, phase="total"):
+            return self._analyze(video_path)
+
+    def _analyze(self, video_path):
+        # The branches share nothing until the report, so by default speech
+        # runs on its own thread while this one drives the frame analysis
+        degraded = {}
+        speech = self._start_speech(video_path) if self.concurrent else None
+        frame_results = self._frame_branch(video_path, degraded)
+        if speech is None:
+            speech = self._start_speech(video_path)
+        sentiment, speaking_rate, word_count = self._finish_speech(speech, degraded)
+
+        report = self.build_report(frame_results, sentiment, speaking_rate, word_count)
+        if degraded:
+            report["degraded"] = degraded
+        return report
+
+    def _frame_branch(self, video_path, degraded):
+        deadline = time.monotonic() + self.frames_timeout if self.frames_timeout else None
+        try:
+            # One decode pass feeds both the single-person check and the frame statistics
+            with metrics.timer(metrics.VIDEO_PHASE_SECONDS, phase="frames"):
+                frame_results = self._analyze_frames(video_path, deadline)
+        except FramePoolRestartingError:
+            # Not worth a report without frames; the caller can retry shortly
+            raise
+        except Exception as e:
+            logger.error("Frame analysis failed: %s", e)
+            degraded["frames"] = str(e)
+            return []
+
+        if frame_results is None:
+            degraded["frames"] = "Error opening video file"
+            return []
+        if self.frames_timed_out:
+            logger.warning("Frame analysis stopped after %ss", self.frames_timeout)
+            degraded["frames"] = f"Timed out after {self.frames_timeout}s; {len(frame_results)} frames analyzed"
+        return frame_results
+
+    def _start_speech(self, video_path):
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speech")
+        future = executor.submit(self.analyze_speech, video_path)
+        # Do not wait for a timed-out transcription; its thread finishes on its own
+        executor.shutdown(wait=False)
+        return future, time.monotonic()
+
+    def _finish_speech(self, speech, degraded):
+        future, started = speech
+        timeout = max(started + self.speech_timeout - time.monotonic(), 0) if self.speech_timeout else None
+        try:
+            sentiment, speaking_rate, word_count = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            logger.error("Speech analysis timed out after %ss", self.speech_timeout)
+            degraded["speech"] = f"Timed out after {self.speech_timeout}s"
+            return None, None, None
+        except Exception as e:
+            logger.error("Speech analysis failed: %s", e)
+            degraded["speech"] = str(e)
+            return None, None, None
 
-        # Video analysis
-        expression_percentages, eye_contact_percentage, match_percentage = self.analyze_video(video_path)
+        if sentiment is None:
+            degraded["speech"] = "No speech could be transcribed"
+        return sentiment, speaking_rate, word_count
 
-        video = mp.VideoFileClip(video_path)
-        audio_length = video.audio.duration
+    def summarize_progress(self, frame_results):
+        """Running frame statistics for partial results; order does not matter."""
+        expression_percentages, eye_contact_percentage, match_percentage = self._summarize_frames(frame_results)
+        return {
+            "frames_analyzed": len(frame_results),
+            "facial_expressions": expression_percentages,
+            "eye_contact": eye_contact_percentage,
+            "face_match_percentage": match_percentage,
+        }
 
-        # Extract audio and analyze speech
-        temp_audio_path = self.extract_audio(video_path)
-        sentiment, speaking_rate, word_count = self.analyze_speech(temp_audio_path, audio_length)
+    def build_report(self, frame_results, sentiment, speaking_rate, word_count):
+        # Check if the video contains a single person and if it matches the known face
+        is_single_person, message, initial_match_percentage = self._summarize_presence(frame_results)
+        logger.info(message)
+        logger.info("Initial match percentage: %.2f%%", initial_match_percentage)
 
-        os.unlink(temp_audio_path)
+        # Video analysis
+        expression_percentages, eye_contact_percentage, match_percentage = self._summarize_frames(frame_results)
 
         if sentiment is not None and speaking_rate is not None:
             confidence_score = (
@@ -235,7 +392,8 @@ class VideoAnalyzer:
             "speaking_rate": speaking_rate,
             "word_count": word_count,
             "confidence_score": confidence_score,
-            "face_match_percentage": match_percentage
+            "face_match_percentage": match_percentage,
+            "detector_invocations": self.detector_invocations
         }
 
 # # Usage
@@ -247,10 +405,10 @@ class VideoAnalyzer:
 #     analyzer = VideoAnalyzer(known_face_image_path)
 #     analysis_results = analyzer.analyze(video_path)
 
-#     logging.info("Analysis Results:")
-#     logging.info(analysis_results)
+#     logger.info("Analysis Results:")
+#     logger.info(analysis_results)
 # except Exception as e:
-#     logging.error(f"An error occurred during analysis: {e}")
+#     logger.error(f"An error occurred during analysis: {e}")
 
 
 
@@ -0,0 +1,148 @@
+# app/services/video_models.py
+"""
+Process-wide holders for the heavy video analysis models.
+
+FER (MTCNN plus the emotion network) and the eye cascade are loaded once per
+process instead of once per request or per frame, and reference face
+encodings are cached per candidate so repeat interviews skip dlib.
+"""
+
+import hashlib
+import io
+import threading
+
+import cv2
+import face_recognition
+import numpy as np
+from app import config
+from app.utils.cache import LRUCache
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Output order of FER's emotion network
+EMOTION_LABELS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
+
+# Private FER attributes the batched emotion path reads (name-mangled)
+_FER_INTERNALS = ("_FER__emotion_classifier", "_FER__emotion_target_size", "_FER__offsets")
+
+
+class VideoModels:
+    """Models shared by every analysis in this process."""
+
+    def __init__(self):
+        from fer import FER
+        self.emotion_detector = FER(mtcnn=True)
+        self._local = threading.local()
+        # Load once up front so a bad OpenCV install fails at startup
+        self.eye_cascade
+
+    @property
+    def eye_cascade(self):
+        # CascadeClassifier is not safe to share between threads, so each
+        # analysis thread gets its own instance
+        cascade = getattr(self._local, "eye_cascade", None)
+        if cascade is None:
+            cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
+            self._local.eye_cascade = cascade
+        return cascade
+
+    def classify_emotions(self, faces):
+        """
+        Dominant emotion for each ``(frame, (top, right, bottom, left))`` face,
+        with one pass of the emotion network over all of them.
+
+        Crops are prepared the way FER.detect_emotions prepares them (squared
+        box grown by FER's offsets on the zero-padded gray frame, resized and
+        scaled to [-1, 1]). FER keeps its network, input size and offsets
+        private; builds lacking any of them fall back to one detect_emotions
+        call per face.
+        """
+        if not faces:
+            return []
+        detector = self.emotion_detector
+        internals = [getattr(detector, name, None) for name in _FER_INTERNALS]
+        if any(value is None for value in internals):
+            return [self._detect_dominant_emotion(frame, face) for frame, face in faces]
+
+        classifier, target_size, (x_offset, y_offset) = internals
+        crops = []
+        cropped = []
+        for position, (frame, (top, right, bottom, left)) in enumerate(faces):
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            padded = detector.pad(gray)
+            padding = (padded.shape[0] - gray.shape[0]) // 2
+            x, y, w, h = detector.tosquare((left, top, right - left, bottom - top))
+            x1, y1 = max(x - x_offset + padding, 0), max(y - y_offset + padding, 0)
+            x2, y2 = x + w + x_offset + padding, y + h + y_offset + padding
+            face = padded[y1:y2, x1:x2]
+            if face.size == 0:
+                continue
+            crops.append(cv2.resize(face, target_size).astype(np.float32) / 255.0 * 2.0 - 1.0)
+            cropped.append(position)
+
+        emotions = [None] * len(faces)
+        if crops:
+            scores = np.asarray(classifier(np.stack(crops)[..., np.newaxis], training=False))
+            for position, best in zip(cropped, scores.argmax(axis=1)):
+                emotions[position] = EMOTION_LABELS[best]
+        return emotions
+
+    def _detect_dominant_emotion(self, frame, face):
+        top, right, bottom, left = face
+        emotions = self.emotion_detector.detect_emotions(
+            frame, face_rectangles=[(left, top, right - left, bottom - top)]
+        )
+        if not emotions:
+            return None
+        return max(emotions[0]['emotions'].items(), key=lambda x: x[1])[0]
+
+
+_models = None
+_models_lock = threading.Lock()
+
+
+def models_loaded() -> bool:
+    return _models is not None
+
+
+def get_video_models() -> VideoModels:
+    """Return the process-wide VideoModels, loading them on first use."""
+    global _models
+    with _models_lock:
+        if _models is None:
+            _models = VideoModels()
+            logger.info("Loaded video analysis models")
+        return _models
+
+
+class ReferenceEncodingCache:
+    """LRU cache of reference face encodings keyed by candidate id and image hash."""
+
+    def __init__(self, max_bytes: int = config.REFERENCE_CACHE_MAX_BYTES):
+        self._cache = LRUCache(max_bytes)
+
+    def get_encoding(self, candidate_id: str, image_bytes: bytes):
+        """Return the face encoding of the reference photo, or None if no face is found."""
+        key = (candidate_id, hashlib.sha256(image_bytes).hexdigest())
+        encoding = self._cache.get(key)
+        if encoding is None:
+            encoding = encode_reference_face(image_bytes)
+            if encoding is not None:
+                self._cache.put(key, encoding)
+        return encoding
+
+    def stats(self):
+        return self._cache.stats()
+
+
+def encode_reference_face(image_bytes: bytes):
+    try:
+        known_image = face_recognition.load_image_file(io.BytesIO(image_bytes))
+        return face_recognition.face_encodings(known_image)[0]
+    except Exception as e:
+        logger.error("Error loading known face: %s", e)
+        return None
+
+
+reference_encodings = ReferenceEncodingCache()
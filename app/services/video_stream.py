@@ -0,0 +1,182 @@
+# app/services/video_stream.py
+"""
+Analysis of a video while it is still being uploaded.
+
+The upload is piped into ffmpeg as it arrives. ffmpeg keeps every
+``frame_skip``-th frame, at half resolution unless the analyzer detects faces
+on its own downscaled copy, and writes it to stdout as Y4M, which an analysis
+thread decodes and hands to the VideoAnalyzer frame by frame; the audio track
+is resampled to 16 kHz mono PCM in a small temp file for speech analysis once
+the upload ends. Nothing but that audio touches the disk.
+
+The container has to be readable front to back: WebM, Matroska, MPEG-TS, or
+MP4 written with the index first (``-movflags +faststart``) or fragmented.
+Like ``/analyze/``, the video needs an audio track.
+"""
+
+import os
+import subprocess
+import tempfile
+import threading
+
+import cv2
+import numpy as np
+from app import config
+from app.services.frame_sampler import VideoOpenError
+from app.utils.ffmpeg import ffmpeg_executable
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+AUDIO_SAMPLE_RATE = 16000
+
+
+class Y4MReader:
+    """Reads 4:2:0 frames from a YUV4MPEG2 stream as BGR images."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.width = None
+        self.height = None
+        self.fps = None
+
+    def frames(self):
+        header = self.stream.readline()
+        if not header:
+            return
+        if not header.startswith(b"YUV4MPEG2"):
+            raise VideoOpenError("Decoder output is not a Y4M stream")
+
+        params = {token[:1]: token[1:] for token in header.split()[1:]}
+        if not params.get(b"C", b"420").startswith(b"420"):
+            raise VideoOpenError(f"Unsupported Y4M colorspace {params[b'C'].decode()}")
+        self.width, self.height = int(params[b"W"]), int(params[b"H"])
+        if b"F" in params:
+            numerator, denominator = params[b"F"].split(b":")
+            self.fps = int(numerator) / int(denominator)
+
+        frame_size = self.width * self.height * 3 // 2
+        while self.stream.readline():
+            data = self.stream.read(frame_size)
+            if len(data) < frame_size:
+                return
+            yuv = np.frombuffer(data, dtype=np.uint8).reshape(self.height * 3 // 2, self.width)
+            yield cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_I420)
+
+
+class StreamingVideoAnalysis:
+    """
+    Incremental analysis of one uploaded video.
+
+    Call ``start``, ``feed`` the upload's bytes as they arrive, then ``finish``
+    for the same report ``VideoAnalyzer.analyze`` returns. ``on_progress``
+    receives running frame statistics every ``progress_every`` analyzed
+    frames, from the analysis thread.
+    """
+
+    def __init__(self, analyzer, on_progress=None,
+                 progress_every: int = config.VIDEO_STREAM_PROGRESS_EVERY):
+        self.analyzer = analyzer
+        self.on_progress = on_progress
+        self.progress_every = max(progress_every, 1)
+        self._process = None
+        self._thread = None
+        self._stderr = None
+        self._audio_path = None
+        self._partial = []
+        self._results = []
+        self._error = None
+        self._cleanup_lock = threading.Lock()
+
+    def start(self) -> None:
+        fd, self._audio_path = tempfile.mkstemp(suffix=".pcm")
+        os.close(fd)
+        self._stderr = tempfile.TemporaryFile()
+        skip = max(self.analyzer.frame_skip, 1)
+        video_filter = f"select=not(mod(n\\,{skip}))"
+        if not self.analyzer.detection_width:
+            video_filter += ",scale=trunc(iw/4)*2:trunc(ih/4)*2"
+        command = [
+            ffmpeg_executable(), "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+            "-map", "0:v:0",
+            "-vf", video_filter,
+            "-fps_mode", "passthrough", "-pix_fmt", "yuv420p", "-f", "yuv4mpegpipe", "pipe:1",
+            "-map", "0:a:0?", "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE), "-f", "s16le", "-y", self._audio_path,
+        ]
+        self._process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=self._stderr
+        )
+        self._thread = threading.Thread(target=self._run, name="video-stream-analysis", daemon=True)
+        self._thread.start()
+
+    def feed(self, data: bytes) -> None:
+        """Pass the next bytes of the upload to the decoder; blocks while it is behind."""
+        try:
+            self._process.stdin.write(data)
+        except (BrokenPipeError, ValueError):
+            raise VideoOpenError(f"Decoder stopped reading the upload: {self._decoder_errors()}")
+
+    def finish(self) -> dict:
+        """Close the upload, wait for the remaining frames and analyze the audio."""
+        try:
+            try:
+                self._process.stdin.close()
+            except BrokenPipeError:
+                pass
+            self._thread.join()
+            returncode = self._process.wait()
+            if self._error is not None:
+                raise self._error
+            if returncode != 0:
+                raise VideoOpenError(f"Could not decode the uploaded video: {self._decoder_errors()}")
+
+            samples = np.fromfile(self._audio_path, dtype=np.int16)
+            sentiment, speaking_rate, word_count = self.analyzer.analyze_speech_samples(samples, AUDIO_SAMPLE_RATE)
+            return self.analyzer.build_report(self._results, sentiment, speaking_rate, word_count)
+        finally:
+            self._cleanup()
+
+    def abort(self) -> None:
+        """
+        Stop decoding and analysis, e.g. when the client goes away. Blocks until
+        the analysis thread has finished its current frames; may run while
+        ``finish`` is still waiting on another thread.
+        """
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+        if self._thread is not None:
+            self._thread.join()
+        self._cleanup()
+
+    def _run(self):
+        reader = Y4MReader(self._process.stdout)
+        skip = max(self.analyzer.frame_skip, 1)
+        frames = ((number * skip, image) for number, image in enumerate(reader.frames()))
+        try:
+            self._results = self.analyzer.analyze_frames(frames, on_result=self._on_result)
+        except Exception as e:
+            logger.error("Error analyzing streamed video: %s", e)
+            self._error = e
+            # Unblock the uploader; ffmpeg would otherwise stall on a full stdout pipe
+            self._process.kill()
+
+    def _on_result(self, result):
+        self._partial.append(result)
+        if self.on_progress is not None and len(self._partial) % self.progress_every == 0:
+            self.on_progress(self.analyzer.summarize_progress(self._partial))
+
+    def _decoder_errors(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode(errors="replace").strip()
+
+    def _cleanup(self):
+        # finish and abort can both get here when a client leaves during finish
+        with self._cleanup_lock:
+            if self._process is not None:
+                self._process.stdout.close()
+            if self._stderr is not None:
+                self._stderr.close()
+                self._stderr = None
+            if self._audio_path is not None and os.path.exists(self._audio_path):
+                os.unlink(self._audio_path)
+                self._audio_path = None
@@ -0,0 +1,130 @@
+import string
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import text
+from app.services import ats_calculator, score_calculator, scoring_pool
+from app.services.ats_calculator import ATSCalculator
+from app.services.scoring_pool import ScoringPool
+
+JOB = "Senior data engineer. Python and SQL required, Spark a plus. 5 years of experience."
+RESUMES = [
+    "Data engineer with 6 years of experience in Python, SQL and Spark.",
+    "Marketing coordinator, 2 years of experience with social media.",
+    "Backend developer using Python and Go for 3 years.",
+]
+SKILLS = ("python", "sql", "spark", "go", "social media")
+
+
+class FakeTextProcessor:
+    def __init__(self):
+        self.analyzed = []
+        self.categorized = []
+
+    def analyze(self, text):
+        self.analyzed.append(text)
+        return text
+
+    def extract_categories(self, text):
+        self.categorized.append(text)
+        return {"skills": {skill for skill in SKILLS if skill in text.lower()}}
+
+    def extract_info(self, text, categories):
+        words = text.lower().replace(",", " ").split()
+        return {
+            "job_title": words[:2],
+            "skills": [skill for skill in SKILLS if skill in text.lower()],
+            "years_of_experience": next((int(word) for word in words if word.isdigit()), 0),
+        }
+
+
+class FakeModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        self.encoded.extend(texts)
+        # Letter counts: deterministic, and similar texts get similar vectors
+        vectors = np.array(
+            [[text.lower().count(letter) + 1 for letter in string.ascii_lowercase] for text in texts],
+            dtype=np.float32,
+        )
+        return vectors[0] if single else vectors
+
+
+@pytest.fixture
+def make_calculator(monkeypatch):
+    monkeypatch.setattr(ats_calculator, "TextProcessor", FakeTextProcessor)
+
+    def make():
+        model = FakeModel()
+        monkeypatch.setattr(score_calculator, "load_embedding_backend", lambda name: model)
+        calculator = ATSCalculator()
+        return calculator, model
+
+    return make
+
+
+def test_batch_matches_single_scores_in_input_order(make_calculator):
+    single, _ = make_calculator()
+    expected = [single.calculate_ats_score(resume, JOB)[:2] for resume in RESUMES]
+
+    batch, _ = make_calculator()
+    results = batch.calculate_ats_scores_batch(JOB, RESUMES)
+
+    assert len(results) == len(RESUMES)
+    for (score, scores, _, _), (expected_score, expected_scores) in zip(results, expected):
+        assert score == pytest.approx(expected_score)
+        assert scores == pytest.approx(expected_scores)
+    assert len({round(score, 6) for score, _, _, _ in results}) == len(RESUMES)
+
+
+def test_batch_analyzes_and_encodes_the_job_description_once(make_calculator):
+    calculator, model = make_calculator()
+
+    calculator.calculate_ats_scores_batch(JOB, RESUMES)
+
+    assert calculator.text_processor.analyzed == [JOB]
+    assert model.encoded.count(JOB) == 1
+
+
+def test_repeated_job_description_is_analyzed_once(make_calculator):
+    calculator, model = make_calculator()
+    posting = "Senior data engineer.\nPython and SQL required.\n5 years of experience."
+    changed_posting = posting.replace("5 years", "7 years")
+
+    first = calculator.analyze_job_description(posting)
+    # Equal after normalization: other line endings and surrounding whitespace
+    repeated = calculator.analyze_job_description("  " + posting.replace("\n", "\r\n") + "\r\n")
+    changed = calculator.analyze_job_description(changed_posting)
+
+    assert repeated is first
+    assert changed is not first
+    assert changed.job_info["years_of_experience"] == 7
+    processor = calculator.text_processor
+    assert processor.analyzed == [posting, changed_posting]
+    assert processor.categorized == [posting, changed_posting]
+    assert model.encoded == [posting, changed_posting]
+
+
+def test_batch_endpoint_returns_results_in_input_order(make_calculator, monkeypatch):
+    single, _ = make_calculator()
+    expected = [single.calculate_ats_score(resume, JOB)[0] for resume in RESUMES]
+    calculator, _ = make_calculator()
+    monkeypatch.setattr(scoring_pool, "_calculator", calculator)
+    monkeypatch.setattr(text, "scoring_pool", ScoringPool(workers=0, queue_size=1, timeout=5))
+    app = FastAPI()
+    app.include_router(text.router)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/calculate-ats-scores-batch", json={"id": "1", "job_description": JOB, "resumes": RESUMES}
+        )
+
+    assert response.status_code == 200
+    assert [result["score"] for result in response.json()["results"]] == pytest.approx(expected)
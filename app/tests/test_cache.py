@@ -0,0 +1,43 @@
+import numpy as np
+
+from app.services.job_cache import JobAnalysis, JobDescriptionCache, normalize_job_description
+from app.utils.cache import LRUCache
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache(max_bytes=1024, sizeof=lambda value: 1)
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_cache_evicts_least_recently_used_within_budget():
+    cache = LRUCache(max_bytes=3, sizeof=lambda value: 1)
+    for key in "abc":
+        cache.put(key, key)
+    cache.get("a")
+    cache.put("d", "d")
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache and "d" in cache
+    assert cache.stats()["evictions"] == 1
+    assert cache.current_bytes == 3
+
+
+def test_lru_cache_skips_values_larger_than_budget():
+    cache = LRUCache(max_bytes=10, sizeof=len)
+    cache.put("big", "x" * 11)
+
+    assert len(cache) == 0
+
+
+def test_job_cache_shares_entries_for_equivalent_postings():
+    cache = JobDescriptionCache(max_bytes=1024 * 1024)
+    analysis = JobAnalysis({"skills": {"python"}}, {"skills": ["python"]}, np.zeros(384, dtype=np.float32))
+    cache.store(normalize_job_description("Python developer\r\n"), analysis)
+
+    assert cache.lookup(normalize_job_description("  Python developer\n")) is analysis
+    assert cache.current_bytes >= analysis.embedding.nbytes
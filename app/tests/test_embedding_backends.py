@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from app.services.embedding_backends import load_embedding_backend
+
+PHRASES = [
+    "python", "sql", "machine learning", "marketing coordinator", "social media management",
+    "project management", "data analysis", "google analytics", "senior software engineer",
+    "Bachelor's degree in Marketing with two years of campaign experience.",
+]
+
+# Maximum allowed change in any pairwise cosine similarity, per backend
+TOLERANCES = {"quantized": 0.05, "onnx": 1e-4}
+
+
+def _normalize(vectors):
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return _normalize(load_embedding_backend("torch").encode(PHRASES))
+
+
+@pytest.mark.parametrize("backend", sorted(TOLERANCES))
+def test_cosine_similarity_drift_within_tolerance(backend, reference):
+    if backend == "onnx":
+        pytest.importorskip("onnxruntime")
+    candidate = _normalize(load_embedding_backend(backend).encode(PHRASES))
+
+    drift = np.abs(candidate @ candidate.T - reference @ reference.T).max()
+    self_similarity = np.sum(candidate * reference, axis=1)
+
+    assert drift <= TOLERANCES[backend]
+    assert self_similarity.min() >= 1 - TOLERANCES[backend] * 2
+
+
+@pytest.mark.parametrize("backend", sorted(TOLERANCES))
+def test_encode_matches_sentence_transformer_shapes(backend):
+    if backend == "onnx":
+        pytest.importorskip("onnxruntime")
+    model = load_embedding_backend(backend)
+
+    assert model.encode("python").shape == (384,)
+    assert model.encode(["python", "sql"]).shape == (2, 384)
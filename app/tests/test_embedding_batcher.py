@@ -0,0 +1,63 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.services.embedding_batcher import MicroBatchEncoder
+from app.utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    return registry
+
+
+class RecordingModel:
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[len(t), i] for i, t in enumerate(texts)], dtype=np.float32)
+
+
+def test_concurrent_calls_share_one_batch_and_get_their_own_rows():
+    model = RecordingModel()
+    encoder = MicroBatchEncoder(model.encode, max_batch_size=64, max_wait_ms=200)
+    results = {}
+
+    def call(name, texts):
+        results[name] = encoder.encode(texts)
+
+    threads = [
+        threading.Thread(target=call, args=("a", ["python", "sql"])),
+        threading.Thread(target=call, args=("b", "marketing coordinator")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(model.batches) == 1
+    assert results["a"].shape == (2, 2)
+    assert results["a"][:, 0].tolist() == [6, 3]
+    assert results["b"].shape == (2,)
+    assert results["b"][0] == len("marketing coordinator")
+    text = metrics.render()
+    assert "ats_embedding_batch_size_count 1" in text
+    assert "ats_embedding_batch_size_sum 3" in text
+    assert "ats_embedding_queue_seconds_count 2" in text
+
+
+def test_full_batch_is_flushed_without_waiting():
+    model = RecordingModel()
+    encoder = MicroBatchEncoder(model.encode, max_batch_size=2, max_wait_ms=10_000)
+
+    vectors = encoder.encode(["a", "b", "c"])
+
+    assert vectors.shape == (3, 2)
+    assert 'ats_embedding_batch_size_bucket{le="2"} 0' in metrics.render()
+    assert 'ats_embedding_batch_size_bucket{le="4"} 1' in metrics.render()
@@ -0,0 +1,58 @@
+import numpy as np
+
+from app.services.embedding_store import PhraseEmbeddingStore
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, phrases):
+        self.calls.append(list(phrases))
+        return np.array([[len(p), ord(p[0]), 1.0] for p in phrases], dtype=np.float32)
+
+
+def test_only_unseen_phrases_are_encoded_in_one_batch():
+    encoder = CountingEncoder()
+    store = PhraseEmbeddingStore(encoder, initial_capacity=1)
+
+    first = store.encode(["python", "sql", "python"])
+    second = store.encode(["sql", "java", "excel"])
+
+    assert encoder.calls == [["python", "sql"], ["java", "excel"]]
+    assert first.dtype == np.float32
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(first[1], second[0])
+    assert len(store) == 4
+
+
+def test_save_and_load_memory_maps_existing_rows(tmp_path):
+    path = str(tmp_path / "phrases.npy")
+    store = PhraseEmbeddingStore(CountingEncoder())
+    expected = store.encode(["python", "sql"])
+    store.save(path)
+
+    encoder = CountingEncoder()
+    loaded = PhraseEmbeddingStore(encoder)
+    loaded.load(path)
+    mixed = loaded.encode(["sql", "java", "python"])
+
+    assert encoder.calls == [["java"]]
+    assert isinstance(loaded._base, np.memmap)
+    np.testing.assert_array_equal(mixed[0], expected[1])
+    np.testing.assert_array_equal(mixed[2], expected[0])
+
+
+def test_saves_to_one_path_keep_each_others_phrases(tmp_path):
+    path = str(tmp_path / "phrases.npy")
+    first = PhraseEmbeddingStore(CountingEncoder())
+    second = PhraseEmbeddingStore(CountingEncoder())
+    first.encode(["python", "sql"])
+    second.encode(["sql", "java"])
+    first.save(path)
+    second.save(path)
+
+    loaded = PhraseEmbeddingStore(CountingEncoder())
+    loaded.load(path)
+
+    assert loaded._phrases == ["python", "sql", "java"]
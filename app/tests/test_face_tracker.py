@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("face_recognition")
+
+from app.services import frame_analysis
+from app.services.face_tracker import FaceTracker
+
+
+def _frame(top, left, size=40, shape=(240, 320)):
+    rng = np.random.default_rng(0)
+    frame = np.zeros(shape + (3,), dtype=np.uint8)
+    frame[top:top + size, left:left + size] = rng.integers(0, 255, (size, size, 3), dtype=np.uint8)
+    return frame
+
+
+@pytest.fixture
+def detector_calls(monkeypatch):
+    calls = []
+
+    def face_locations(frame):
+        calls.append(frame)
+        ys, xs = np.nonzero(frame.any(axis=2))
+        if len(ys) == 0:
+            return []
+        return [(int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1, int(xs.min()))]
+
+    monkeypatch.setattr(frame_analysis.face_recognition, "face_locations", face_locations)
+    return calls
+
+
+def test_follows_a_moving_face_without_redetecting(detector_calls):
+    tracker = FaceTracker(redetect_interval=100)
+
+    boxes = [tracker.update(_frame(50 + 3 * i, 60 + 4 * i)) for i in range(10)]
+
+    assert len(detector_calls) == 1
+    assert boxes[-1] == [(77, 136, 117, 96)]
+    assert tracker.counts() == {"face_detector": 1, "tracker": 9, "lost_tracks": 0}
+
+
+def test_redetects_when_the_face_disappears_and_on_interval(detector_calls):
+    tracker = FaceTracker(redetect_interval=3)
+
+    tracker.update(_frame(50, 60))
+    assert tracker.update(np.zeros((240, 320, 3), dtype=np.uint8)) == []
+    # Re-detected after the face is lost, then tracked for three frames
+    # before the interval forces another detection
+    for _ in range(5):
+        tracker.update(_frame(50, 60))
+
+    assert tracker.counts()["lost_tracks"] == 1
+    assert len(detector_calls) == 4
@@ -0,0 +1,33 @@
+import wave
+
+import numpy as np
+import pytest
+
+pytest.importorskip("imageio_ffmpeg")
+
+from app.utils.ffmpeg import AudioDecodeError, decode_audio
+
+
+def test_decode_audio_downmixes_and_resamples(tmp_path):
+    path = str(tmp_path / "tone.wav")
+    t = np.arange(44100 * 2) / 44100
+    tone = (10000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(44100)
+        f.writeframes(np.repeat(tone, 2).tobytes())
+
+    samples = decode_audio(path, 16000)
+
+    assert samples.dtype == np.int16
+    assert len(samples) / 16000 == pytest.approx(2.0, abs=0.01)
+    assert np.abs(samples).max() == pytest.approx(10000, rel=0.05)
+
+
+def test_decode_audio_without_audio_track_raises(tmp_path):
+    path = tmp_path / "empty.wav"
+    path.write_bytes(b"not audio")
+
+    with pytest.raises(AudioDecodeError):
+        decode_audio(str(path))
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("face_recognition")
+
+from app.services import frame_analysis
+from app.services.frame_analysis import analyze_frame, analyze_frames_batch
+
+
+class FakeModels:
+    """Eye cascade and emotion classifier stand-ins that record how they are called."""
+
+    def __init__(self):
+        self.emotion_batches = []
+        self.eye_cascade = self
+        self.emotion_detector = self
+
+    def detectMultiScale(self, gray_face):
+        return [(0, 0, 1, 1)] * 2 if gray_face.mean() > 100 else []
+
+    def classify_emotions(self, faces):
+        self.emotion_batches.append(len(faces))
+        return ["happy" if frame[top:bottom, left:right].mean() > 100 else "sad"
+                for frame, (top, right, bottom, left) in faces]
+
+    def detect_emotions(self, frame, face_rectangles=None):
+        return [{"emotions": {"happy": 1.0}}]
+
+
+@pytest.fixture(autouse=True)
+def fake_faces(monkeypatch):
+    # Frames carry one 20px face per bright block; its gray level doubles as the encoding
+    def face_locations(frame):
+        return [(10, 30 + 40 * i, 30, 10 + 40 * i) for i in range(int(frame[0, 0, 0]))]
+
+    def face_encodings(frame, locations):
+        return [np.full(128, float(frame[top, left, 0])) for top, right, bottom, left in locations]
+
+    def face_distance(encodings, known):
+        return np.linalg.norm(np.asarray(encodings) - known, axis=1)
+
+    monkeypatch.setattr(frame_analysis.face_recognition, "face_locations", face_locations)
+    monkeypatch.setattr(frame_analysis.face_recognition, "face_encodings", face_encodings)
+    monkeypatch.setattr(frame_analysis.face_recognition, "face_distance", face_distance)
+
+
+def _frame(faces, level):
+    frame = np.zeros((40, 200, 3), dtype=np.uint8)
+    frame[0, 0] = faces
+    for i in range(faces):
+        frame[10:30, 10 + 40 * i:30 + 40 * i] = level + i * 50
+    return frame
+
+
+def test_batch_matches_every_face_and_classifies_emotions_once():
+    models = FakeModels()
+    frames = [_frame(1, 150), _frame(0, 0), _frame(2, 10), _frame(1, 200)]
+    known = np.full(128, 150.0)
+
+    results = analyze_frames_batch([(frame, i, None) for i, frame in enumerate(frames)], known, models)
+
+    assert models.emotion_batches == [3]
+    assert [r.face_count for r in results] == [1, 0, 2, 1]
+    assert [r.match for r in results] == [True, False, False, False]
+    assert [r.any_match for r in results] == [True, False, False, False]
+    assert [r.emotion for r in results] == ["happy", None, "sad", "happy"]
+    assert [r.eye_contact for r in results] == [True, False, False, True]
+    assert all(r.ok and r.mtcnn_calls == 0 and r.face_detector_calls == 1 for r in results)
+
+
+def test_batch_agrees_with_per_frame_face_matching():
+    models = FakeModels()
+    frames = [_frame(2, 100), _frame(1, 150), _frame(3, 50), _frame(0, 0)]
+    known = np.full(128, 150.0)
+
+    batched = analyze_frames_batch([(frame, i, None) for i, frame in enumerate(frames)], known, models)
+    single = [analyze_frame(frame, i, known, models) for i, frame in enumerate(frames)]
+
+    assert [(r.face_count, r.match, r.any_match, r.eye_contact) for r in batched] == \
+        [(r.face_count, r.match, r.any_match, r.eye_contact) for r in single]
+
+
+def test_locate_faces_maps_boxes_from_the_detection_copy(monkeypatch):
+    seen = []
+
+    def face_locations(image):
+        seen.append(image.shape)
+        return [(10, 90, 50, 0)]
+
+    monkeypatch.setattr(frame_analysis.face_recognition, "face_locations", face_locations)
+    frame = np.zeros((300, 400, 3), dtype=np.uint8)
+
+    assert frame_analysis.locate_faces(frame, detection_width=100) == [(40, 360, 200, 0)]
+    assert frame_analysis.locate_faces(frame, detection_width=800) == [(10, 90, 50, 0)]
+    assert seen == [(75, 100, 3), (300, 400, 3)]
+
+
+def test_emotion_batch_falls_back_when_fer_internals_are_missing():
+    from app.services.video_models import VideoModels
+
+    class PartialFER:
+        # Has the network but not the crop settings the batched path needs
+        _FER__emotion_classifier = staticmethod(lambda crops, training=False: 1 / 0)
+
+        def detect_emotions(self, frame, face_rectangles=None):
+            return [{"emotions": {"neutral": 0.2, "happy": 0.8}}]
+
+    models = VideoModels.__new__(VideoModels)
+    models.emotion_detector = PartialFER()
+    frame = np.zeros((20, 20, 3), dtype=np.uint8)
+
+    assert models.classify_emotions([(frame, (2, 12, 12, 2))] * 2) == ["happy", "happy"]
@@ -0,0 +1,93 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.services.frame_sampler import FrameSampler, VideoOpenError
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+    for i in range(100):
+        writer.write(np.full((48, 64, 3), i * 2, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+@pytest.mark.parametrize("strategy", ["sequential", "seek", "auto"])
+def test_stride_strategies_yield_the_same_frames(strategy, video_path):
+    frames = list(FrameSampler(strategy, frame_skip=20).frames(video_path))
+
+    assert [f.index for f in frames] == [0, 20, 40, 60, 80]
+    # MJPG is lossy, so only check each frame is close to the expected gray level
+    np.testing.assert_allclose([f.image.mean() for f in frames], [0, 40, 80, 120, 160], atol=4)
+
+
+def test_time_strategy_samples_by_video_time(video_path):
+    frames = list(FrameSampler("time", sample_fps=5).frames(video_path))
+
+    assert [f.index for f in frames] == [0, 6, 12, 18, 24, 30, 36, 42, 48, 54, 60, 66, 72, 78, 84, 90, 96]
+
+
+def test_auto_seeks_intra_only_codecs(video_path):
+    cap = cv2.VideoCapture(video_path)
+    try:
+        assert FrameSampler(frame_skip=20).choose_strategy(cap) == "seek"
+        assert FrameSampler(frame_skip=1).choose_strategy(cap) == "sequential"
+    finally:
+        cap.release()
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(VideoOpenError):
+        list(FrameSampler().frames(str(tmp_path / "missing.mp4")))
+
+
+@pytest.fixture
+def two_scene_video_path(tmp_path):
+    # Ten seconds at 30 fps: a static scene that changes once, halfway through
+    path = str(tmp_path / "scenes.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+    for i in range(300):
+        writer.write(np.full((48, 64, 3), 50 if i < 150 else 200, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_adaptive_strategy_samples_scene_changes_and_max_gaps(two_scene_video_path):
+    sampler = FrameSampler("adaptive", change_threshold=6.0, max_gap=2.0, frame_budget=150, change_check_fps=5)
+
+    frames = list(sampler.frames(two_scene_video_path))
+
+    assert [f.index for f in frames] == [0, 60, 120, 150, 210, 270]
+
+
+def test_adaptive_strategy_respects_frame_budget(two_scene_video_path):
+    sampler = FrameSampler("adaptive", change_threshold=6.0, max_gap=2.0, frame_budget=3, change_check_fps=5)
+
+    frames = list(sampler.frames(two_scene_video_path))
+
+    assert [f.index for f in frames] == [0, 102, 204]
+
+
+def test_adaptive_strategy_caps_frames_when_length_is_unknown(two_scene_video_path, monkeypatch):
+    open_capture = cv2.VideoCapture
+
+    class UnknownLengthCapture:
+        # Like a pipe or a live stream: no frame count in the header
+        def __init__(self, path):
+            self._cap = open_capture(path)
+
+        def get(self, prop):
+            return 0 if prop == cv2.CAP_PROP_FRAME_COUNT else self._cap.get(prop)
+
+        def __getattr__(self, name):
+            return getattr(self._cap, name)
+
+    monkeypatch.setattr(cv2, "VideoCapture", UnknownLengthCapture)
+    sampler = FrameSampler("adaptive", change_threshold=6.0, max_gap=2.0, frame_budget=3, change_check_fps=5)
+
+    frames = list(sampler.frames(two_scene_video_path))
+
+    assert [f.index for f in frames] == [0, 60, 120]
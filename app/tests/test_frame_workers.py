@@ -0,0 +1,56 @@
+import os
+import signal
+
+import numpy as np
+import pytest
+
+pytest.importorskip("face_recognition")
+
+from app.services import frame_workers
+from app.services.frame_analysis import FrameResult
+from app.services.frame_workers import FramePoolRestartingError, ParallelFrameAnalyzer
+
+
+def _no_models():
+    pass
+
+
+def _kill_worker(*args):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def _empty_results(name, shape, dtype, items, *args):
+    return [FrameResult(index) for _, index, _ in items], {}
+
+
+def _frames(count, shape=(4, 4, 3)):
+    return [(index, np.zeros(shape, dtype=np.uint8), None) for index in range(count)]
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(frame_workers, "_init_frame_worker", _no_models)
+    analyzer = ParallelFrameAnalyzer(workers=1, start_method="fork")
+    yield analyzer
+    analyzer.shutdown()
+
+
+def test_dead_worker_fails_the_video_and_the_next_one_gets_new_workers(analyzer, monkeypatch):
+    broken = analyzer._executor
+    monkeypatch.setattr(frame_workers, "_analyze_slots", _kill_worker)
+    with pytest.raises(FramePoolRestartingError):
+        analyzer.analyze(_frames(3), None)
+
+    monkeypatch.setattr(frame_workers, "_analyze_slots", _empty_results)
+    results = analyzer.analyze(_frames(3), None)
+
+    assert analyzer._executor is not broken
+    assert [result.index for result in results] == [0, 1, 2]
+
+
+def test_frames_of_another_shape_are_rejected_even_with_equal_size(analyzer, monkeypatch):
+    monkeypatch.setattr(frame_workers, "_analyze_slots", _empty_results)
+    frames = _frames(1, (4, 6, 3)) + [(1, np.zeros((6, 4, 3), dtype=np.uint8), None)]
+
+    with pytest.raises(ValueError):
+        analyzer.analyze(frames, None)
@@ -0,0 +1,119 @@
+import io
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.job_queue import DONE, FAILED, QUEUED, VideoJobQueue, VideoJobStore
+
+
+def _video_bytes(tmp_path, name, frames):
+    path = str(tmp_path / name)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+    for i in range(frames):
+        writer.write(np.full((24, 32, 3), i, dtype=np.uint8))
+    writer.release()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(analyze, workers=1):
+        store = VideoJobStore(str(tmp_path / "jobs.sqlite3"))
+        job_queue = VideoJobQueue(analyze, store, workers=workers, spool_dir=str(tmp_path / "spool"))
+        job_queue.start()
+        queues.append(job_queue)
+        return job_queue
+
+    yield make
+    for job_queue in queues:
+        job_queue.shutdown()
+        job_queue.store.close()
+
+
+def _wait_for(job_queue, job_id, status=DONE):
+    for _ in range(500):
+        job = job_queue.get(job_id)
+        if job["status"] == status:
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}")
+
+
+def test_identical_submissions_reuse_the_finished_job(tmp_path, make_queue):
+    calls = []
+    job_queue = make_queue(lambda path, encoding: calls.append(path) or {"eye_contact": 50.0})
+    video = _video_bytes(tmp_path, "a.avi", 20)
+
+    first = job_queue.submit("c1", b"face", io.BytesIO(video), np.zeros(128))
+    assert _wait_for(job_queue, first["id"])["result"] == {"eye_contact": 50.0}
+    again = job_queue.submit("c1", b"face", io.BytesIO(video), np.zeros(128))
+    other_face = job_queue.submit("c1", b"other face", io.BytesIO(video), np.zeros(128))
+
+    assert again["id"] == first["id"] and again["status"] == DONE
+    assert other_face["id"] != first["id"]
+    _wait_for(job_queue, other_face["id"])
+    assert len(calls) == 2
+    assert first["duration"] == pytest.approx(2.0)
+
+
+def test_degraded_reports_are_not_reused(tmp_path, make_queue):
+    reports = [{"eye_contact": 50.0, "degraded": {"speech": "Timed out after 120s"}}, {"eye_contact": 50.0}]
+    job_queue = make_queue(lambda path, encoding: reports.pop(0))
+    video = _video_bytes(tmp_path, "a.avi", 20)
+
+    first = job_queue.submit("c1", b"face", io.BytesIO(video), np.zeros(128))
+    _wait_for(job_queue, first["id"])
+    retry = job_queue.submit("c1", b"face", io.BytesIO(video), np.zeros(128))
+    assert retry["id"] != first["id"]
+    assert _wait_for(job_queue, retry["id"])["result"] == {"eye_contact": 50.0}
+    again = job_queue.submit("c1", b"face", io.BytesIO(video), np.zeros(128))
+
+    assert again["id"] == retry["id"] and again["status"] == DONE
+
+
+def test_shorter_videos_run_first(tmp_path, make_queue):
+    started = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def analyze(path, encoding):
+        order.append(encoding)
+        if encoding == "blocker":
+            started.set()
+            release.wait(5)
+        return {}
+
+    job_queue = make_queue(analyze)
+    job_queue.submit("c", b"0", io.BytesIO(_video_bytes(tmp_path, "b.avi", 5)), "blocker")
+    started.wait(5)
+    job_queue.submit("c", b"1", io.BytesIO(_video_bytes(tmp_path, "long.avi", 60)), "long")
+    job_queue.submit("c", b"2", io.BytesIO(b"not a video"), "unknown")
+    last = job_queue.submit("c", b"3", io.BytesIO(_video_bytes(tmp_path, "short.avi", 10)), "short")
+    release.set()
+    _wait_for(job_queue, last["id"])
+
+    for _ in range(500):
+        if len(order) == 4:
+            break
+        threading.Event().wait(0.01)
+    assert order == ["blocker", "short", "long", "unknown"]
+
+
+def test_failures_are_recorded_and_unfinished_jobs_fail_on_restart(tmp_path, make_queue):
+    def analyze(path, encoding):
+        raise RuntimeError("decoder crashed")
+
+    job_queue = make_queue(analyze)
+    failed = job_queue.submit("c1", b"face", io.BytesIO(b"video"), None)
+    assert _wait_for(job_queue, failed["id"], FAILED)["error"] == "decoder crashed"
+
+    store = job_queue.store
+    store.create("leftover", "c2", "key", 3.0)
+    assert store.get("leftover")["status"] == QUEUED
+    assert store.fail_unfinished("restarted") == ["leftover"]
+    assert store.get("leftover")["status"] == FAILED
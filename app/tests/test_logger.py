@@ -0,0 +1,47 @@
+import logging
+import queue
+
+from app.utils import logger as logger_module
+from app.utils.logger import RateLimitFilter
+
+
+def _record(lineno=10, level=logging.INFO, args=()):
+    return logging.LogRecord("app", level, "frame_analysis.py", lineno, "Frame %s", args, None)
+
+
+def test_each_call_site_is_rate_limited_and_reports_what_it_dropped(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(logger_module.time, "monotonic", lambda: now[0])
+    rate_limit = RateLimitFilter(per_second=2)
+
+    assert [rate_limit.filter(_record()) for _ in range(5)] == [True, True, False, False, False]
+    assert rate_limit.filter(_record(lineno=11))
+    assert rate_limit.filter(_record(level=logging.ERROR))
+
+    now[0] += 1.5
+    record = _record()
+    assert rate_limit.filter(record)
+    assert record.suppressed == 3
+    following = _record()
+    assert rate_limit.filter(following)
+    assert not hasattr(following, "suppressed")
+
+
+def test_queued_records_are_formatted_by_the_listener():
+    class Loud:
+        formatted = 0
+
+        def __str__(self):
+            Loud.formatted += 1
+            return "loud"
+
+    records = queue.SimpleQueue()
+    handler = logger_module._DeferredQueueHandler(records)
+    handler.handle(_record(args=(Loud(),)))
+    assert Loud.formatted == 0
+
+    record = records.get_nowait()
+    record.suppressed = 2
+    line = logger_module._SuppressedCountFormatter("%(message)s").format(record)
+    assert line == "Frame loud (2 similar messages suppressed)"
+    assert Loud.formatted == 1
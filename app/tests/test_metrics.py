@@ -0,0 +1,76 @@
+import pickle
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry(buckets=(0.1, 1))
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    return registry
+
+
+def test_render_writes_cumulative_prometheus_histograms(registry):
+    for seconds in (0.05, 0.5, 5):
+        metrics.observe(metrics.VIDEO_PHASE_SECONDS, seconds, phase="frames")
+    metrics.observe(metrics.VIDEO_PHASE_SECONDS, 0.5, phase='say "hi"')
+
+    text = metrics.render()
+
+    assert "# TYPE video_phase_seconds histogram" in text
+    assert 'video_phase_seconds_bucket{phase="frames",le="0.1"} 1' in text
+    assert 'video_phase_seconds_bucket{phase="frames",le="1"} 2' in text
+    assert 'video_phase_seconds_bucket{phase="frames",le="+Inf"} 3' in text
+    assert 'video_phase_seconds_sum{phase="frames"} 5.55' in text
+    assert 'video_phase_seconds_count{phase="frames"} 3' in text
+    assert 'video_phase_seconds_count{phase="say \\"hi\\""} 1' in text
+
+
+def test_worker_snapshots_merge_into_the_parent(registry):
+    worker = metrics.MetricsRegistry(buckets=(0.1, 1))
+    worker.observe("stage_seconds", 0.05, (("stage", "spacy"),))
+    metrics.observe("stage_seconds", 0.5, stage="spacy")
+
+    snapshot = pickle.loads(pickle.dumps(worker.drain()))
+    metrics.merge(snapshot)
+
+    assert worker.drain() == {}
+    assert 'stage_seconds_count{stage="spacy"} 2' in metrics.render()
+
+
+def test_disabled_timers_record_nothing(registry, monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+
+    def work():
+        return 42
+
+    assert metrics.instrument(work, "work_seconds") is work
+    with metrics.timer("work_seconds"):
+        pass
+    assert registry.drain() == {}
+    assert metrics.drain() == {}
+
+
+def test_requests_are_labelled_by_route_template():
+    app = FastAPI()
+    app.add_middleware(metrics.RequestTimingMiddleware)
+
+    @app.get("/jobs/{job_id}")
+    def get_job(job_id: str):
+        with metrics.timer("lookup_seconds"):
+            return {"id": job_id}
+
+    client = TestClient(app)
+    client.get("/jobs/1")
+    client.get("/jobs/2")
+    client.get("/missing")
+
+    text = metrics.render()
+    assert 'http_request_seconds_count{method="GET",route="/jobs/{job_id}",status="200"} 2' in text
+    assert 'http_request_seconds_count{method="GET",route="unmatched",status="404"} 1' in text
+    assert "lookup_seconds_count 2" in text
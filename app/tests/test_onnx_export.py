@@ -0,0 +1,33 @@
+import threading
+import time
+
+from app.services import embedding_backends
+
+
+def test_concurrent_workers_export_once_and_never_see_a_partial_file(tmp_path, monkeypatch):
+    onnx_path = str(tmp_path / "models" / "model.onnx")
+    exports = []
+
+    def slow_export(model_name, path):
+        exports.append(path)
+        with open(path, "w") as f:
+            f.write("partial")
+            time.sleep(0.1)
+            f.write(" complete")
+
+    monkeypatch.setattr(embedding_backends, "export_onnx", slow_export)
+    seen = []
+
+    def worker():
+        embedding_backends.ensure_onnx_model("model", onnx_path)
+        with open(onnx_path) as f:
+            seen.append(f.read())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(exports) == 1 and exports[0] != onnx_path
+    assert seen == ["partial complete"] * 4
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+from app.utils.readiness import FAILED, NOT_LOADED, READY, Readiness
+
+
+def test_report_tracks_warmup_and_models_loaded_elsewhere():
+    loaded = []
+    readiness = Readiness()
+    readiness.register("embeddings", lambda: loaded.append("embeddings"))
+    readiness.register("speech", lambda: None, loaded=lambda: "speech" in loaded)
+
+    assert readiness.report()["ready"] is False
+    loaded.append("speech")
+    assert readiness.report()["models"]["speech"]["state"] == READY
+
+    readiness.warm()
+    report = readiness.report()
+    assert report["ready"] is True
+    assert report["models"]["embeddings"]["state"] == READY
+    assert loaded.count("embeddings") == 1
+
+
+def test_failed_models_keep_the_app_unready_even_without_warmup():
+    def broken():
+        raise OSError("model file missing")
+
+    readiness = Readiness(require_warmup=False)
+    readiness.register("fer", broken)
+    assert readiness.report() == {
+        "ready": True, "models": {"fer": {"state": NOT_LOADED, "seconds": None, "error": None}},
+    }
+
+    readiness.warm()
+    report = readiness.report()
+    assert report["ready"] is False
+    assert report["models"]["fer"]["state"] == FAILED
+    assert report["models"]["fer"]["error"] == "OSError: model file missing"
+
+
+def test_text_only_app_imports_no_video_libraries():
+    script = (
+        "import sys\n"
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "heavy = [m for m in ('app.services.video_analyzer', 'face_recognition', 'fer', 'nltk', 'cv2', 'spacy')"
+        " if m in sys.modules]\n"
+        "response = TestClient(app).get('/ready')\n"
+        "print(heavy, response.status_code, sorted(response.json()['models']))\n"
+    )
+    env = dict(os.environ, APP_SUBSYSTEMS="text", WARMUP="off")
+    output = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ).stdout
+
+    assert output.strip().splitlines()[-1] == "[] 200 ['ats_scoring']"
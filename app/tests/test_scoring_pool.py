@@ -0,0 +1,67 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import scoring_pool
+from app.services.scoring_pool import PoolRestartingError, PoolSaturatedError, ScoringPool
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _pool(queue_size, timeout):
+    pool = ScoringPool(workers=0, queue_size=queue_size, timeout=timeout)
+    pool._executor = ThreadPoolExecutor(max_workers=1)
+    return pool
+
+
+def test_rejects_requests_beyond_queue_size():
+    async def run():
+        pool = _pool(queue_size=1, timeout=5)
+        return await asyncio.gather(
+            *(pool._submit(_sleep, 0.05) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert results[:2] == [0.05, 0.05]
+    assert isinstance(results[2], PoolSaturatedError)
+
+
+def test_timeout_keeps_slot_until_worker_finishes():
+    async def run():
+        pool = _pool(queue_size=0, timeout=0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            await pool._submit(_sleep, 0.3)
+        busy = pool.pending
+        await asyncio.sleep(0.5)
+        return busy, pool.pending
+
+    assert asyncio.run(run()) == (1, 0)
+
+
+def _fail_to_load():
+    raise RuntimeError("out of memory")
+
+
+def test_broken_pool_is_replaced_and_requests_get_restarting_error(monkeypatch):
+    monkeypatch.setattr(scoring_pool, "_init_worker", lambda *args: None)
+
+    async def run():
+        pool = ScoringPool(workers=0, queue_size=1, timeout=5)
+        pool._executor = ThreadPoolExecutor(max_workers=1, initializer=_fail_to_load)
+        with pytest.raises(PoolRestartingError):
+            await pool._submit(_sleep, 0)
+        for _ in range(100):
+            if pool.loaded():
+                break
+            await asyncio.sleep(0.01)
+        result = await pool._submit(_sleep, 0)
+        pool.shutdown()
+        return result
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from app.services.speech_backends import SpeechRecognitionError, SpeechTranscriber, split_on_silence
+
+RATE = 16000
+
+
+def _speech(*pattern):
+    """Alternating seconds of tone and silence, starting with tone."""
+    t = np.arange(RATE) / RATE
+    tone = (8000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+    parts = []
+    for i, seconds in enumerate(pattern):
+        second = tone if i % 2 == 0 else np.zeros(RATE, dtype=np.int16)
+        parts.append(np.tile(second, seconds))
+    return np.concatenate(parts)
+
+
+class TimedBackend:
+    """Reports one word per second of tone, with timings like an offline engine."""
+
+    def transcribe(self, samples, sample_rate):
+        loud = np.abs(samples.astype(np.int32)).reshape(-1, sample_rate // 10).max(axis=1) > 1000
+        return [(f"w{i}", i / 10, i / 10 + 0.1) for i in np.flatnonzero(loud)[::10]]
+
+
+class FailingBackend:
+    def transcribe(self, samples, sample_rate):
+        raise ConnectionError("offline")
+
+
+def test_split_on_silence_cuts_at_pauses_and_packs_chunks():
+    samples = _speech(2, 1, 2, 3, 1, 2)
+
+    chunks = split_on_silence(samples, RATE, max_chunk=10)
+    separate = split_on_silence(samples, RATE, max_chunk=3)
+
+    # Everything fits in one chunk, trimmed of leading and trailing silence
+    assert len(chunks) == 1
+    assert chunks[0][0] == 0 and chunks[0][1] == int(9.2 * RATE)
+    # With short chunks each stretch of speech is its own chunk, padded by 0.2s
+    assert [(round(s / RATE, 1), round(e / RATE, 1)) for s, e in separate] == [(0, 2.2), (2.8, 5.2), (7.8, 9.2)]
+
+
+def test_split_on_silence_breaks_long_speech_and_skips_silence():
+    assert split_on_silence(np.zeros(3 * RATE, dtype=np.int16), RATE) == []
+
+    chunks = split_on_silence(_speech(10), RATE, max_chunk=4)
+
+    assert len(chunks) == 3
+    assert all(end - start <= 4 * RATE for start, end in chunks)
+    assert chunks[0][0] == 0 and chunks[-1][1] == 10 * RATE
+
+
+def test_transcriber_stitches_chunks_on_the_recording_timeline():
+    samples = _speech(2, 1, 2, 3, 1, 2)
+    transcriber = SpeechTranscriber(TimedBackend(), workers=3)
+
+    transcript = transcriber.transcribe(samples, RATE)
+
+    assert transcript.word_count == 5
+    starts = [word.start for word in transcript.words]
+    assert starts == sorted(starts)
+    assert starts[-1] == pytest.approx(8.0, abs=0.25)
+    assert transcript.speaking_rate == pytest.approx(5 / (transcript.speaking_seconds / 60))
+
+
+def test_transcriber_raises_when_every_chunk_fails():
+    with pytest.raises(SpeechRecognitionError):
+        SpeechTranscriber(FailingBackend()).transcribe(_speech(2), RATE)
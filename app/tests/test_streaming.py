@@ -0,0 +1,110 @@
+import io
+
+import numpy as np
+import pytest
+
+from app.services.video_stream import Y4MReader
+from app.utils.streaming import FieldTooLargeError, StreamingFormReader, format_sse
+
+BODY = (
+    b"--XX\r\n"
+    b'Content-Disposition: form-data; name="known_face_image"; filename="face.jpg"\r\n'
+    b"Content-Type: image/jpeg\r\n\r\n"
+    b"IMAGE\r\n"
+    b"--XX\r\n"
+    b'Content-Disposition: form-data; name="video_file"; filename="clip.webm"\r\n'
+    b"Content-Type: video/webm\r\n\r\n"
+    + b"V" * 1000 +
+    b"\r\n--XX--\r\n"
+)
+
+
+def test_form_reader_streams_one_field_and_buffers_the_rest():
+    reader = StreamingFormReader("multipart/form-data; boundary=XX", "video_file")
+
+    streamed = [reader.write(BODY[i:i + 64]) for i in range(0, len(BODY), 64)]
+
+    assert reader.fields == {"known_face_image": b"IMAGE"}
+    assert reader.streaming
+    assert b"".join(streamed) == b"V" * 1000
+    # The video arrives over many writes instead of all at the end
+    assert sum(1 for chunk in streamed if chunk) > 10
+
+
+def test_form_reader_limits_buffered_fields_but_not_the_stream():
+    reader = StreamingFormReader("multipart/form-data; boundary=XX", "video_file", max_field_size=5)
+    streamed = reader.write(BODY)
+    assert reader.fields == {"known_face_image": b"IMAGE"}
+    assert streamed == b"V" * 1000
+
+    reader = StreamingFormReader("multipart/form-data; boundary=XX", "video_file", max_field_size=4)
+    with pytest.raises(FieldTooLargeError):
+        for i in range(0, len(BODY), 2):
+            reader.write(BODY[i:i + 2])
+
+
+def test_form_reader_rejects_other_content_types():
+    with pytest.raises(ValueError):
+        StreamingFormReader("application/json", "video_file")
+
+
+def test_format_sse():
+    assert format_sse("progress", {"frames_analyzed": 3}) == 'event: progress\ndata: {"frames_analyzed": 3}\n\n'
+
+
+def test_y4m_reader_decodes_frames():
+    width, height = 8, 4
+    frame = b"FRAME\n" + bytes([235]) * (width * height) + bytes([128]) * (width * height // 2)
+    stream = io.BytesIO(b"YUV4MPEG2 W8 H4 F25:1 Ip A1:1 C420jpeg\n" + frame * 3 + frame[:10])
+    reader = Y4MReader(stream)
+
+    frames = list(reader.frames())
+
+    # The truncated last frame is dropped
+    assert len(frames) == 3
+    assert reader.fps == 25
+    assert frames[0].shape == (height, width, 3)
+    # Limited-range white
+    np.testing.assert_allclose(frames[0], 255, atol=1)
+
+
+def test_event_stream_stops_when_the_client_disconnects_after_the_body():
+    import asyncio
+
+    from app.utils.streaming import EventStreamResponse
+
+    closed = []
+    sent = []
+
+    async def events():
+        try:
+            while True:
+                yield format_sse("progress", {})
+                await asyncio.sleep(0.01)
+        finally:
+            closed.append(True)
+
+    async def run():
+        body_read = asyncio.Event()
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        async def client():
+            await asyncio.sleep(0.05)
+            body_read.set()
+            await asyncio.sleep(0.05)
+            disconnect.set()
+
+        response = EventStreamResponse(events(), body_read)
+        await asyncio.wait_for(asyncio.gather(response({"type": "http"}, receive, send), client()), 2)
+
+    asyncio.run(run())
+
+    assert closed == [True]
+    assert sum(1 for message in sent if message["type"] == "http.response.body") > 2
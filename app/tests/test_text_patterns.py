@@ -0,0 +1,33 @@
+import re
+
+from app.services.text_patterns import CATEGORY_PATTERN_TABLE, CATEGORY_PATTERNS, find_whole_words
+
+TEXT = """Senior Software Engineer (remote, full-time)
+Associate's degree or BA/BS required, MBA or Ph.D. preferred.
+7+ years in fintech and e-commerce; worked with the CTO as an intern and consultant.
+Skills: Python, C++, Node.js, SQL. It is a tech role."""
+
+
+def _category_hits(category, text):
+    return {m.lower() for pattern in CATEGORY_PATTERNS[category] for m in pattern.findall(text)}
+
+
+def test_compiled_category_patterns_match_uncompiled_patterns():
+    for category, patterns in CATEGORY_PATTERN_TABLE.items():
+        expected = set()
+        for pattern in patterns:
+            expected.update(m.lower() for m in re.findall(pattern, TEXT, re.IGNORECASE))
+
+        assert _category_hits(category, TEXT) == expected
+
+
+def test_category_patterns_keep_overlapping_matches():
+    # The bachelor's pattern also matches inside "M.B.A. degree"
+    assert _category_hits("education", "M.B.A. degree") == {"m.b.a. degree", "b.a. degree"}
+
+
+def test_find_whole_words_matches_word_boundary_regex():
+    items = ["python", "c++", "node.js", "sql", "java", "tech", "engineer", "e-commerce", "it", "fin", "skills:"]
+    expected = {i for i in items if re.search(r'\b' + re.escape(i) + r'\b', TEXT, re.IGNORECASE)}
+
+    assert find_whole_words(items, TEXT.lower()) == expected
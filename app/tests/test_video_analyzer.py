@@ -0,0 +1,127 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("face_recognition")
+pytest.importorskip("textblob")
+pytest.importorskip("nltk")
+
+from app.services.frame_analysis import FrameResult
+from app.services import video_analyzer
+from app.services.video_analyzer import VideoAnalyzer
+
+
+class SlowBranchesAnalyzer(VideoAnalyzer):
+    """Each branch sleeps instead of decoding, so only the orchestration is measured."""
+
+    def __init__(self, frame_seconds=0.3, speech_seconds=0.3, speech_error=None, **kwargs):
+        super().__init__(known_face_encoding=np.zeros(128), workers=0, **kwargs)
+        self.frame_seconds = frame_seconds
+        self.speech_seconds = speech_seconds
+        self.speech_error = speech_error
+
+    def _analyze_frames(self, video_path, deadline=None):
+        time.sleep(self.frame_seconds)
+        return [FrameResult(0, ok=True, face_count=1, match=True, any_match=True, emotion="happy", eye_contact=True)]
+
+    def analyze_speech(self, media_path):
+        time.sleep(self.speech_seconds)
+        if self.speech_error is not None:
+            raise self.speech_error
+        return 0.5, 120.0, 40
+
+
+def test_branches_overlap_when_concurrent():
+    started = time.monotonic()
+    report = SlowBranchesAnalyzer(concurrent=True).analyze("clip.mp4")
+    concurrent_seconds = time.monotonic() - started
+
+    started = time.monotonic()
+    SlowBranchesAnalyzer(concurrent=False).analyze("clip.mp4")
+    sequential_seconds = time.monotonic() - started
+
+    assert report["word_count"] == 40 and report["eye_contact"] == 100
+    assert "degraded" not in report
+    assert concurrent_seconds < 0.5 < sequential_seconds
+
+
+def test_speech_failure_keeps_visual_metrics():
+    report = SlowBranchesAnalyzer(speech_seconds=0, speech_error=IOError("no audio track")).analyze("clip.mp4")
+
+    assert report["eye_contact"] == 100
+    assert report["speech_sentiment"] is None and report["confidence_score"] is None
+    assert report["degraded"] == {"speech": "no audio track"}
+
+
+def test_speech_timeout_does_not_wait_for_the_slow_branch():
+    started = time.monotonic()
+    report = SlowBranchesAnalyzer(frame_seconds=0, speech_seconds=2, speech_timeout=0.2).analyze("clip.mp4")
+
+    assert time.monotonic() - started < 1
+    assert report["degraded"] == {"speech": "Timed out after 0.2s"}
+    assert report["face_match_percentage"] == 100
+
+
+class _FakeNltk:
+    def __init__(self, installed, download_ok):
+        self.installed = installed
+        self.download_ok = download_ok
+        self.downloads = 0
+        self.data = self
+
+    def find(self, resource):
+        if not self.installed:
+            raise LookupError(resource)
+
+    def download(self, *args, **kwargs):
+        self.downloads += 1
+        return self.download_ok
+
+
+@pytest.mark.parametrize("installed, download_ok, downloads, ready", [
+    (True, False, 0, True),
+    (False, True, 1, True),
+    (False, False, 1, False),
+])
+def test_nltk_data_is_only_downloaded_when_missing(monkeypatch, installed, download_ok, downloads, ready):
+    fake = _FakeNltk(installed, download_ok)
+    monkeypatch.setattr(video_analyzer, "nltk", fake)
+    monkeypatch.setattr(video_analyzer, "_nltk_ready", False)
+
+    if ready:
+        video_analyzer.ensure_nltk_data()
+    else:
+        with pytest.raises(LookupError):
+            video_analyzer.ensure_nltk_data()
+
+    assert fake.downloads == downloads
+    assert video_analyzer._nltk_ready is ready
+
+
+def test_analyze_endpoint_removes_the_upload_when_analysis_fails(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.routers import video
+
+    paths = []
+
+    def failing_analyze(self, video_path):
+        paths.append(video_path)
+        with open(video_path, "rb") as f:
+            assert f.read() == b"VIDEO"
+        raise RuntimeError("decoder failed")
+
+    monkeypatch.setattr(video.reference_encodings, "get_encoding", lambda id, image: np.zeros(128))
+    monkeypatch.setattr(VideoAnalyzer, "analyze", failing_analyze)
+    app = FastAPI()
+    app.include_router(video.router)
+
+    response = TestClient(app).post(
+        "/analyze/?id=1", files={"known_face_image": ("face.jpg", b"IMAGE"), "video_file": ("clip.mp4", b"VIDEO")}
+    )
+
+    assert response.status_code == 500
+    assert response.json() == {"error": "decoder failed"}
+    assert len(paths) == 1 and not os.path.exists(paths[0])
@@ -0,0 +1,37 @@
+# app/utils/ffmpeg.py
+import shutil
+import subprocess
+
+import numpy as np
+
+
+class AudioDecodeError(IOError):
+    """ffmpeg could not produce audio from the input."""
+
+
+def ffmpeg_executable() -> str:
+    """Path to ffmpeg: the binary bundled with imageio-ffmpeg, else the one on PATH."""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which("ffmpeg") or "ffmpeg"
+
+
+def decode_audio(path: str, sample_rate: int = 16000) -> np.ndarray:
+    """
+    Decode the first audio track of ``path`` to mono int16 samples at ``sample_rate``.
+
+    ffmpeg resamples and writes raw PCM to a pipe that is read straight into
+    the returned array; nothing is written to disk.
+    """
+    command = [
+        ffmpeg_executable(), "-hide_banner", "-loglevel", "error", "-nostdin", "-i", path,
+        "-map", "0:a:0", "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "pipe:1",
+    ]
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if process.returncode != 0:
+        errors = process.stderr.decode(errors="replace").strip().splitlines()
+        # The first line names the problem; the rest is ffmpeg's follow-up noise
+        raise AudioDecodeError(errors[0] if errors else f"ffmpeg exited with {process.returncode}")
+    return np.frombuffer(process.stdout, dtype=np.int16)
@@ -0,0 +1,28 @@
+# app/utils/file_lock.py
+"""
+Exclusive locks between processes that write the same file.
+
+Uses ``fcntl.flock`` on a ``<path>.lock`` file next to the target. Where
+fcntl is unavailable (Windows) the lock does nothing, and writers rely on
+their atomic ``os.replace`` alone.
+"""
+
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive lock for ``path`` while the block runs."""
+    with open(path + ".lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
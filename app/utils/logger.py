@@ -1,16 +1,107 @@
 # app/utils/logger.py
+"""
+Application logging.
+
+Records are handed to a queue and written to stderr by a listener thread, so
+a request thread never waits on the stream. Messages use %-style arguments,
+which are only formatted on the listener thread and only for records that
+pass the level check; objects passed as arguments must not be changed after
+the call.
+
+Chatty call sites are rate limited. Each ``logger.info(...)`` line (file and
+line number) may emit ``LOG_RATE_LIMIT`` records per second. Anything beyond
+that is dropped and counted, and the count is added to that site's next
+record. Warnings and errors are never dropped.
+"""
+
+import atexit
 import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from app import config
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets each call site through at most ``per_second`` times a second below WARNING."""
+
+    def __init__(self, per_second: int = config.LOG_RATE_LIMIT):
+        super().__init__()
+        self.per_second = per_second
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.per_second <= 0 or record.levelno >= logging.WARNING:
+            return True
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window, emitted, dropped = self._sites.get(site, (now, 0, 0))
+            if now - window >= 1:
+                window, emitted = now, 0
+            if emitted >= self.per_second:
+                self._sites[site] = (window, emitted, dropped + 1)
+                return False
+            self._sites[site] = (window, emitted + 1, 0)
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class _SuppressedCountFormatter(logging.Formatter):
+    def format(self, record):
+        message = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += f" ({suppressed} similar messages suppressed)"
+        return message
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # QueueHandler.prepare formats the message on the caller's thread; keep
+    # the arguments and let the listener's handler do it instead
+    def prepare(self, record):
+        return record
+
+
+def _stream_handler():
+    handler = logging.StreamHandler()
+    handler.setFormatter(_SuppressedCountFormatter(LOG_FORMAT))
+    return handler
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logger():
     logger = logging.getLogger(__name__)
-    
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
-    
-    return logger
\ No newline at end of file
+
+    with _setup_lock:
+        if not logger.handlers:
+            global _listener
+            if config.LOG_ASYNC:
+                records = queue.SimpleQueue()
+                handler = _DeferredQueueHandler(records)
+                _listener = QueueListener(records, _stream_handler())
+                _listener.start()
+                # Flush what is still queued when the process exits
+                atexit.register(_stop_listener)
+            else:
+                handler = _stream_handler()
+            handler.addFilter(RateLimitFilter())
+            logger.addHandler(handler)
+            logger.setLevel(config.LOG_LEVEL)
+
+    return logger
@@ -0,0 +1,237 @@
+# app/utils/metrics.py
+"""
+Per-stage latency histograms, exposed in the Prometheus text format.
+
+Code is timed with ``timer`` (a context manager) or ``timed`` (a decorator)
+into histograms keyed by metric name and labels; other values, such as
+batch sizes, are recorded with ``observe``. With METRICS_ENABLED=0,
+``timer`` hands back a shared no-op and ``timed`` returns the function
+unwrapped, so instrumented code costs a flag check or nothing at all.
+
+Worker processes record into their own registry. They pass its contents back
+with each task result (``drain``) and the API process ``merge``s them, so
+``/metrics`` also covers the scoring and frame worker pools.
+"""
+
+import bisect
+import threading
+import time
+from functools import wraps
+from typing import Dict, Tuple
+
+from app import config
+
+ENABLED = config.METRICS_ENABLED
+
+# Upper bounds in seconds; the video phases need the long tail
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+TEXT_STAGE_SECONDS = "ats_text_stage_seconds"
+EMBEDDING_ENCODE_SECONDS = "ats_embedding_encode_seconds"
+VIDEO_PHASE_SECONDS = "video_phase_seconds"
+FRAME_STAGE_SECONDS = "video_frame_stage_seconds"
+REQUEST_SECONDS = "http_request_seconds"
+EMBEDDING_BATCH_SIZE = "ats_embedding_batch_size"
+EMBEDDING_QUEUE_SECONDS = "ats_embedding_queue_seconds"
+
+# Metrics whose values do not fit the default buckets
+METRIC_BUCKETS = {
+    EMBEDDING_BATCH_SIZE: (1, 2, 4, 8, 16, 32, 64, 128, 256),
+    EMBEDDING_QUEUE_SECONDS: (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+}
+
+DESCRIPTIONS = {
+    TEXT_STAGE_SECONDS: "TextProcessor model runs and extractors, per stage",
+    EMBEDDING_ENCODE_SECONDS: "ScoreCalculator sentence embedding calls, including micro-batch waits",
+    VIDEO_PHASE_SECONDS: "VideoAnalyzer phases",
+    FRAME_STAGE_SECONDS: "Per-frame face detection, encoding, emotion and eye-contact work",
+    REQUEST_SECONDS: "HTTP request handling time until the response is sent",
+    EMBEDDING_BATCH_SIZE: "Texts per micro-batched embedding call",
+    EMBEDDING_QUEUE_SECONDS: "Time an embedding call waited for its micro-batch to run",
+}
+
+
+class MetricsRegistry:
+    """
+    Thread-safe histograms; each series is its bucket counts (last is +Inf)
+    followed by the sum. Metrics in ``bucket_overrides`` use their own bounds.
+    """
+
+    def __init__(self, buckets=BUCKETS, bucket_overrides=None):
+        self.buckets = tuple(buckets)
+        self.bucket_overrides = dict(METRIC_BUCKETS if bucket_overrides is None else bucket_overrides)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def buckets_for(self, name: str) -> Tuple:
+        return self.bucket_overrides.get(name, self.buckets)
+
+    def observe(self, name: str, value: float, labels: Tuple = ()) -> None:
+        buckets = self.buckets_for(name)
+        bucket = bisect.bisect_left(buckets, value)
+        with self._lock:
+            series = self._series.get((name, labels))
+            if series is None:
+                series = self._series[(name, labels)] = [0] * (len(buckets) + 1) + [0.0]
+            series[bucket] += 1
+            series[-1] += value
+
+    def drain(self) -> Dict:
+        """Everything recorded so far, leaving the registry empty."""
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def merge(self, snapshot: Dict) -> None:
+        """Add a ``drain`` result, e.g. from a worker process, to this registry."""
+        with self._lock:
+            for key, values in snapshot.items():
+                series = self._series.get(key)
+                if series is None:
+                    self._series[key] = list(values)
+                else:
+                    for i, value in enumerate(values):
+                        series[i] += value
+
+    def render(self) -> str:
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+
+        lines = []
+        for name in sorted({name for name, _ in series}):
+            bounds = [f"{bound:g}" for bound in self.buckets_for(name)] + ["+Inf"]
+            if name in DESCRIPTIONS:
+                lines.append(f"# HELP {name} {DESCRIPTIONS[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for (_, labels), values in sorted(item for item in series.items() if item[0][0] == name):
+                cumulative = 0
+                for bound, count in zip(bounds, values[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {values[-1]}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe(self.name, time.perf_counter() - self.start, self.labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+REGISTRY = MetricsRegistry()
+
+
+def timer(name: str, **labels):
+    """Context manager recording how long its block took, failures included."""
+    if not ENABLED:
+        return _NULL_TIMER
+    return _Timer(name, tuple(sorted(labels.items())))
+
+
+def timed(name: str, **labels):
+    """
+    Decorator recording each call's duration. Whether to wrap is decided
+    when the function is defined, so a disabled build calls it directly.
+    """
+    def decorate(fn):
+        return instrument(fn, name, **labels)
+    return decorate
+
+
+def instrument(fn, name: str, **labels):
+    """``fn`` wrapped to record each call's duration, or ``fn`` itself when disabled."""
+    if not ENABLED:
+        return fn
+    key = tuple(sorted(labels.items()))
+
+    @wraps(fn)
+    def timed_call(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            REGISTRY.observe(name, time.perf_counter() - start, key)
+
+    return timed_call
+
+
+def observe(name: str, value: float, **labels) -> None:
+    if ENABLED:
+        REGISTRY.observe(name, value, tuple(sorted(labels.items())))
+
+
+def drain() -> Dict:
+    return REGISTRY.drain() if ENABLED else {}
+
+
+def merge(snapshot: Dict) -> None:
+    if snapshot:
+        REGISTRY.merge(snapshot)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware recording each request's total time, labelled by route
+    template rather than raw path so ids do not create new series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            observe(REQUEST_SECONDS, time.perf_counter() - start,
+                    route=getattr(route, "path", "unmatched"), method=scope["method"], status=status)
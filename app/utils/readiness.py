@@ -0,0 +1,91 @@
+# app/utils/readiness.py
+"""
+Model warmup and readiness reporting.
+
+Each subsystem registers the models it needs with a load function. Warmup
+loads them one after another, on startup or in a background thread, and
+``report`` says which are ready for the ``/ready`` endpoint. Nothing here
+loads a model by itself: with warmup off, models still load on the first
+request that needs them.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class _Component:
+    __slots__ = ("name", "load", "loaded", "state", "seconds", "error")
+
+    def __init__(self, name, load, loaded):
+        self.name = name
+        self.load = load
+        self.loaded = loaded
+        self.state = NOT_LOADED
+        self.seconds = None
+        self.error = None
+
+
+class Readiness:
+    """
+    Tracks the warmup of registered models.
+
+    ``loaded`` is an optional check of whether a model was already loaded
+    some other way, e.g. lazily by a request before warmup reached it, or
+    by a restarted worker pool after warmup failed.
+    With ``require_warmup`` False (warmup off) the app counts as ready
+    before anything is loaded, as long as nothing failed.
+    """
+
+    def __init__(self, require_warmup: bool = True):
+        self.require_warmup = require_warmup
+        self._components = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def register(self, name: str, load: Callable, loaded: Optional[Callable[[], bool]] = None) -> None:
+        self._components[name] = _Component(name, load, loaded)
+
+    def warm(self) -> None:
+        """Load every registered model not yet loaded, in registration order."""
+        for component in list(self._components.values()):
+            with self._lock:
+                if component.state in (LOADING, READY):
+                    continue
+                component.state = LOADING
+            started = time.perf_counter()
+            try:
+                component.load()
+            except Exception as e:
+                state, component.error = FAILED, f"{type(e).__name__}: {e}"
+            else:
+                state, component.error = READY, None
+            with self._lock:
+                component.seconds = round(time.perf_counter() - started, 3)
+                component.state = state
+
+    def start_background(self) -> None:
+        """Run ``warm`` on a daemon thread so the server can accept connections meanwhile."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.warm, name="model-warmup", daemon=True)
+            self._thread.start()
+
+    def report(self) -> dict:
+        models = {}
+        with self._lock:
+            for component in self._components.values():
+                state, error = component.state, component.error
+                if state in (NOT_LOADED, FAILED) and component.loaded is not None and component.loaded():
+                    state, error = READY, None
+                models[component.name] = {"state": state, "seconds": component.seconds, "error": error}
+        states = {model["state"] for model in models.values()}
+        if self.require_warmup:
+            ready = states <= {READY}
+        else:
+            ready = not states & {LOADING, FAILED}
+        return {"ready": ready, "models": models}
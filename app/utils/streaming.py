@@ -0,0 +1,143 @@
+# app/utils/streaming.py
+"""
+Helpers for endpoints that read an upload and answer while it is still arriving.
+"""
+
+import asyncio
+import json
+from functools import partial
+from typing import Dict, List, Optional
+
+import anyio
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.responses import StreamingResponse
+
+from app import config
+
+
+class FieldTooLargeError(ValueError):
+    """Raised when a buffered form field exceeds its size limit."""
+
+
+class StreamingFormReader:
+    """
+    Incremental multipart/form-data reader.
+
+    Every field is buffered in ``fields`` except ``stream_field``, whose bytes
+    are handed back from ``write`` as they arrive so they can be processed
+    before the upload ends. Fields the stream depends on must therefore be
+    sent before it. A buffered field larger than ``max_field_size`` bytes
+    raises ``FieldTooLargeError``.
+    """
+
+    def __init__(self, content_type: str, stream_field: str,
+                 max_field_size: int = config.UPLOAD_MAX_FIELD_BYTES):
+        content_type, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise ValueError("Expected a multipart/form-data body with a boundary")
+
+        self.stream_field = stream_field
+        self.max_field_size = max_field_size
+        self.streaming = False
+        self._fields: Dict[str, List[bytes]] = {}
+        self._field_sizes: Dict[str, int] = {}
+        self._name: Optional[str] = None
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._chunks = []
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+        })
+
+    def write(self, chunk: bytes) -> bytes:
+        """Parse the next chunk of the body; returns the stream field's bytes in it."""
+        self._chunks = []
+        self._parser.write(chunk)
+        return b"".join(self._chunks)
+
+    @property
+    def fields(self) -> Dict[str, bytes]:
+        return {name: b"".join(chunks) for name, chunks in self._fields.items()}
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._name = None
+
+    def _on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, params = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = params.get(b"name", b"").decode("latin-1")
+        if self._name == self.stream_field:
+            self.streaming = True
+        else:
+            self._fields[self._name] = []
+            self._field_sizes[self._name] = 0
+
+    def _on_part_data(self, data, start, end):
+        if self._name == self.stream_field:
+            self._chunks.append(data[start:end])
+        else:
+            self._field_sizes[self._name] += end - start
+            if self._field_sizes[self._name] > self.max_field_size:
+                raise FieldTooLargeError(
+                    f"Form field '{self._name}' is larger than {self.max_field_size} bytes"
+                )
+            self._fields[self._name].append(data[start:end])
+
+
+class EventStreamResponse(StreamingResponse):
+    """
+    A text/event-stream response that may be sent while the request body is
+    still being read.
+
+    StreamingResponse listens on ``receive`` for disconnects while streaming,
+    which would swallow the body chunks the endpoint is still consuming. This
+    response starts listening once ``body_read`` is set; while the body is
+    still being read, the endpoint sees a disconnect itself. When the client
+    goes away, the content iterator is cancelled.
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(self, content, body_read: asyncio.Event, **kwargs):
+        super().__init__(content, **kwargs)
+        self.body_read = body_read
+
+    async def __call__(self, scope, receive, send) -> None:
+        async with anyio.create_task_group() as task_group:
+
+            async def wrap(func):
+                await func()
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(wrap, partial(self.stream_response, send))
+            await wrap(partial(self._listen_for_disconnect, receive))
+
+    async def _listen_for_disconnect(self, receive) -> None:
+        await self.body_read.wait()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+
+
+def format_sse(event: str, data) -> str:
+    """Serialize one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
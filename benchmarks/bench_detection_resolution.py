@@ -0,0 +1,90 @@
+# benchmarks/bench_detection_resolution.py
+"""
+Face detection latency and recall at different detection widths.
+
+Samples frames from the given clips, runs the HOG detector on the full
+frame as the reference, then times ``locate_faces`` at each width and counts
+how many reference faces it still finds (IoU >= 0.5 after mapping the boxes
+back). The half-resolution row is what the analyzer does with
+VIDEO_DETECTION_WIDTH=0. Prints a markdown table. Needs dlib.
+
+Usage:
+    python -m benchmarks.bench_detection_resolution --videos a.mp4 b.webm [--widths 320 480 640] [--frame-skip 15]
+"""
+
+import argparse
+import time
+
+import cv2
+
+from app.services.frame_analysis import locate_faces
+from app.services.frame_sampler import FrameSampler
+
+
+def iou(a, b):
+    top, right = max(a[0], b[0]), min(a[1], b[1])
+    bottom, left = min(a[2], b[2]), max(a[3], b[3])
+    inter = max(bottom - top, 0) * max(right - left, 0)
+    area = lambda box: (box[2] - box[0]) * (box[1] - box[3])
+    union = area(a) + area(b) - inter
+    return inter / union if union else 0.0
+
+
+def sample_frames(paths, frame_skip, limit):
+    frames = []
+    for path in paths:
+        sampler = FrameSampler("auto", frame_skip)
+        for sampled in sampler.frames(path):
+            frames.append(sampled.image)
+            if len(frames) >= limit:
+                return frames
+    return frames
+
+
+def measure(frames, reference, detect):
+    found = 0
+    start = time.perf_counter()
+    detections = [detect(frame) for frame in frames]
+    seconds = time.perf_counter() - start
+    for expected, boxes in zip(reference, detections):
+        found += sum(any(iou(box, candidate) >= 0.5 for candidate in boxes) for box in expected)
+    return seconds / len(frames) * 1000, found
+
+
+def half_resolution(frame):
+    # The analyzer's default path: detect on the half-size frame, in its coordinates
+    small = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
+    return [tuple(value * 2 for value in box) for box in locate_faces(small)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", nargs="+", required=True)
+    parser.add_argument("--widths", type=int, nargs="+", default=[320, 480, 640])
+    parser.add_argument("--frame-skip", type=int, default=15)
+    parser.add_argument("--max-frames", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = sample_frames(args.videos, args.frame_skip, args.max_frames)
+    if not frames:
+        parser.error("no frames could be read from the given videos")
+    full_ms, _ = measure(frames, [[] for _ in frames], locate_faces)
+    reference = [locate_faces(frame) for frame in frames]
+    total = sum(len(boxes) for boxes in reference)
+    height, width = frames[0].shape[:2]
+
+    rows = [(f"full ({width}px)", full_ms, total)]
+    rows.append((f"half ({width // 2}px)", *measure(frames, reference, half_resolution)))
+    for target in args.widths:
+        rows.append((f"{target}px", *measure(frames, reference, lambda frame: locate_faces(frame, target))))
+
+    print(f"{len(frames)} frames, {total} faces at full resolution\n")
+    print("| detection width | ms / frame | speedup | recall |")
+    print("|---|---|---|---|")
+    for label, ms, found in rows:
+        recall = found / total if total else 1.0
+        print(f"| {label} | {ms:.1f} | {full_ms / ms:.2f}x | {recall:.1%} |")
+
+
+if __name__ == "__main__":
+    main()
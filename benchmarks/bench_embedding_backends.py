@@ -0,0 +1,76 @@
+# benchmarks/bench_embedding_backends.py
+"""
+Latency and drift of the sentence embedding backends on CPU.
+
+Encodes short skill phrases and full-length documents with every requested
+backend and reports median/p95 latency plus the largest change in pairwise
+cosine similarity relative to the PyTorch backend.
+
+Usage:
+    python -m benchmarks.bench_embedding_backends [--backends torch quantized onnx] [--repeat 20]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.embedding_backends import EMBEDDING_BACKENDS, load_embedding_backend
+
+PHRASES = [
+    "python", "sql", "excel", "machine learning", "marketing coordinator",
+    "social media management", "project management", "data analysis",
+    "google analytics", "content creation", "brand management", "market research",
+]
+
+DOCUMENT = (
+    "Enthusiastic Marketing Coordinator with over two years of experience in campaign "
+    "execution and project management. Managed social media accounts, conducted market "
+    "research and competitor analysis, and created content for newsletters. "
+) * 8
+
+
+def _percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+
+def _measure(backend, inputs, repeat):
+    backend.encode(inputs)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend.encode(inputs)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _normalize(vectors):
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backends", nargs="+", default=sorted(EMBEDDING_BACKENDS))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    reference = _normalize(load_embedding_backend("torch").encode(PHRASES))
+    print(f"{'backend':>10} {'phrases p50':>12} {'phrases p95':>12} {'docs p50':>10} {'docs p95':>10} {'max drift':>10}")
+    for name in args.backends:
+        try:
+            backend = load_embedding_backend(name)
+        except ImportError as e:
+            print(f"{name:>10} skipped: {e}")
+            continue
+        phrases = _measure(backend, PHRASES, args.repeat)
+        documents = _measure(backend, [DOCUMENT] * 8, args.repeat)
+        vectors = _normalize(backend.encode(PHRASES))
+        drift = np.abs(vectors @ vectors.T - reference @ reference.T).max()
+        print(
+            f"{name:>10} {_percentile_ms(phrases, 50):>10.2f}ms {_percentile_ms(phrases, 95):>10.2f}ms "
+            f"{_percentile_ms(documents, 50):>8.2f}ms {_percentile_ms(documents, 95):>8.2f}ms {drift:>10.5f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_frame_batching.py
+"""
+Per-frame versus batched frame analysis throughput.
+
+Builds a synthetic clip of frames with a textured face-sized block whose box
+is supplied to both paths (as the face tracker would), so neither runs a
+face detector and the comparison isolates encoding, matching, emotion
+classification and eye detection. Needs the real dlib and FER models.
+
+Usage:
+    python -m benchmarks.bench_frame_batching [--frames 96] [--batch-sizes 4 8 16 32] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from app.services.frame_analysis import analyze_frame, analyze_frames_batch
+from app.services.video_models import get_video_models
+
+FRAME_SHAPE = (360, 640, 3)
+FACE_BOX = (100, 380, 260, 220)
+
+
+def synthetic_clip(count, seed=0):
+    rng = np.random.default_rng(seed)
+    top, right, bottom, left = FACE_BOX
+    frames = []
+    for i in range(count):
+        frame = np.full(FRAME_SHAPE, 40 + i % 20, dtype=np.uint8)
+        face = rng.integers(60, 200, (bottom - top, right - left, 3), dtype=np.uint8)
+        frame[top:bottom, left:right] = cv2.GaussianBlur(face, (9, 9), 0)
+        frames.append(frame)
+    return frames
+
+
+def _best_of(repeat, run):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=96)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    models = get_video_models()
+    frames = synthetic_clip(args.frames)
+    known = np.zeros(128)
+    locations = [FACE_BOX]
+
+    def per_frame():
+        for index, frame in enumerate(frames):
+            analyze_frame(frame, index, known, models, locations)
+
+    def batched(size):
+        items = [(frame, index, locations) for index, frame in enumerate(frames)]
+        for start in range(0, len(items), size):
+            analyze_frames_batch(items[start:start + size], known, models)
+
+    # Load the models and let TensorFlow build its graphs before timing
+    per_frame()
+    batched(args.batch_sizes[0])
+
+    baseline = _best_of(args.repeat, per_frame)
+    print(f"{'mode':>12} {'frames/s':>10} {'speedup':>8}")
+    print(f"{'per-frame':>12} {args.frames / baseline:>10.1f} {1.0:>7.2f}x")
+    for size in args.batch_sizes:
+        seconds = _best_of(args.repeat, lambda: batched(size))
+        print(f"{f'batch {size}':>12} {args.frames / seconds:>10.1f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
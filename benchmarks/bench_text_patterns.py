@@ -0,0 +1,82 @@
+# benchmarks/bench_text_patterns.py
+"""
+Micro-benchmark for the precompiled category patterns and item matcher.
+
+Compares the per-pattern ``re.findall``/``re.search`` loops TextProcessor used
+to run against the compiled tables in ``app.services.text_patterns`` on
+resumes of increasing length.
+
+Usage:
+    python -m benchmarks.bench_text_patterns [--repeat 20]
+"""
+
+import argparse
+import re
+import time
+
+from app.services.text_patterns import (
+    CATEGORY_PATTERN_TABLE,
+    CATEGORY_PATTERNS,
+    YEARS_EXPERIENCE_PATTERNS,
+    find_whole_words,
+)
+
+RESUME_SECTION = """Senior Marketing Coordinator with 5+ years of experience in digital media.
+Bachelor's degree in Marketing; MBA candidate. Full-time, hybrid or remote.
+Proficient in Python, SQL, Excel, Google Analytics and HubSpot.
+Managed social media campaigns for retail and e-commerce clients in the finance industry.
+Led a team of interns and trainees; worked with the CTO and VP of Sales on product launches.
+"""
+
+ITEMS = [
+    "python", "sql", "excel", "google analytics", "hubspot", "social media",
+    "project management", "copywriting", "salesforce", "tableau", "c++", "node.js",
+    "marketing coordinator", "brand management", "market research", "seo", "sem",
+    "new york", "bachelor", "mba", "remote", "full-time", "finance", "retail",
+]
+
+
+def legacy_scan(text):
+    found = {}
+    for category, patterns in CATEGORY_PATTERN_TABLE.items():
+        found[category] = set()
+        for pattern in patterns:
+            found[category].update(m.lower() for m in re.findall(pattern, text, re.IGNORECASE))
+    years = [re.search(p.pattern, text, re.IGNORECASE) for p in YEARS_EXPERIENCE_PATTERNS]
+    items = {i for i in ITEMS if re.search(r'\b' + re.escape(i) + r'\b', text, re.IGNORECASE)}
+    return found, years, items
+
+
+def compiled_scan(text):
+    found = {}
+    for category, patterns in CATEGORY_PATTERNS.items():
+        found[category] = {m.lower() for pattern in patterns for m in pattern.findall(text)}
+    years = [p.search(text) for p in YEARS_EXPERIENCE_PATTERNS]
+    items = find_whole_words(ITEMS, text.lower())
+    return found, years, items
+
+
+def _time(fn, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'resume chars':>12} {'legacy ms':>10} {'compiled ms':>12} {'speedup':>8}")
+    for copies in (1, 10, 50, 200):
+        text = RESUME_SECTION * copies
+        assert legacy_scan(text)[0] == compiled_scan(text)[0]
+        assert legacy_scan(text)[2] == compiled_scan(text)[2]
+        legacy = _time(legacy_scan, text, args.repeat)
+        compiled = _time(compiled_scan, text, args.repeat)
+        print(f"{len(text):>12} {legacy:>10.3f} {compiled:>12.3f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/corpus.py
+"""
+Deterministic inputs for the benchmark suite.
+
+Resumes and job descriptions are assembled from fixed phrase pools with a
+seeded RNG, so the same size and seed always give the same text. The pools
+use the titles, skills, degrees and job types the category patterns look
+for, so every extractor has work to do. Videos are drawn with OpenCV: a
+face-like head that drifts across a noisy background, written as MJPG so
+any OpenCV build can read them back.
+"""
+
+import random
+
+import cv2
+import numpy as np
+
+# Approximate word counts per size; large is a long multi-page CV
+SIZES = {"small": 200, "medium": 800, "large": 3000}
+
+TITLES = [
+    "Marketing Coordinator", "Software Engineer", "Data Analyst", "Product Manager",
+    "Financial Analyst", "Registered Nurse", "Sales Associate", "DevOps Engineer",
+]
+SKILLS = [
+    "python", "sql", "excel", "java", "javascript", "react", "aws", "azure", "git",
+    "tableau", "salesforce", "hubspot", "google analytics", "project management",
+    "market research", "social media", "copywriting", "machine learning",
+    "data analysis", "brand management", "seo", "node.js", "c++", "docker",
+]
+DEGREES = ["Bachelor's degree", "Master's degree", "MBA", "Associate degree", "PhD"]
+FIELDS = ["Marketing", "Computer Science", "Business", "Finance", "Nursing", "Statistics"]
+LEVELS = ["entry-level", "junior", "mid-level", "senior", "lead", "principal"]
+JOB_TYPES = ["full-time", "part-time", "contract", "remote", "hybrid", "internship"]
+INDUSTRIES = ["technology", "finance", "healthcare", "retail", "media", "consulting", "education"]
+CITIES = ["New York, NY", "Austin, TX", "Seattle, WA", "Chicago, IL", "Boston, MA", "Denver, CO"]
+COMPANIES = ["XYZ Corp", "Acme Inc", "Globex", "Initech", "Umbrella Health", "Stark Retail"]
+VERBS = [
+    "Led", "Managed", "Built", "Designed", "Coordinated", "Analyzed", "Improved",
+    "Launched", "Automated", "Supported", "Planned", "Delivered",
+]
+OBJECTS = [
+    "marketing campaigns", "reporting dashboards", "data pipelines", "customer onboarding",
+    "quarterly forecasts", "product launches", "content calendars", "vendor contracts",
+    "A/B tests", "training programs", "budget reviews", "patient intake workflows",
+]
+OUTCOMES = [
+    "increasing engagement by {n}%", "cutting costs by {n}%", "saving {n} hours a month",
+    "growing revenue by {n}%", "reducing errors by {n}%", "for {n} clients",
+]
+
+
+def _bullet(rng):
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 60))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}, {outcome}."
+
+
+def _fill(lines, rng, words):
+    while sum(len(line.split()) for line in lines) < words:
+        if rng.random() < 0.15:
+            lines.append("")
+            lines.append(f"{rng.choice(LEVELS).title()} {rng.choice(TITLES)}, {rng.choice(COMPANIES)} "
+                         f"({rng.randint(2005, 2022)}-{rng.randint(2023, 2025)}), {rng.choice(CITIES)}")
+        lines.append(f"- {_bullet(rng)}")
+    return "\n".join(lines)
+
+
+def generate_resume(size: str = "medium", seed: int = 0) -> str:
+    rng = random.Random(f"resume-{size}-{seed}")
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, 8)
+    lines = [
+        f"Candidate {seed}",
+        rng.choice(CITIES),
+        "",
+        "Objective",
+        f"{rng.choice(LEVELS).title()} {title} with {rng.randint(1, 15)} years of experience in "
+        f"{rng.choice(INDUSTRIES)}. Seeking a {rng.choice(JOB_TYPES)} role.",
+        "",
+        "Skills",
+        f"Proficient in {', '.join(skills[:4])}. Knowledge of {', '.join(skills[4:])}.",
+        "",
+        "Education",
+        f"{rng.choice(DEGREES)} in {rng.choice(FIELDS)}, State University",
+        "",
+        "Experience",
+    ]
+    return _fill(lines, rng, SIZES[size])
+
+
+def generate_job_description(size: str = "medium", seed: int = 0) -> str:
+    rng = random.Random(f"job-{size}-{seed}")
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, 6)
+    lines = [
+        f"Job Title: {title}",
+        f"Company: {rng.choice(COMPANIES)}",
+        f"Location: {rng.choice(CITIES)}",
+        f"Job Type: {rng.choice(JOB_TYPES).title()}",
+        "",
+        "Job Summary:",
+        f"We are seeking a {rng.choice(LEVELS)} {title} to join our {rng.choice(INDUSTRIES)} team.",
+        "",
+        "Qualifications:",
+        f"{rng.choice(DEGREES)} in {rng.choice(FIELDS)} or related field.",
+        f"Minimum {rng.randint(1, 8)} years of experience.",
+        f"Technologies: {', '.join(skills)}",
+        "",
+        "Key Responsibilities:",
+    ]
+    # Job descriptions run shorter than resumes of the same size class
+    return _fill(lines, rng, SIZES[size] // 2)
+
+
+def corpus(size: str, count: int, seed: int = 0):
+    """``count`` (resume, job description) pairs of one size."""
+    return [
+        (generate_resume(size, seed + i), generate_job_description(size, seed + i))
+        for i in range(count)
+    ]
+
+
+def resume_skills(seed: int, count: int = 8):
+    return random.Random(f"skills-{seed}").sample(SKILLS, count)
+
+
+def synthetic_video(path: str, seconds: float = 10, fps: int = 30, size=(640, 360), seed: int = 0) -> str:
+    """Write a clip of a drawn face drifting over sensor-like noise to ``path``."""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    if not writer.isOpened():
+        raise RuntimeError(f"Could not open a video writer for {path}")
+    background = rng.integers(90, 140, (height, width, 3), dtype=np.uint8)
+    try:
+        for i in range(int(seconds * fps)):
+            frame = background.copy()
+            frame += rng.integers(0, 6, frame.shape, dtype=np.uint8)
+            cx = int(width / 2 + width / 6 * np.sin(i / fps))
+            cy = int(height / 2 + height / 12 * np.cos(i / fps / 2))
+            axes = (height // 7, height // 5)
+            cv2.ellipse(frame, (cx, cy), axes, 0, 0, 360, (150, 180, 225), -1)
+            for dx in (-axes[0] // 2, axes[0] // 2):
+                cv2.circle(frame, (cx + dx, cy - axes[1] // 4), axes[0] // 6, (40, 40, 40), -1)
+            cv2.ellipse(frame, (cx, cy + axes[1] // 2), (axes[0] // 2, axes[1] // 8), 0, 0, 180, (60, 60, 150), 3)
+            writer.write(frame)
+    finally:
+        writer.release()
+    return path
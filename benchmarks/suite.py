@@ -0,0 +1,285 @@
+# benchmarks/suite.py
+"""
+Offline benchmark suite for the ATS and video pipelines.
+
+Runs each case on generated inputs (see ``benchmarks.corpus``) and reports
+throughput, p50/p95/p99 latency and peak RSS, then compares the numbers with
+a stored baseline and exits non-zero when a case got slower, or hungrier,
+by more than the tolerance.
+
+Every case runs in a fresh process, so model loading is excluded by a
+warm-up call and peak RSS is that case's own. Video cases analyze frames on
+threads in that process (``--video-workers 0``) so their memory is counted;
+pass a worker count to time the process-pool path instead.
+
+Cases:
+    text.extract_categories.<size>   TextProcessor on resumes
+    score.similarity.<size>          ScoreCalculator.similarty_score
+    score.similarity_batch.<size>    ScoreCalculator.similarity_scores, 16 resumes per call
+    score.skills                     ScoreCalculator.calculate_skills_score
+    score.job_title                  ScoreCalculator.calculate_job_title_score
+    ats.calculate_ats_score.<size>   ATSCalculator, a new job description every call
+    video.analyze_video.<clip>       VideoAnalyzer.analyze_video on a drawn clip
+
+Usage:
+    python -m benchmarks.suite [--cases 'text.*' 'ats.*'] [--sizes small medium large]
+                               [--iterations N] [--baseline benchmarks/baseline.json]
+                               [--update-baseline] [--tolerance 0.2] [--output results.json]
+"""
+
+import argparse
+import fnmatch
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmarks import corpus
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Video clips as (seconds, fps, frame size)
+CLIPS = {"short": (10, 30, (640, 360)), "long": (60, 30, (1280, 720))}
+
+# Calls timed per case unless --iterations is given
+ITERATIONS = {"text": 50, "score": 50, "ats": 20, "video": 3}
+
+BATCH_RESUMES = 16
+
+# Lower is better for these; throughput is compared the other way round
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "peak_rss_mb")
+
+
+def _text_extract_categories(size, iterations, options):
+    from app.services.text_processor import TextProcessor
+    processor = TextProcessor()
+    resumes = [resume for resume, _ in corpus.corpus(size, iterations + 1)]
+    return [lambda text=text: processor.extract_categories(text) for text in resumes]
+
+
+def _score_similarity(size, iterations, options):
+    from app.services.score_calculator import ScoreCalculator
+    calculator = ScoreCalculator()
+    return [
+        lambda resume=resume, job=job: calculator.similarty_score(resume, job)
+        for resume, job in corpus.corpus(size, iterations + 1)
+    ]
+
+
+def _score_similarity_batch(size, iterations, options):
+    from app.services.score_calculator import ScoreCalculator
+    calculator = ScoreCalculator()
+    calls = []
+    for i in range(iterations + 1):
+        pairs = corpus.corpus(size, BATCH_RESUMES, seed=i * BATCH_RESUMES)
+        resumes = [resume for resume, _ in pairs]
+        calls.append(lambda resumes=resumes, job=pairs[0][1]: calculator.similarity_scores(resumes, job))
+    return calls
+
+
+def _score_skills(size, iterations, options):
+    from app.services.score_calculator import ScoreCalculator
+    calculator = ScoreCalculator()
+    # Skill phrases repeat across resumes, so after warm-up this mostly hits the phrase cache
+    return [
+        lambda i=i: calculator.calculate_skills_score(corpus.resume_skills(i), corpus.resume_skills(i + 1000, 6))
+        for i in range(iterations + 1)
+    ]
+
+
+def _score_job_title(size, iterations, options):
+    from app.services.score_calculator import ScoreCalculator
+    calculator = ScoreCalculator()
+    titles = corpus.TITLES
+    return [
+        lambda i=i: calculator.calculate_job_title_score(
+            f"{corpus.LEVELS[i % len(corpus.LEVELS)]} {titles[i % len(titles)]}", titles[(i * 3) % len(titles)]
+        )
+        for i in range(iterations + 1)
+    ]
+
+
+def _ats_calculate_ats_score(size, iterations, options):
+    from app.services.ats_calculator import ATSCalculator
+    calculator = ATSCalculator()
+    return [
+        lambda resume=resume, job=job: calculator.calculate_ats_score(resume, job)
+        for resume, job in corpus.corpus(size, iterations + 1)
+    ]
+
+
+def _video_analyze_video(clip, iterations, options):
+    from app.services.video_analyzer import VideoAnalyzer
+    seconds, fps, frame_size = CLIPS[clip]
+    path = os.path.join(options["workdir"], f"{clip}.avi")
+    if not os.path.exists(path):
+        corpus.synthetic_video(path, seconds, fps, frame_size)
+    analyzer = VideoAnalyzer(known_face_encoding=np.zeros(128), workers=options["video_workers"])
+    return [lambda: analyzer.analyze_video(path) for _ in range(iterations + 1)]
+
+
+def build_cases(sizes):
+    """Case name -> (group, setup, argument)."""
+    cases = {}
+    for size in sizes:
+        cases[f"text.extract_categories.{size}"] = ("text", _text_extract_categories, size)
+        cases[f"score.similarity.{size}"] = ("score", _score_similarity, size)
+        cases[f"score.similarity_batch.{size}"] = ("score", _score_similarity_batch, size)
+        cases[f"ats.calculate_ats_score.{size}"] = ("ats", _ats_calculate_ats_score, size)
+    cases["score.skills"] = ("score", _score_skills, None)
+    cases["score.job_title"] = ("score", _score_job_title, None)
+    for clip in CLIPS:
+        cases[f"video.analyze_video.{clip}"] = ("video", _video_analyze_video, clip)
+    return cases
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_case(setup, argument, iterations, options):
+    calls = setup(argument, iterations, options)
+    calls[0]()  # warm-up: lazy model loads, graph builds, caches
+    samples = []
+    start = time.perf_counter()
+    for call in calls[1:]:
+        began = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - began)
+    elapsed = time.perf_counter() - start
+
+    samples_ms = np.array(samples) * 1000
+    return {
+        "iterations": len(samples),
+        "throughput": len(samples) / elapsed,
+        "p50_ms": float(np.percentile(samples_ms, 50)),
+        "p95_ms": float(np.percentile(samples_ms, 95)),
+        "p99_ms": float(np.percentile(samples_ms, 99)),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run(cases, iterations, options):
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for name, (group, setup, argument) in cases.items():
+        count = iterations or ITERATIONS[group]
+        print(f"{name}: {count} calls...", file=sys.stderr, flush=True)
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                results[name] = executor.submit(_run_case, setup, argument, count, options).result()
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing each regression beyond ``tolerance`` (a fraction)."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None or "error" in current or "error" in previous:
+            continue
+        for key in LOWER_IS_BETTER:
+            if current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {previous[key]:.1f} -> {current[key]:.1f}")
+        if current["throughput"] < previous["throughput"] / (1 + tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput']:.2f}/s -> {current['throughput']:.2f}/s")
+    return regressions
+
+
+def print_table(results, baseline):
+    print("| case | calls/s | p50 ms | p95 ms | p99 ms | peak RSS MB | p95 vs baseline |")
+    print("|---|---|---|---|---|---|---|")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"| {name} | skipped: {result['error']} | | | | | |")
+            continue
+        previous = baseline.get(name)
+        change = ""
+        if previous and "error" not in previous:
+            change = f"{(result['p95_ms'] / previous['p95_ms'] - 1) * 100:+.0f}%"
+        print(
+            f"| {name} | {result['throughput']:.2f} | {result['p50_ms']:.1f} | {result['p95_ms']:.1f} "
+            f"| {result['p99_ms']:.1f} | {result['peak_rss_mb']:.0f} | {change} |"
+        )
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", nargs="+", default=["*"], help="glob patterns of case names")
+    parser.add_argument("--sizes", nargs="+", default=list(corpus.SIZES), choices=list(corpus.SIZES))
+    parser.add_argument("--iterations", type=int, default=0, help="calls per case; 0 uses the per-group default")
+    parser.add_argument("--video-workers", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before a case is flagged")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--list", action="store_true", help="print the case names and exit")
+    args = parser.parse_args()
+
+    cases = {
+        name: case for name, case in build_cases(args.sizes).items()
+        if any(fnmatch.fnmatch(name, pattern) for pattern in args.cases)
+    }
+    if args.list:
+        print("\n".join(cases))
+        return
+    if not cases:
+        parser.error("no case matches --cases")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["cases"]
+
+    with tempfile.TemporaryDirectory(prefix="merlin-bench-") as workdir:
+        options = {"workdir": workdir, "video_workers": args.video_workers}
+        results = run(cases, args.iterations, options)
+
+    report = {"environment": environment(), "cases": results}
+    print_table(results, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        # Only cases that ran replace their old numbers
+        merged = dict(baseline)
+        merged.update({name: result for name, result in results.items() if "error" not in result})
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": environment(), "cases": merged}, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+        return
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%}:")
+        print("\n".join(f"- {line}" for line in regressions))
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.tolerance:.0%}.")
+
+
+if __name__ == "__main__":
+    main()